@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals, print_function
+
+import optparse
+import os
+import sys
+import time
+
+
+# Import youtube_dl
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT_DIR)
+from youtube_dl.m3u8 import parse_m3u8
+
+
+def generate_playlist(segments, byte_range=False, encrypted=False):
+    lines = [
+        '#EXTM3U', '#EXT-X-VERSION:4', '#EXT-X-TARGETDURATION:10',
+        '#EXT-X-MEDIA-SEQUENCE:0', '#EXT-X-PLAYLIST-TYPE:VOD']
+    for i in range(segments):
+        if encrypted and i % 100 == 0:
+            lines.append('#EXT-X-KEY:METHOD=AES-128,URI="key%d.bin",IV=0x%032x' % (i // 100, i))
+        lines.append('#EXTINF:10.000,')
+        if byte_range:
+            lines.append('#EXT-X-BYTERANGE:188000')
+            lines.append('media.ts')
+        else:
+            lines.append('segment%d.ts' % i)
+    lines.append('#EXT-X-ENDLIST')
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [OPTIONS]')
+    parser.add_option(
+        '-n', '--segments', type=int, default=10000,
+        help='Number of segments per playlist (default: %default)')
+    parser.add_option(
+        '-r', '--repeat', type=int, default=5,
+        help='Number of times each playlist is parsed, the best time is kept (default: %default)')
+    options, args = parser.parse_args()
+
+    for name, kwargs in (
+            ('plain', {}),
+            ('byterange', {'byte_range': True}),
+            ('encrypted', {'encrypted': True})):
+        content = generate_playlist(options.segments, **kwargs)
+        times = []
+        for _ in range(options.repeat):
+            start = time.time()
+            playlist = parse_m3u8(content, 'http://example.com/path/index.m3u8')
+            times.append(time.time() - start)
+        assert len(playlist.segments) == options.segments
+        print('%s: %d segments (%d bytes) parsed in %.2fms' % (
+            name, options.segments, len(content), min(times) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals, print_function
+
+import io
+import optparse
+import os
+import string
+import sys
+import time
+
+
+# Import youtube_dl
+ROOT_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT_DIR)
+from youtube_dl import YoutubeDL
+from youtube_dl.extractor import YoutubeIE
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [OPTIONS] PLAYER.js...')
+    parser.add_option(
+        '-n', '--signatures', type=int, default=1000,
+        help='Number of signatures to decrypt per player (default: %default)')
+    options, args = parser.parse_args()
+    if not args:
+        parser.error('Expected at least one player file, see test/testdata/player-*.js')
+
+    ie = YoutubeIE(YoutubeDL({'cachedir': False, 'quiet': True}))
+    for fn in args:
+        with io.open(fn, encoding='utf-8') as f:
+            jscode = f.read()
+        player_url = 'https://s.ytimg.com/yts/jsbin/player-%s' % os.path.basename(fn)
+
+        start = time.time()
+        func = ie._parse_sig_js(jscode)
+        parse_time = time.time() - start
+        YoutubeIE._player_functions[player_url] = func
+
+        signatures = [
+            string.printable[i % 10:][:81 + i % 10] for i in range(options.signatures)]
+        start = time.time()
+        for s in signatures:
+            func(s)
+        call_time = time.time() - start
+
+        start = time.time()
+        for s in signatures:
+            ie._decrypt_signature(s, 'benchmark', player_url)
+        cached_time = time.time() - start
+
+        print('%s: parse %.2fms, %d signatures: %.2fms with the parsed function, '
+              '%.2fms through the player cache' % (
+                  os.path.basename(fn), parse_time * 1000, len(signatures),
+                  call_time * 1000, cached_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
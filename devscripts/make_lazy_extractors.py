@@ -5,14 +5,15 @@ import os
 from os.path import dirname as dirn
 import sys
 
-print('WARNING: Lazy loading extractors is an experimental feature that may not always work', file=sys.stderr)
-
 sys.path.insert(0, dirn(dirn((os.path.abspath(__file__)))))
 
 lazy_extractors_filename = sys.argv[1]
-if os.path.exists(lazy_extractors_filename):
-    os.remove(lazy_extractors_filename)
+# A stale byte-compiled module would be imported on Python 2
+for fn in (lazy_extractors_filename, lazy_extractors_filename + 'c'):
+    if os.path.exists(fn):
+        os.remove(fn)
 
+from youtube_dl import YoutubeDL
 from youtube_dl.extractor import _ALL_CLASSES
 from youtube_dl.extractor.common import InfoExtractor, SearchInfoExtractor
 
@@ -26,9 +27,18 @@ module_contents = [
 ie_template = '''
 class {name}({bases}):
     _VALID_URL = {valid_url!r}
+    _VALID_URL_HOSTS = {valid_url_hosts!r}
     _module = '{module}'
 '''
 
+# Used for suitable() overrides that depend on more than the other lazy
+# extractors
+delegate_suitable_template = '''
+    @classmethod
+    def suitable(cls, url):
+        return cls._get_real_class().suitable(url)
+'''
+
 make_valid_template = '''
     @classmethod
     def _make_valid_url(cls):
@@ -45,15 +55,28 @@ def get_base_name(base):
         return base.__name__
 
 
-def build_lazy_ie(ie, name):
+def is_self_contained(func, available_names):
+    # Whether all the globals func may refer to are in the lazy module too
+    func_globals = sys.modules[func.__module__].__dict__
+    return all(
+        name not in func_globals or name in available_names
+        for name in func.__code__.co_names)
+
+
+def build_lazy_ie(ie, name, available_names):
     valid_url = getattr(ie, '_VALID_URL', None)
     s = ie_template.format(
         name=name,
         bases=', '.join(map(get_base_name, ie.__bases__)),
         valid_url=valid_url,
+        valid_url_hosts=YoutubeDL.ie_url_hosts(ie),
         module=ie.__module__)
-    if ie.suitable.__func__ is not InfoExtractor.suitable.__func__:
-        s += '\n' + getsource(ie.suitable)
+    suitable = ie.suitable.__func__
+    if suitable is not InfoExtractor.suitable.__func__:
+        if is_self_contained(suitable, available_names):
+            s += '\n' + getsource(suitable)
+        else:
+            s += delegate_suitable_template
     if hasattr(ie, '_make_valid_url'):
         # search extractors
         s += make_valid_template.format(valid_url=ie._make_valid_url())
@@ -81,10 +104,11 @@ while classes:
             break
 ordered_cls.append(_ALL_CLASSES[-1])
 
+available_names = set(['re'] + [ie.__name__ for ie in ordered_cls])
 names = []
 for ie in ordered_cls:
     name = ie.__name__
-    src = build_lazy_ie(ie, name)
+    src = build_lazy_ie(ie, name, available_names)
     module_contents.append(src)
     if ie in _ALL_CLASSES:
         names.append(name)
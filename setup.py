@@ -9,9 +9,11 @@ import sys
 
 try:
     from setuptools import setup, Command
+    from setuptools.command.build_py import build_py as _build_py
     setuptools_available = True
 except ImportError:
     from distutils.core import setup, Command
+    from distutils.command.build_py import build_py as _build_py
     setuptools_available = False
 from distutils.spawn import spawn
 
@@ -99,6 +101,14 @@ class build_lazy_extractors(Command):
             dry_run=self.dry_run,
         )
 
+
+class build_py(_build_py):
+    def run(self):
+        # Loading the extractors on demand makes startup much faster
+        self.run_command('build_lazy_extractors')
+        _build_py.run(self)
+
+
 setup(
     name='youtube_dl',
     version=__version__,
@@ -132,6 +142,9 @@ setup(
         'Programming Language :: Python :: 3.5',
     ],
 
-    cmdclass={'build_lazy_extractors': build_lazy_extractors},
+    cmdclass={
+        'build_lazy_extractors': build_lazy_extractors,
+        'build_py': build_py,
+    },
     **params
 )
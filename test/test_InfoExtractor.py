@@ -5,12 +5,15 @@ from __future__ import unicode_literals
 # Allow direct execution
 import os
 import sys
+import time
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from test.helper import FakeYDL
+from youtube_dl.compat import compat_etree_fromstring
+from youtube_dl.downloader.dash import count_template_fragments, template_fragments
 from youtube_dl.extractor.common import InfoExtractor
-from youtube_dl.extractor import YoutubeIE, get_info_extractor
+from youtube_dl.extractor import GenericIE, YoutubeIE, get_info_extractor
 from youtube_dl.utils import encode_data_uri, strip_jsonp, ExtractorError, RegexNotFoundError
 
 
@@ -84,5 +87,83 @@ class TestInfoExtractor(unittest.TestCase):
         self.assertRaises(ExtractorError, self.ie._download_json, uri, None)
         self.assertEqual(self.ie._download_json(uri, None, fatal=False), None)
 
+    def test_downloaded_manifest(self):
+        media = '#EXTM3U\n#EXT-X-TARGETDURATION:10\n#EXTINF:10,\nfrag0.ts\n'
+        uri = encode_data_uri((media + '#EXT-X-ENDLIST\n').encode('utf-8'), 'application/x-mpegurl')
+        f = self.ie._extract_m3u8_formats(uri, None, 'mp4', 'm3u8_native')[0]
+        # It isn't written with the info dict
+        self.assertFalse('downloaded_manifest' in f)
+        downloaded_manifest = self.ie._downloader.pop_downloaded_manifest(f['url'])
+        self.assertEqual(downloaded_manifest['url'], uri)
+        self.assertEqual(downloaded_manifest['content'], media + '#EXT-X-ENDLIST\n')
+        self.assertTrue(downloaded_manifest['expires'] > time.time())
+        self.assertEqual(self.ie._downloader.pop_downloaded_manifest(f['url']), None)
+        # Live playlists must be reloaded
+        uri = encode_data_uri(media.encode('utf-8'), 'application/x-mpegurl')
+        f = self.ie._extract_m3u8_formats(uri, None, 'mp4', 'm3u8_native')[0]
+        self.assertEqual(self.ie._downloader.pop_downloaded_manifest(f['url']), None)
+
+    def test_mpd_fragment_template(self):
+        mpd_doc = compat_etree_fromstring('''<?xml version="1.0"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" mediaPresentationDuration="PT30S">
+  <Period>
+    <AdaptationSet mimeType="video/mp4">
+      <SegmentTemplate timescale="1000" media="$RepresentationID$/$Time$.m4s" initialization="$RepresentationID$/init.mp4">
+        <SegmentTimeline>
+          <S t="0" d="4000" r="2"/>
+          <S d="2000"/>
+        </SegmentTimeline>
+      </SegmentTemplate>
+      <Representation id="v1" bandwidth="500000" width="640" height="360"/>
+    </AdaptationSet>
+    <AdaptationSet mimeType="audio/mp4">
+      <Representation id="a1" bandwidth="128000">
+        <SegmentTemplate timescale="10" duration="100" startNumber="5" media="a1-$Number%03d$.m4s"/>
+      </Representation>
+    </AdaptationSet>
+  </Period>
+</MPD>''')
+        video, audio = self.ie._parse_mpd_formats(
+            mpd_doc, mpd_base_url='http://example.com/dash')
+        self.assertFalse('fragments' in video)
+        self.assertEqual(video['protocol'], 'http_dash_segments')
+        self.assertEqual(count_template_fragments(video['fragment_template']), 5)
+        self.assertEqual(list(template_fragments(video['fragment_template'])), [
+            {'url': 'http://example.com/dash/v1/init.mp4'},
+            {'url': 'http://example.com/dash/v1/0.m4s', 'duration': 4.0},
+            {'url': 'http://example.com/dash/v1/4000.m4s', 'duration': 4.0},
+            {'url': 'http://example.com/dash/v1/8000.m4s', 'duration': 4.0},
+            {'url': 'http://example.com/dash/v1/12000.m4s', 'duration': 2.0},
+        ])
+        self.assertEqual(count_template_fragments(audio['fragment_template']), 3)
+        self.assertEqual(
+            [fragment['url'] for fragment in template_fragments(audio['fragment_template'])], [
+                'http://example.com/dash/a1-005.m4s', 'http://example.com/dash/a1-006.m4s',
+                'http://example.com/dash/a1-007.m4s'])
+
+    def test_generic_embeds(self):
+        ie = GenericIE(FakeYDL())
+
+        def extract_embed(html):
+            uri = encode_data_uri(
+                ('<html><title>Embeds</title>%s</html>' % html).encode('utf-8'), 'text/html')
+            res = ie.extract(uri)
+            return res['entries'][0]['url'] if res['_type'] == 'playlist' else res['url']
+
+        self.assertEqual(extract_embed(
+            '<iframe src="https://www.youtube.com/embed/BaW_jenozKc"></iframe>'),
+            'https://www.youtube.com/embed/BaW_jenozKc')
+        self.assertEqual(extract_embed(
+            '<div class="lazyYT" data-youtube-id="BaW_jenozKc"></div>'), 'BaW_jenozKc')
+        self.assertEqual(extract_embed(
+            '<script>LimelightPlayer.doLoadMedia("%s")</script>' % ('a' * 32)),
+            'limelight:media:%s' % ('a' * 32))
+        self.assertEqual(extract_embed(
+            '<iframe src="https://player.vimeo.com/video/1234"></iframe>'
+            '<div id="wistia_abcd"></div>').split('#')[0],
+            'https://player.vimeo.com/video/1234')
+        self.assertRaises(
+            ExtractorError, extract_embed, '<iframe src="https://player.VIMEO.com/video/1234"></iframe>')
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,14 +9,18 @@ import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import copy
+import json
+import shutil
+import threading
+import time
 
-from test.helper import FakeYDL, assertRegexpMatches
+from test.helper import FakeYDL, assertRegexpMatches, try_rm
 from youtube_dl import YoutubeDL
 from youtube_dl.compat import compat_str, compat_urllib_error
 from youtube_dl.extractor import YoutubeIE
 from youtube_dl.extractor.common import InfoExtractor
 from youtube_dl.postprocessor.common import PostProcessor
-from youtube_dl.utils import ExtractorError, match_filter_func
+from youtube_dl.utils import ExtractorError, MaxDownloadsReached, match_filter_func
 
 TEST_URL = 'http://localhost/sample.mp4'
 
@@ -695,6 +699,243 @@ class TestYoutubeDL(unittest.TestCase):
         result = get_ids({'playlist_items': '10'})
         self.assertEqual(result, [])
 
+    def test_lazy_playlist(self):
+        def make_playlist(generated):
+            def entries():
+                for i in range(1, 7):
+                    generated.append(i)
+                    yield {
+                        'id': compat_str(i),
+                        'title': compat_str(i),
+                        'url': TEST_URL,
+                    }
+            return {
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': entries(),
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            }
+
+        class LazyYDL(YDL):
+            def process_info(self, info_dict):
+                # Number of entries generated when this one is processed
+                info_dict['generated'] = len(generated)
+                super(LazyYDL, self).process_info(info_dict)
+
+        generated = []
+        ydl = LazyYDL({'lazy_playlist': True})
+        res = ydl.process_ie_result(make_playlist(generated))
+        self.assertEqual(
+            [(int(v['id']), v['generated']) for v in ydl.downloaded_info_dicts],
+            [(i, i) for i in range(1, 7)])
+        self.assertEqual(res['entries'], [])
+        self.assertEqual(ydl.downloaded_info_dicts[0]['n_entries'], None)
+
+        generated = []
+        ydl = LazyYDL({'lazy_playlist': True, 'playliststart': 2, 'playlistend': 3})
+        ydl.process_ie_result(make_playlist(generated))
+        self.assertEqual([int(v['id']) for v in ydl.downloaded_info_dicts], [2, 3])
+        self.assertEqual(generated, [1, 2, 3])
+
+        generated = []
+        ydl = LazyYDL({'lazy_playlist': True, 'playlist_items': '4,2,3,10', 'dump_single_json': True})
+        res = ydl.process_ie_result(make_playlist(generated))
+        self.assertEqual(
+            [(int(v['id']), v['generated']) for v in ydl.downloaded_info_dicts],
+            [(4, 4), (2, 4), (3, 4)])
+        self.assertEqual(len(res['entries']), 3)
+
+    def test_json_stream(self):
+        playlist = {
+            '_type': 'playlist',
+            'id': 'test',
+            'entries': [{
+                'id': compat_str(i),
+                'title': compat_str(i),
+                'url': TEST_URL,
+            } for i in range(1, 4)],
+            'extractor': 'test:playlist',
+            'extractor_key': 'test:playlist',
+            'webpage_url': 'http://example.com',
+        }
+
+        class StreamYDL(YDL):
+            def __init__(self, *args, **kwargs):
+                super(StreamYDL, self).__init__(*args, **kwargs)
+                self.output = []
+
+            def process_info(self, info_dict):
+                # Everything before this entry has already been printed
+                info_dict['printed'] = ''.join(self.output)
+                super(StreamYDL, self).process_info(info_dict)
+
+            def to_stdout(self, message, skip_eol=False, check_quiet=False):
+                self.output.append(message + ('' if skip_eol else '\n'))
+
+        ydl = StreamYDL({'dump_single_json': True, 'json_stream': 'single'})
+        res = ydl.process_ie_result(copy.deepcopy(playlist))
+        self.assertEqual(res['entries'], [])
+        self.assertTrue('"title": "2"' in ydl.downloaded_info_dicts[2]['printed'])
+        self.assertFalse('"title": "3"' in ydl.downloaded_info_dicts[2]['printed'])
+        output = ''.join(ydl.output)
+        self.assertEqual(output.count('\n'), 1)
+        streamed = json.loads(output)
+        self.assertEqual(streamed['id'], 'test')
+        self.assertEqual([e['id'] for e in streamed['entries']], ['1', '2', '3'])
+
+        ydl = StreamYDL({'dump_single_json': True, 'json_stream': 'lines'})
+        ydl.process_ie_result(copy.deepcopy(playlist))
+        lines = [json.loads(line) for line in ''.join(ydl.output).splitlines()]
+        self.assertEqual(lines[0]['id'], 'test')
+        self.assertFalse('entries' in lines[0])
+        self.assertEqual([e['id'] for e in lines[1:]], ['1', '2', '3'])
+
+    def test_concurrent_playlist_entries(self):
+        entries = [{
+            'id': compat_str(i),
+            'title': compat_str(i),
+            'url': TEST_URL,
+        } for i in range(1, 7)]
+        playlist = {
+            '_type': 'playlist',
+            'id': 'test',
+            'entries': entries,
+            'extractor': 'test:playlist',
+            'extractor_key': 'test:playlist',
+            'webpage_url': 'http://example.com',
+        }
+
+        class ConcurrentYDL(YDL):
+            def process_info(self, info_dict):
+                # Later entries finish first
+                time.sleep(0.05 * (7 - int(info_dict['id'])))
+                YoutubeDL.process_info(self, info_dict)
+                self.downloaded_info_dicts.append(info_dict)
+
+        ydl = ConcurrentYDL({'concurrent_videos': 3, 'simulate': True})
+        res = ydl.process_ie_result(copy.deepcopy(playlist))
+        self.assertEqual([e['id'] for e in res['entries']], ['1', '2', '3', '4', '5', '6'])
+        self.assertEqual(len(ydl.downloaded_info_dicts), 6)
+
+        ydl = ConcurrentYDL({'concurrent_videos': 3, 'simulate': True, 'max_downloads': 2})
+        self.assertRaises(MaxDownloadsReached, ydl.process_ie_result, copy.deepcopy(playlist))
+        self.assertEqual(len(ydl.downloaded_info_dicts), 2)
+
+    def test_concurrent_playlist_download(self):
+        class PlaylistIE(InfoExtractor):
+            _VALID_URL = r'playlist:'
+
+            def _real_extract(self, url):
+                return self.playlist_result([{
+                    'id': compat_str(i),
+                    'title': compat_str(i),
+                    'url': TEST_URL,
+                    'ext': 'mp4',
+                } for i in range(1, 7)], 'test')
+
+        class ConcurrentYDL(YDL):
+            def __init__(self, *args, **kwargs):
+                super(ConcurrentYDL, self).__init__(*args, **kwargs)
+                self.lock = threading.Lock()
+                self.running = 0
+                self.max_running = 0
+
+            def process_info(self, info_dict):
+                with self.lock:
+                    self.running += 1
+                    self.max_running = max(self.max_running, self.running)
+                time.sleep(0.05)
+                with self.lock:
+                    self.running -= 1
+                super(ConcurrentYDL, self).process_info(info_dict)
+
+        ydl = ConcurrentYDL({'concurrent_videos': 3, 'simulate': True})
+        ydl.add_info_extractor(PlaylistIE(ydl))
+        # FakeYDL only records the URLs passed to download
+        YoutubeDL.download(ydl, ['playlist:'])
+        self.assertEqual(len(ydl.downloaded_info_dicts), 6)
+        self.assertEqual(ydl.max_running, 3)
+
+    def test_download_concurrently(self):
+        ydl = YDL({'progress_with_newline': True})
+        started = []
+
+        def dl(filename, info, report_progress):
+            started.append(filename)
+            # Wait for the other download to start
+            for _ in range(100):
+                if len(started) == 2:
+                    break
+                time.sleep(0.01)
+            report_progress({
+                'status': 'downloading', 'filename': filename,
+                'downloaded_bytes': 0, 'total_bytes': info['size'], 'speed': 100,
+            })
+            time.sleep(0.05)
+            report_progress({
+                'status': 'finished', 'filename': filename,
+                'downloaded_bytes': info['size'], 'total_bytes': info['size'],
+            })
+            return True
+
+        self.assertTrue(ydl._download_concurrently(
+            dl, [('video', {'size': 1000}), ('audio', {'size': 3000})]))
+        self.assertEqual(sorted(started), ['audio', 'video'])
+        progress = [msg for msg in ydl.msgs if msg.startswith('[download]')]
+        self.assertTrue('0.0% of 3.91KiB' in progress[1])
+        self.assertTrue('200.00B/s' in progress[1])
+        self.assertTrue(progress[-1].startswith('[download] 100% of 3.91KiB'))
+        self.assertEqual(len([msg for msg in progress if '100%' in msg]), 1)
+
+        def failing_dl(filename, info, report_progress):
+            if filename == 'audio':
+                raise ExtractorError('failed')
+            return True
+
+        self.assertRaises(ExtractorError, ydl._download_concurrently, failing_dl, [
+            ('video', {}), ('audio', {})])
+
+    def test_download_archive(self):
+        archive_fn = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'test_download_archive.txt')
+
+        def info(video_id):
+            return {'id': video_id, 'extractor_key': 'Test'}
+
+        try_rm(archive_fn)
+        try:
+            ydl = YDL({'download_archive': archive_fn})
+            self.assertFalse(ydl.in_download_archive(info('a')))
+
+            with open(archive_fn, 'w') as f:
+                f.write('test a\ntest b\n')
+            self.assertTrue(ydl.in_download_archive(info('a')))
+            self.assertTrue(ydl.in_download_archive(info('b')))
+            self.assertFalse(ydl.in_download_archive(info('c')))
+
+            ydl.record_download_archive(info('c'))
+            self.assertTrue(ydl.in_download_archive(info('c')))
+
+            # Entries appended by another process, the incomplete one is
+            # only picked up once its line is complete
+            with open(archive_fn, 'a') as f:
+                f.write('test d\ntest e')
+            self.assertTrue(ydl.in_download_archive(info('d')))
+            self.assertFalse(ydl.in_download_archive(info('e')))
+            with open(archive_fn, 'a') as f:
+                f.write('\n')
+            self.assertTrue(ydl.in_download_archive(info('e')))
+
+            # Replaced archive
+            with open(archive_fn, 'w') as f:
+                f.write('test f\n')
+            self.assertTrue(ydl.in_download_archive(info('f')))
+            self.assertFalse(ydl.in_download_archive(info('a')))
+        finally:
+            try_rm(archive_fn)
+
     def test_urlopen_no_file_protocol(self):
         # see https://github.com/rg3/youtube-dl/issues/8227
         ydl = YDL()
@@ -736,6 +977,119 @@ class TestYoutubeDL(unittest.TestCase):
         downloaded = ydl.downloaded_info_dicts[0]
         self.assertEqual(downloaded['url'], TEST_URL)
 
+    def test_suitable_ies(self):
+        ydl = YDL()
+
+        class FooIE(InfoExtractor):
+            _VALID_URL = r'https?://(?:www\.)?foo\.com/'
+
+        class AnyIE(InfoExtractor):
+            @classmethod
+            def suitable(cls, url):
+                return url.endswith('.any')
+
+        class BarIE(InfoExtractor):
+            _VALID_URL = r'https?://(?:[^/]+\.)?bar\.com/'
+
+        ydl.add_info_extractor(FooIE)
+        ydl.add_info_extractor(AnyIE)
+
+        def suitable(url):
+            return [ie.ie_key() for ie in ydl._suitable_ies(url)]
+
+        self.assertEqual(suitable('http://www.foo.com/x.any'), ['Foo', 'Any'])
+        self.assertEqual(suitable('http://foo.bar.com/x'), ['Any'])
+        # IEs added after the index was built are indexed as well
+        ydl.add_info_extractor(BarIE)
+        self.assertEqual(suitable('http://foo.bar.com/x'), ['Any', 'Bar'])
+        self.assertEqual(suitable('http://BAR.com/x'), ['Any', 'Bar'])
+
+    def test_expand_fragments(self):
+        fmt = {
+            'format_id': 'dash',
+            'url': 'http://example.com/',
+            'protocol': 'http_dash_segments',
+            'fragment_template': {
+                'media_template': 'http://example.com/%(Number)d.m4s',
+                'initialization_url': 'http://example.com/init.mp4',
+                'start_number': 1,
+                'timescale': 1,
+                'total_number': 2,
+                'segment_duration': 5.0,
+            },
+        }
+        info = {'id': 'test', 'formats': [fmt], 'requested_formats': [fmt]}
+        info.update(fmt)
+        expanded = YoutubeDL.expand_fragments(info)
+        fragments = [
+            {'url': 'http://example.com/init.mp4'},
+            {'url': 'http://example.com/1.m4s', 'duration': 5.0},
+            {'url': 'http://example.com/2.m4s', 'duration': 5.0},
+        ]
+        self.assertEqual(expanded['fragments'], fragments)
+        self.assertEqual(expanded['formats'][0]['fragments'], fragments)
+        self.assertEqual(expanded['requested_formats'][0]['fragments'], fragments)
+        # The info dict itself is left compact
+        self.assertFalse('fragments' in info)
+        self.assertFalse('fragments' in fmt)
+
+    def test_extraction_cache(self):
+        cachedir = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'testdata', 'extraction_cache_test')
+        extracted = []
+
+        class FooIE(InfoExtractor):
+            _VALID_URL = r'foo:(?P<id>.+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append(video_id)
+                self._set_cookie('example.com', 'session', video_id)
+                return {
+                    'id': video_id,
+                    'title': video_id,
+                    'url': TEST_URL + '?expires=%d' % (time.time() + (-1 if video_id == 'expired' else 3600)),
+                }
+
+        def extract(url, **params):
+            ydl = YDL(dict({'cachedir': cachedir, 'extraction_cache_ttl': 600}, **params))
+            ydl.add_info_extractor(FooIE(ydl))
+            return ydl.extract_info(url, download=False)
+
+        try:
+            info = extract('foo:a')
+            self.assertEqual(info['id'], 'a')
+            self.assertEqual(extract('foo:a')['url'], info['url'])
+            self.assertEqual(extracted, ['a'])
+            # Extraction parameters are part of the key
+            extract('foo:a', noplaylist=True)
+            self.assertEqual(extracted, ['a', 'a'])
+            extract('foo:a', extraction_cache_ttl=None)
+            self.assertEqual(extracted, ['a', 'a', 'a'])
+            # So are the credentials
+            extract('foo:a', password='secret')
+            self.assertEqual(extracted, ['a', 'a', 'a', 'a'])
+            extract('foo:a', password='secret')
+            self.assertEqual(extracted, ['a', 'a', 'a', 'a'])
+            # The content of cookie files isn't known
+            extract('foo:a', cookiefile=os.path.join(cachedir, 'cookies.txt'))
+            self.assertEqual(extracted, ['a', 'a', 'a', 'a', 'a'])
+            # The cookies set during the extraction are restored
+            ydl = YDL({'cachedir': cachedir, 'extraction_cache_ttl': 600})
+            ydl.add_info_extractor(FooIE(ydl))
+            ydl.extract_info('foo:a', download=False)
+            self.assertEqual(len(extracted), 5)
+            self.assertEqual(
+                [(c.domain, c.name, c.value) for c in ydl.cookiejar],
+                [('example.com', 'session', 'a')])
+            del extracted[:]
+            # Results are dropped when their media URLs expire
+            extract('foo:expired')
+            extract('foo:expired')
+            self.assertEqual(extracted, ['expired', 'expired'])
+        finally:
+            shutil.rmtree(cachedir, ignore_errors=True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,9 +8,11 @@ import sys
 import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from youtube_dl.aes import aes_decrypt, aes_encrypt, aes_cbc_decrypt, aes_decrypt_text
+from youtube_dl.aes import (
+    aes_decrypt, aes_encrypt, aes_cbc_decrypt, aes_cbc_decrypt_bytes, aes_ctr_decrypt_bytes, aes_decrypt_text)
 from youtube_dl.utils import bytes_to_intlist, intlist_to_bytes
 import base64
+import binascii
 
 # the encrypted data can be generate with 'devscripts/generate_aes_testdata.py'
 
@@ -34,6 +36,26 @@ class TestAES(unittest.TestCase):
         decrypted = intlist_to_bytes(aes_cbc_decrypt(data, self.key, self.iv))
         self.assertEqual(decrypted.rstrip(b'\x08'), self.secret_msg)
 
+    def test_cbc_decrypt_bytes(self):
+        # NIST SP 800-38A, F.2.1 and F.2.5
+        plaintext = binascii.unhexlify(
+            '6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51')
+        iv = binascii.unhexlify('000102030405060708090a0b0c0d0e0f')
+        self.assertEqual(aes_cbc_decrypt_bytes(
+            binascii.unhexlify('7649abac8119b246cee98e9b12e9197d5086cb9b507219ee95db113a917678b2'),
+            binascii.unhexlify('2b7e151628aed2a6abf7158809cf4f3c'), iv), plaintext)
+        self.assertEqual(aes_cbc_decrypt_bytes(
+            bytearray(binascii.unhexlify('f58c4c04d6e5f1ba779eabfb5f7bfbd69cfc4e967edb808d679f777bc6702c7d')),
+            binascii.unhexlify('603deb1015ca71be2b73aef0857d77811f352c073b6108d72d9810a30914dff4'), iv), plaintext)
+
+    def test_ctr_decrypt_bytes(self):
+        # NIST SP 800-38A, F.5.1
+        self.assertEqual(aes_ctr_decrypt_bytes(
+            binascii.unhexlify('874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffd'),
+            binascii.unhexlify('2b7e151628aed2a6abf7158809cf4f3c'),
+            binascii.unhexlify('f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff')),
+            binascii.unhexlify('6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e'))
+
     def test_decrypt_text(self):
         password = intlist_to_bytes(self.key).decode('utf-8')
         encrypted = base64.b64encode(
@@ -4,6 +4,7 @@
 from __future__ import unicode_literals
 
 import shutil
+import time
 
 # Allow direct execution
 import os
@@ -15,6 +16,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from test.helper import FakeYDL
 from youtube_dl.cache import Cache
 
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
 
 def _is_empty(d):
     return not bool(os.listdir(d))
@@ -54,6 +60,79 @@ class TestCache(unittest.TestCase):
         self.assertFalse(os.path.exists(self.test_dir))
         self.assertEqual(c.load('test_cache', 'k.'), None)
 
+    def test_prune(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+        })
+        c = Cache(ydl)
+        c.prune('test_cache', 0)
+        for i, key in enumerate(('a', 'b', 'c')):
+            c.store('test_cache', key, 'x' * 100)
+            fn = os.path.join(self.test_dir, 'test_cache', key + '.json')
+            os.utime(fn, (1000 + i, 1000 + i))
+        c.prune('test_cache', 250)
+        self.assertEqual(c.load('test_cache', 'a'), None)
+        self.assertEqual(c.load('test_cache', 'b'), 'x' * 100)
+        self.assertEqual(c.load('test_cache', 'c'), 'x' * 100)
+        c.prune('test_cache', 0)
+        self.assertTrue(_is_empty(os.path.join(self.test_dir, 'test_cache')))
+
+    def test_ttl(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_ttl': 100,
+        })
+        c = Cache(ydl)
+        c.store('test_cache', 'a', 1)
+        c.store('test_cache', 'b', 2)
+        fn = os.path.join(self.test_dir, 'test_cache', 'a.json')
+        os.utime(fn, (time.time(), time.time() - 200))
+        self.assertEqual(c.load('test_cache', 'a'), None)
+        self.assertFalse(os.path.exists(fn))
+        self.assertEqual(c.load('test_cache', 'b'), 2)
+
+    def test_max_size(self):
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_max_size': 250,
+        })
+        c = Cache(ydl)
+        for i, key in enumerate(('a', 'b')):
+            c.store('test_cache', key, 'x' * 100)
+            fn = os.path.join(self.test_dir, 'test_cache', key + '.json')
+            os.utime(fn, (1000 + i, 1000 + i))
+        # Loading a marks it as the most recently used entry
+        self.assertEqual(c.load('test_cache', 'a'), 'x' * 100)
+        c.store('test_cache2', 'c', 'x' * 100)
+        self.assertEqual(c.load('test_cache', 'a'), 'x' * 100)
+        self.assertEqual(c.load('test_cache', 'b'), None)
+        self.assertEqual(c.load('test_cache2', 'c'), 'x' * 100)
+        self.assertEqual(c.stats, {'test_cache': (2, 1), 'test_cache2': (1, 0)})
+
+    def test_sqlite(self):
+        if sqlite3 is None:
+            return
+        ydl = FakeYDL({
+            'cachedir': self.test_dir,
+            'cache_backend': 'sqlite',
+            'cache_max_size': 250,
+        })
+        c = Cache(ydl)
+        obj = {'x': 1, 'y': ['ä', '\\a', True]}
+        self.assertEqual(c.load('test_cache', 'k.'), None)
+        c.store('test_cache', 'k.', obj)
+        self.assertEqual(c.load('test_cache', 'k.'), obj)
+        self.assertEqual(os.listdir(self.test_dir), ['cache.sqlite'])
+        for key in ('a', 'b', 'c'):
+            c.store('test_cache', key, 'x' * 100)
+        self.assertEqual(c.load('test_cache', 'k.'), None)
+        self.assertEqual(c.load('test_cache', 'a'), None)
+        self.assertEqual(c.load('test_cache', 'c'), 'x' * 100)
+        c.prune('test_cache', 0)
+        self.assertEqual(c.load('test_cache', 'c'), None)
+        c.remove()
+        self.assertFalse(os.path.exists(self.test_dir))
+
 
 if __name__ == '__main__':
     unittest.main()
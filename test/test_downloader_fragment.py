@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import io
+import os
+import re
+import sys
+import time
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from test.helper import try_rm
+from youtube_dl import YoutubeDL
+from youtube_dl.utils import DownloadError
+from youtube_dl.compat import compat_http_server
+from youtube_dl.downloader.dash import DashSegmentsFD
+from youtube_dl.downloader.external import FFmpegRemuxer
+from youtube_dl.downloader.hls import HlsFD
+import threading
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_FILE = os.path.join(TEST_DIR, 'test_fragment.mp4')
+
+
+def http_server_port(httpd):
+    return httpd.socket.getsockname()[1]
+
+
+def fragment_content(num):
+    return ('<fragment %d>' % num).encode('ascii') * 100
+
+
+# A single file with the 20 first fragments, the second half after some junk
+BYTERANGE_MEDIA = (
+    b''.join(fragment_content(i) for i in range(10)) + b'junk' +
+    b''.join(fragment_content(i) for i in range(10, 20)))
+
+
+class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_content(self, content, content_type='video/mp4'):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def do_GET(self):
+        mobj = re.match(r'^/frag(\d+)$', self.path)
+        if mobj:
+            num = int(mobj.group(1))
+            self.server.requested_fragments.append(num)
+            if num in self.server.missing_fragments:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_content(fragment_content(num))
+        elif self.path == '/index.m3u8':
+            self.server.manifest_requests += 1
+            self.send_content(
+                ('#EXTM3U\n#EXT-X-TARGETDURATION:10\n' + ''.join(
+                    '#EXTINF:10,\nfrag%d\n' % i for i in range(self.server.fragment_count)) +
+                    '#EXT-X-ENDLIST\n').encode('utf-8'),
+                'application/vnd.apple.mpegurl')
+        elif self.path == '/media':
+            range_header = self.headers.get('Range')
+            self.server.requested_ranges.append(range_header)
+            start, end = map(int, re.match(r'bytes=(\d+)-(\d+)$', range_header).groups())
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end, len(BYTERANGE_MEDIA)))
+            self.send_header('Content-Type', 'video/mp4')
+            self.send_header('Content-Length', str(end - start + 1))
+            self.end_headers()
+            self.wfile.write(BYTERANGE_MEDIA[start:end + 1])
+        elif self.path == '/byterange.m3u8':
+            second_half_start = len(b''.join(fragment_content(i) for i in range(10))) + len(b'junk')
+            self.send_content(
+                ('#EXTM3U\n#EXT-X-TARGETDURATION:10\n' + ''.join(
+                    '#EXTINF:10,\n#EXT-X-BYTERANGE:%d%s\nmedia\n' % (
+                        len(fragment_content(i)),
+                        '@0' if i == 0 else '@%d' % second_half_start if i == 10 else '')
+                    for i in range(20)) +
+                    '#EXT-X-ENDLIST\n').encode('utf-8'),
+                'application/vnd.apple.mpegurl')
+        elif self.path == '/live.m3u8':
+            # Every reload slides the window of 4 fragments by 2, the stream
+            # ends after 3 reloads
+            reloads = self.server.live_reloads
+            self.server.live_reloads += 1
+            self.send_content(
+                ('#EXTM3U\n#EXT-X-TARGETDURATION:1\n#EXT-X-MEDIA-SEQUENCE:%d\n' % (2 * reloads) + ''.join(
+                    '#EXTINF:1,\nfrag%d\n' % i for i in range(2 * reloads, 2 * reloads + 4)) +
+                    ('#EXT-X-ENDLIST\n' if reloads == 3 else '')).encode('utf-8'),
+                'application/vnd.apple.mpegurl')
+        elif self.path == '/restart.m3u8':
+            # The stream restarts with new media sequence numbers on the
+            # first reload and ends
+            reloads = self.server.live_reloads
+            self.server.live_reloads += 1
+            self.send_content(
+                ('#EXTM3U\n#EXT-X-TARGETDURATION:1\n#EXT-X-MEDIA-SEQUENCE:%d\n' % (100 if reloads == 0 else 0) + ''.join(
+                    '#EXTINF:1,\nfrag%d\n' % i for i in range(4 * reloads, 4 * reloads + 4)) +
+                    ('#EXT-X-ENDLIST\n' if reloads == 1 else '')).encode('utf-8'),
+                'application/vnd.apple.mpegurl')
+        else:
+            assert False
+
+
+class FakeLogger(object):
+    def debug(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        pass
+
+
+class TestFragmentDownload(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), HTTPTestRequestHandler)
+        self.httpd.fragment_count = 20
+        self.httpd.missing_fragments = set()
+        self.httpd.requested_fragments = []
+        self.httpd.live_reloads = 0
+        self.httpd.manifest_requests = 0
+        self.httpd.requested_ranges = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        try_rm(TEST_FILE)
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        try_rm(TEST_FILE)
+        try_rm(TEST_FILE + '.part')
+        try_rm(TEST_FILE + '.ytdl')
+
+    def expected_content(self):
+        return b''.join(
+            fragment_content(i) for i in range(self.httpd.fragment_count)
+            if i not in self.httpd.missing_fragments)
+
+    def download(self, fd_class, info_dict, params={}, ydl=None):
+        ydl = ydl or YoutubeDL({'logger': FakeLogger()})
+        fd = fd_class(ydl, dict({'fragment_retries': 0}, **params))
+        self.assertTrue(fd.real_download(TEST_FILE, info_dict))
+        with open(TEST_FILE, 'rb') as f:
+            return f.read()
+
+    def dash_info(self):
+        return {
+            'url': 'http://localhost:%d/' % self.port,
+            'fragments': [
+                {'url': 'http://localhost:%d/frag%d' % (self.port, i)}
+                for i in range(self.httpd.fragment_count)],
+        }
+
+    def hls_info(self):
+        return {'url': 'http://localhost:%d/index.m3u8' % self.port}
+
+    def test_dash_sequential(self):
+        self.assertEqual(
+            self.download(DashSegmentsFD, self.dash_info()), self.expected_content())
+
+    def test_dash_concurrent(self):
+        self.assertEqual(
+            self.download(DashSegmentsFD, self.dash_info(), {
+                'concurrent_fragment_downloads': 4,
+            }),
+            self.expected_content())
+
+    def test_dash_fragment_template(self):
+        for workers in (1, 4):
+            self.assertEqual(
+                self.download(DashSegmentsFD, {
+                    'url': 'http://localhost:%d/' % self.port,
+                    'fragment_template': {
+                        'media_template': 'http://localhost:%d/frag%%(Number)d' % self.port,
+                        'start_number': 0,
+                        'timescale': 1,
+                        'timeline': [[0, 2, self.httpd.fragment_count - 1]],
+                    },
+                }, {'concurrent_fragment_downloads': workers}),
+                self.expected_content())
+            try_rm(TEST_FILE)
+
+    def test_hls_concurrent(self):
+        self.assertEqual(
+            self.download(HlsFD, self.hls_info(), {
+                'concurrent_fragment_downloads': 3,
+            }),
+            self.expected_content())
+
+    def test_hls_live(self):
+        content = self.download(HlsFD, {
+            'url': 'http://localhost:%d/live.m3u8' % self.port,
+            'is_live': True,
+        }, {'concurrent_fragment_downloads': 2})
+        # Starts 3 fragments before the end of the first playlist
+        self.assertEqual(content, b''.join(fragment_content(i) for i in range(1, 10)))
+        self.assertEqual(self.httpd.live_reloads, 4)
+        self.assertFalse(os.path.exists(TEST_FILE + '.ytdl'))
+
+    def test_hls_live_restart(self):
+        content = self.download(HlsFD, {
+            'url': 'http://localhost:%d/restart.m3u8' % self.port,
+            'is_live': True,
+        })
+        self.assertEqual(content, b''.join(fragment_content(i) for i in range(1, 8)))
+        self.assertEqual(self.httpd.live_reloads, 2)
+
+    def test_hls_byterange(self):
+        info = {'url': 'http://localhost:%d/byterange.m3u8' % self.port}
+        self.assertEqual(self.download(HlsFD, info), self.expected_content())
+        # Adjacent ranges are fetched at once
+        self.assertEqual(self.httpd.requested_ranges, ['bytes=0-11999', 'bytes=12004-25003'])
+
+        self.httpd.requested_ranges = []
+        try_rm(TEST_FILE)
+        max_size = HlsFD._MAX_COALESCED_RANGE_SIZE
+        HlsFD._MAX_COALESCED_RANGE_SIZE = 5000
+        try:
+            self.assertEqual(
+                self.download(HlsFD, info, {'concurrent_fragment_downloads': 2}),
+                self.expected_content())
+        finally:
+            HlsFD._MAX_COALESCED_RANGE_SIZE = max_size
+        self.assertEqual(len(self.httpd.requested_ranges), 7)
+
+    def test_downloaded_manifest(self):
+        manifest = ('#EXTM3U\n#EXT-X-TARGETDURATION:10\n' + ''.join(
+            '#EXTINF:10,\nfrag%d\n' % i for i in range(self.httpd.fragment_count)) +
+            '#EXT-X-ENDLIST\n')
+        info = self.hls_info()
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        ydl.add_downloaded_manifest(info['url'], {
+            'url': info['url'],
+            'content': manifest,
+            'expires': time.time() + 60,
+        })
+        self.assertEqual(self.download(HlsFD, info, ydl=ydl), self.expected_content())
+        self.assertEqual(self.httpd.manifest_requests, 0)
+
+        # It is only used once
+        try_rm(TEST_FILE)
+        self.assertEqual(self.download(HlsFD, info, ydl=ydl), self.expected_content())
+        self.assertEqual(self.httpd.manifest_requests, 1)
+
+        try_rm(TEST_FILE)
+        ydl.add_downloaded_manifest(info['url'], {
+            'url': info['url'],
+            'content': manifest,
+            'expires': time.time() - 1,
+        })
+        self.assertEqual(self.download(HlsFD, info, ydl=ydl), self.expected_content())
+        self.assertEqual(self.httpd.manifest_requests, 2)
+
+    def test_skip_unavailable_fragments(self):
+        self.httpd.missing_fragments = set([5, 11])
+        for workers in (1, 4):
+            self.assertEqual(
+                self.download(HlsFD, self.hls_info(), {
+                    'concurrent_fragment_downloads': workers,
+                    'skip_unavailable_fragments': True,
+                }),
+                self.expected_content())
+            try_rm(TEST_FILE)
+
+    def test_fragments_in_memory(self):
+        self.download(DashSegmentsFD, self.dash_info(), {
+            'concurrent_fragment_downloads': 2,
+        })
+        self.assertFalse([
+            f for f in os.listdir(TEST_DIR) if f.startswith('test_fragment.mp4')
+            and f != 'test_fragment.mp4'])
+
+    def test_output_stream(self):
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        fd = DashSegmentsFD(ydl, {'concurrent_fragment_downloads': 2})
+        stream = io.BytesIO()
+        fd.set_output_stream(stream)
+        self.assertTrue(fd.real_download(TEST_FILE, self.dash_info()))
+        self.assertEqual(stream.getvalue(), self.expected_content())
+        self.assertFalse([
+            f for f in os.listdir(TEST_DIR) if f.startswith('test_fragment.mp4')])
+
+    def test_remux_options(self):
+        self.assertEqual(HlsFD.get_remux_options(self.hls_info(), {}), None)
+        self.assertEqual(DashSegmentsFD.get_remux_options(
+            dict(self.dash_info(), container='mp4_dash'), {'remux_fragments': True}), None)
+
+        # Don't depend on ffmpeg being installed
+        available = FFmpegRemuxer.available
+        FFmpegRemuxer.available = staticmethod(lambda input_count=1: True)
+        try:
+            params = {'remux_fragments': True}
+            aac_info = dict(self.hls_info(), acodec='mp4a.40.2')
+            self.assertEqual(HlsFD.get_remux_options(aac_info, params), HlsFD._REMUX_OPTIONS)
+            # ffmpeg rejects aac_adtstoasc for the other codecs
+            self.assertEqual(HlsFD.get_remux_options(dict(self.hls_info(), acodec='mp3'), params), None)
+            self.assertEqual(HlsFD.get_remux_options(dict(self.hls_info(), acodec='ac-3'), params), None)
+            self.assertEqual(HlsFD.get_remux_options(self.hls_info(), params), None)
+            m4a_info = dict(self.dash_info(), container='m4a_dash')
+            self.assertEqual(
+                DashSegmentsFD.get_remux_options(m4a_info, params), DashSegmentsFD._REMUX_OPTIONS)
+            # Nor are the downloads remuxed when they are not to be fixed up
+            for fixup in ('never', 'warn', 'ignore'):
+                fixup_params = dict(params, fixup=fixup)
+                self.assertEqual(HlsFD.get_remux_options(aac_info, fixup_params), None)
+                self.assertEqual(DashSegmentsFD.get_remux_options(m4a_info, fixup_params), None)
+        finally:
+            FFmpegRemuxer.available = available
+
+    def test_keep_fragments(self):
+        content = self.download(DashSegmentsFD, self.dash_info(), {
+            'keep_fragments': True,
+        })
+        self.assertEqual(content, self.expected_content())
+        for i in range(self.httpd.fragment_count):
+            frag_filename = TEST_FILE + '.part-Frag%d' % i
+            with open(frag_filename, 'rb') as f:
+                self.assertEqual(f.read(), fragment_content(i))
+            try_rm(frag_filename)
+
+    def test_resume(self):
+        for workers in (1, 4):
+            self.httpd.missing_fragments = set([7])
+            self.assertRaises(
+                DownloadError, self.download, DashSegmentsFD, self.dash_info(), {
+                    'concurrent_fragment_downloads': workers,
+                    'skip_unavailable_fragments': False,
+                })
+            self.assertTrue(os.path.exists(TEST_FILE + '.ytdl'))
+            # Simulate a partially written fragment
+            with open(TEST_FILE + '.part', 'ab') as f:
+                f.write(b'garbage')
+
+            self.httpd.missing_fragments = set()
+            self.httpd.requested_fragments = []
+            self.assertEqual(
+                self.download(DashSegmentsFD, self.dash_info(), {
+                    'concurrent_fragment_downloads': workers,
+                }),
+                self.expected_content())
+            self.assertEqual(
+                sorted(self.httpd.requested_fragments),
+                list(range(7, self.httpd.fragment_count)))
+            self.assertFalse(os.path.exists(TEST_FILE + '.ytdl'))
+            try_rm(TEST_FILE)
+
+    def test_no_resume_without_continuedl(self):
+        self.httpd.missing_fragments = set([7])
+        self.assertRaises(
+            DownloadError, self.download, DashSegmentsFD, self.dash_info(), {
+                'skip_unavailable_fragments': False,
+            })
+        self.httpd.missing_fragments = set()
+        self.httpd.requested_fragments = []
+        self.assertEqual(
+            self.download(DashSegmentsFD, self.dash_info(), {'continuedl': False}),
+            self.expected_content())
+        self.assertEqual(
+            self.httpd.requested_fragments, list(range(self.httpd.fragment_count)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import re
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import threading
+
+from test.helper import try_rm
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import compat_http_server
+from youtube_dl.downloader.http import HttpFD
+
+try:
+    from socketserver import ThreadingMixIn
+except ImportError:  # Python 2
+    from SocketServer import ThreadingMixIn
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_FILE = os.path.join(TEST_DIR, 'test_http_download.mp4')
+TEST_SIZE = 10000
+TEST_DATA = bytes(bytearray(i % 251 for i in range(TEST_SIZE)))
+
+
+def http_server_port(httpd):
+    return httpd.socket.getsockname()[1]
+
+
+class ThreadingHTTPServer(ThreadingMixIn, compat_http_server.HTTPServer):
+    daemon_threads = True
+
+
+class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        with self.server.lock:
+            self.server.requested_ranges.append(range_header)
+        mobj = re.match(r'bytes=(\d+)-(\d*)$', range_header or '')
+        if self.path == '/file' and mobj:
+            start = int(mobj.group(1))
+            end = int(mobj.group(2)) if mobj.group(2) else TEST_SIZE - 1
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end, TEST_SIZE))
+            content = TEST_DATA[start:end + 1]
+        else:
+            self.send_response(200)
+            content = TEST_DATA
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FakeLogger(object):
+    def debug(self, msg):
+        pass
+
+    def warning(self, msg):
+        pass
+
+    def error(self, msg):
+        pass
+
+
+class TestHttpFD(unittest.TestCase):
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(('localhost', 0), HTTPTestRequestHandler)
+        self.httpd.lock = threading.Lock()
+        self.httpd.requested_ranges = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.remove_files()
+
+    def remove_files(self):
+        try_rm(TEST_FILE)
+        try_rm(TEST_FILE + '.part')
+        try_rm(TEST_FILE + '.ytdl')
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.remove_files()
+
+    def download(self, path, params={}):
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        fd = HttpFD(ydl, dict({'http_connections': 4}, **params))
+        fd._MIN_RANGE_SIZE = 1000
+        self.assertTrue(fd.real_download(TEST_FILE, {
+            'url': 'http://localhost:%d%s' % (self.port, path),
+        }))
+        self.assertFalse(os.path.exists(TEST_FILE + '.ytdl'))
+        with open(TEST_FILE, 'rb') as f:
+            return f.read()
+
+    def test_ranges(self):
+        self.assertEqual(self.download('/file'), TEST_DATA)
+        self.assertEqual(sorted(self.httpd.requested_ranges), [
+            'bytes=0-0', 'bytes=0-2499', 'bytes=2500-4999', 'bytes=5000-7499',
+            'bytes=7500-9999'])
+
+    def test_single_connection(self):
+        self.assertEqual(self.download('/file', {'http_connections': 1}), TEST_DATA)
+        self.assertEqual(self.httpd.requested_ranges, [None])
+
+    def test_ranges_unsupported(self):
+        self.assertEqual(self.download('/norange'), TEST_DATA)
+        self.assertEqual(self.httpd.requested_ranges, ['bytes=0-0', None])
+
+    def test_resume(self):
+        with open(TEST_FILE + '.part', 'wb') as f:
+            f.write(TEST_DATA[:3000] + b'\0' * 2000 + TEST_DATA[5000:6000] + b'\0' * 4000)
+        with open(TEST_FILE + '.ytdl', 'w') as f:
+            json.dump({'downloader': {'http_ranges': {
+                'size': TEST_SIZE,
+                'ranges': [[0, 4999, 3000], [5000, 9999, 1000]],
+            }}}, f)
+        self.assertEqual(self.download('/file'), TEST_DATA)
+        self.assertEqual(sorted(self.httpd.requested_ranges), [
+            'bytes=0-0', 'bytes=3000-4999', 'bytes=6000-9999'])
+
+
+if __name__ == '__main__':
+    unittest.main()
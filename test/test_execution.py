@@ -5,9 +5,13 @@ from __future__ import unicode_literals
 
 import unittest
 
+import contextlib
 import sys
 import os
+import json
+import shutil
 import subprocess
+import tempfile
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from youtube_dl.utils import encodeArgument
@@ -20,6 +24,22 @@ try:
 except AttributeError:
     _DEV_NULL = open(os.devnull, 'wb')
 
+# Prints the extractor picked for a URL on startup and the extractor modules
+# that imports
+STARTUP_SCRIPT = '''
+import json, sys
+from youtube_dl import YoutubeDL
+ydl = YoutubeDL({'quiet': True})
+url = 'https://www.youtube.com/watch?v=BaW_jenozKc'
+ie = next(ie for ie in ydl._suitable_ies(url) if ie.suitable(url))
+print(json.dumps({
+    'ie_key': ie.ie_key(),
+    'extractor_modules': [
+        name for name, module in sys.modules.items()
+        if name.startswith('youtube_dl.extractor.') and module is not None],
+}))
+'''
+
 
 class TestExecution(unittest.TestCase):
     def test_import(self):
@@ -39,5 +59,53 @@ class TestExecution(unittest.TestCase):
         _, stderr = p.communicate()
         self.assertFalse(stderr)
 
+    @contextlib.contextmanager
+    def _package_copy(self, lazy_extractors=True):
+        """Yield the directory of a copy of the source tree, with the lazy
+        extractors module built if lazy_extractors is set"""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            for dirname in ('youtube_dl', 'test', 'devscripts'):
+                shutil.copytree(
+                    os.path.join(rootDir, dirname), os.path.join(tmp_dir, dirname),
+                    ignore=shutil.ignore_patterns(
+                        '*.pyc', '__pycache__', 'lazy_extractors.py*'))
+            if lazy_extractors:
+                subprocess.check_call(
+                    [sys.executable, 'devscripts/make_lazy_extractors.py',
+                     os.path.join('youtube_dl', 'extractor', 'lazy_extractors.py')],
+                    cwd=tmp_dir, stdout=_DEV_NULL, stderr=_DEV_NULL)
+            yield tmp_dir
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def test_lazy_extractors(self):
+        with self._package_copy() as tmp_dir:
+            subprocess.check_call(
+                [sys.executable, 'test/test_all_urls.py'],
+                cwd=tmp_dir, stdout=_DEV_NULL, stderr=_DEV_NULL)
+
+    def test_lazy_extractors_startup(self):
+        def startup(cwd):
+            p = subprocess.Popen(
+                [sys.executable, '-c', STARTUP_SCRIPT],
+                cwd=cwd, stdout=subprocess.PIPE, stderr=_DEV_NULL)
+            stdout, _ = p.communicate()
+            self.assertEqual(p.returncode, 0)
+            return json.loads(stdout.decode('utf-8'))
+
+        with self._package_copy(lazy_extractors=False) as tmp_dir:
+            eager = startup(tmp_dir)
+        with self._package_copy() as tmp_dir:
+            lazy = startup(tmp_dir)
+
+        self.assertEqual(eager['ie_key'], 'Youtube')
+        self.assertEqual(lazy['ie_key'], 'Youtube')
+        self.assertGreater(len(eager['extractor_modules']), 100)
+        self.assertTrue('youtube_dl.extractor.youtube' in eager['extractor_modules'])
+        # Picking an extractor doesn't import any extractor module
+        self.assertFalse('youtube_dl.extractor.youtube' in lazy['extractor_modules'])
+        self.assertLess(len(lazy['extractor_modules']), 5)
+
 if __name__ == '__main__':
     unittest.main()
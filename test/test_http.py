@@ -10,8 +10,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from youtube_dl import YoutubeDL
 from youtube_dl.compat import compat_http_server, compat_urllib_request
+import gzip
+import io
 import ssl
 import threading
+import time
+import zlib
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -60,6 +64,89 @@ class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
             assert False
 
 
+class KeepAliveRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Do not block the single threaded server forever on idle connections
+    timeout = 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        compat_http_server.BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+        self.requests = 0
+
+    def _drop(self):
+        # Close a reused connection without responding, as servers do with
+        # the connections that were idle for too long
+        self.requests += 1
+        if self.path == '/drop' and self.requests > 1:
+            self.close_connection = True
+            return True
+        return False
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.server.posts += 1
+        if self._drop():
+            return
+        self.do_GET()
+
+    def do_GET(self):
+        if self.command == 'GET' and self._drop():
+            return
+        if self.path == '/close':
+            self.close_connection = True
+        content = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(content)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(content)
+
+
+COMPRESSED_DATA = ''.join('%d\n' % i for i in range(100000)).encode('ascii')
+
+
+def _gzip(data):
+    buf = io.BytesIO()
+    gz = gzip.GzipFile(fileobj=buf, mode='wb')
+    gz.write(data)
+    gz.close()
+    return buf.getvalue()
+
+
+class CompressionRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    timeout = 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        compat_http_server.BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def do_GET(self):
+        half = len(COMPRESSED_DATA) // 2
+        encoding, content = {
+            '/gzip': ('gzip', _gzip(COMPRESSED_DATA)),
+            '/gzip_junk': ('gzip', _gzip(COMPRESSED_DATA) + b'\0\0junk'),
+            '/gzip_members': ('gzip', _gzip(COMPRESSED_DATA[:half]) + _gzip(COMPRESSED_DATA[half:])),
+            '/deflate': ('deflate', zlib.compress(COMPRESSED_DATA)),
+            '/deflate_raw': ('deflate', zlib.compress(COMPRESSED_DATA)[2:-4]),
+        }[self.path]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
 class FakeLogger(object):
     def debug(self, msg):
         pass
@@ -90,6 +177,109 @@ class TestHTTP(unittest.TestCase):
         self.assertEqual(r['url'], 'http://localhost:%d/vid.mp4' % self.port)
 
 
+class TestKeepAlive(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), KeepAliveRequestHandler)
+        self.httpd.connections = 0
+        self.httpd.posts = 0
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _fetch(self, ydl, path, data=None):
+        return ydl.urlopen(compat_urllib_request.Request(
+            'http://localhost:%d%s' % (self.port, path), data=data)).read()
+
+    def test_connection_reuse(self):
+        if sys.version_info < (3, 0):
+            return
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        for i in range(5):
+            self.assertEqual(self._fetch(ydl, '/page%d' % i), ('/page%d' % i).encode('utf-8'))
+        self.assertEqual(self.httpd.connections, 1)
+
+        # Connections closed by the server are not reused
+        self.assertEqual(self._fetch(ydl, '/close'), b'/close')
+        self.assertEqual(self._fetch(ydl, '/page'), b'/page')
+        self.assertEqual(self.httpd.connections, 2)
+
+    def test_dropped_connection(self):
+        if sys.version_info < (3, 0):
+            return
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        # GET requests are sent again on a fresh connection
+        self._fetch(ydl, '/page')
+        self.assertEqual(self._fetch(ydl, '/drop'), b'/drop')
+        self.assertEqual(self.httpd.connections, 2)
+
+        # Other requests always get a fresh connection, as they can't be
+        # sent again
+        self.assertEqual(self._fetch(ydl, '/drop', b'data'), b'/drop')
+        self.assertEqual(self.httpd.posts, 1)
+        self.assertEqual(self.httpd.connections, 3)
+
+    def test_post_after_idle(self):
+        if sys.version_info < (3, 0):
+            return
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        self._fetch(ydl, '/page')
+        # The server closes the idle connection in the meantime
+        time.sleep(1.5)
+        self.assertEqual(self._fetch(ydl, '/post', b'data'), b'/post')
+        self.assertEqual(self.httpd.posts, 1)
+
+    def test_no_keep_alive(self):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'no_keep_alive': True})
+        for i in range(3):
+            self.assertEqual(self._fetch(ydl, '/page%d' % i), ('/page%d' % i).encode('utf-8'))
+        self.assertEqual(self.httpd.connections, 3)
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), CompressionRequestHandler)
+        self.httpd.connections = 0
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.ydl = YoutubeDL({'logger': FakeLogger()})
+
+    def tearDown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _urlopen(self, path):
+        return self.ydl.urlopen('http://localhost:%d%s' % (self.port, path))
+
+    def test_decompression(self):
+        for path in ('/gzip', '/gzip_junk', '/gzip_members', '/deflate', '/deflate_raw'):
+            response = self._urlopen(path)
+            self.assertEqual(response.headers.get('Content-Encoding'), None)
+            self.assertEqual(response.read(), COMPRESSED_DATA, path)
+
+    def test_incremental_read(self):
+        response = self._urlopen('/gzip')
+        self.assertEqual(response.read(6), b'0\n1\n2\n')
+        self.assertEqual(response.readline(), b'3\n')
+        self.assertEqual(response.read(), COMPRESSED_DATA[8:])
+        self.assertEqual(response.read(), b'')
+
+    def test_connection_reuse(self):
+        if sys.version_info < (3, 0):
+            return
+        for path in ('/gzip_junk', '/deflate', '/gzip'):
+            self.assertEqual(self._urlopen(path).read(), COMPRESSED_DATA)
+        self.assertEqual(self.httpd.connections, 1)
+
+
 class TestHTTPS(unittest.TestCase):
     def setUp(self):
         certfn = os.path.join(TEST_DIR, 'testcert.pem')
@@ -104,6 +104,24 @@ class TestJSInterpreter(unittest.TestCase):
         }''')
         self.assertEqual(jsi.call_function('x'), [20, 20, 30, 40, 50])
 
+    def test_signature_function(self):
+        jsi = JSInterpreter('''
+        var Xy={ab:function(a){a.reverse()},cd:function(a,b){a.splice(0,b)},
+        ef:function(a,b){var c=a[0];a[0]=a[b%a.length];a[b]=c}};
+        function sig(a){a=a.split("");Xy.ab(a,3);Xy.cd(a,2);Xy.ef(a,4);return a.join("")}
+        ''')
+        f = jsi.extract_function('sig')
+        # Compiled functions can be called any number of times
+        for _ in range(3):
+            self.assertEqual(f(['abcdefgh']), 'bedcfa')
+        self.assertEqual(f(['0123456789']), '36547210')
+
+    def test_literal_per_call(self):
+        jsi = JSInterpreter('function f(a){var x = [1,2,3]; x[0] = a; return x;}')
+        f = jsi.extract_function('f')
+        self.assertEqual(f([4]), [4, 2, 3])
+        self.assertEqual(f([5]), [5, 2, 3])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_dl.m3u8 import parse_m3u8
+
+
+class TestM3U8(unittest.TestCase):
+    def test_media_playlist(self):
+        playlist = parse_m3u8('''#EXTM3U
+#EXT-X-VERSION:4
+#EXT-X-TARGETDURATION:10
+#EXT-X-MEDIA-SEQUENCE:7
+#EXT-X-PLAYLIST-TYPE:VOD
+#EXTINF:9.5,First
+#EXT-X-BYTERANGE:1000@0
+media.ts
+#EXTINF:9.5,
+#EXT-X-BYTERANGE:2000
+media.ts
+#EXT-X-KEY:METHOD=AES-128,URI="key.bin",IV=0x0000000000000000000000000000002a
+#EXTINF:10,
+http://other.example.com/frag.ts
+#EXT-X-DISCONTINUITY
+#EXT-X-KEY:METHOD=NONE
+#EXTINF:3,
+frag.ts
+#EXT-X-ENDLIST
+''', 'http://example.com/path/index.m3u8')
+        self.assertFalse(playlist.is_master)
+        self.assertEqual(playlist.target_duration, 10)
+        self.assertEqual(playlist.media_sequence, 7)
+        self.assertEqual(playlist.playlist_type, 'VOD')
+        self.assertTrue(playlist.ended)
+        segments = playlist.segments
+        self.assertEqual(
+            [segment.uri for segment in segments], [
+                'http://example.com/path/media.ts', 'http://example.com/path/media.ts',
+                'http://other.example.com/frag.ts', 'http://example.com/path/frag.ts'])
+        self.assertEqual([segment.media_sequence for segment in segments], [7, 8, 9, 10])
+        self.assertEqual([segment.duration for segment in segments], [9.5, 9.5, 10, 3])
+        self.assertEqual([segment.title for segment in segments], ['First', None, None, None])
+        self.assertEqual(
+            [segment.byte_range for segment in segments], [(0, 999), (1000, 2999), None, None])
+        self.assertEqual(
+            [segment.discontinuity for segment in segments], [False, False, False, True])
+        self.assertEqual([segment.key for segment in segments[:2]], [None, None])
+        key = segments[2].key
+        self.assertEqual(key.method, 'AES-128')
+        self.assertEqual(key.uri, 'http://example.com/path/key.bin')
+        self.assertEqual(key.iv, b'\0' * 15 + b'\x2a')
+        self.assertEqual(segments[3].key, None)
+
+    def test_live_playlist(self):
+        playlist = parse_m3u8('#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXTINF:6,\n1.ts\n')
+        self.assertFalse(playlist.ended)
+        self.assertEqual(playlist.media_sequence, 0)
+        self.assertEqual([segment.uri for segment in playlist.segments], ['1.ts'])
+
+    def test_decimal_target_duration(self):
+        playlist = parse_m3u8('#EXTM3U\n#EXT-X-TARGETDURATION:9.5\n#EXTINF:9.5,\n1.ts\n')
+        self.assertEqual(playlist.target_duration, 10)
+        playlist = parse_m3u8('#EXTM3U\n#EXT-X-TARGETDURATION:invalid\n#EXTINF:9.5,\n1.ts\n')
+        self.assertEqual(playlist.target_duration, None)
+
+    def test_media_playlist_without_target_duration(self):
+        playlist = parse_m3u8('#EXTM3U\n#EXT-X-MEDIA-SEQUENCE:3\n#EXTINF:10,\na.ts\n#EXT-X-ENDLIST\n')
+        self.assertFalse(playlist.is_master)
+        self.assertEqual([segment.uri for segment in playlist.segments], ['a.ts'])
+        self.assertEqual(playlist.segments[0].media_sequence, 3)
+
+    def test_master_playlist(self):
+        playlist = parse_m3u8('''#EXTM3U
+#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aac",NAME="English",URI="audio/en.m3u8"
+#EXT-X-MEDIA:TYPE=SUBTITLES,GROUP-ID="subs",NAME="English",URI="subs/en.m3u8"
+#EXT-X-MEDIA:TYPE=VIDEO,GROUP-ID="main",NAME="Main"
+#EXT-X-STREAM-INF:BANDWIDTH=1280000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2",VIDEO="main"
+low/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2560000
+http://cdn.example.com/high.m3u8
+''', 'http://example.com/master.m3u8')
+        self.assertTrue(playlist.is_master)
+        self.assertEqual(playlist.segments, [])
+        variants = playlist.variants
+        self.assertEqual(
+            [variant.uri for variant in variants], [
+                'http://example.com/audio/en.m3u8', 'http://example.com/low/index.m3u8',
+                'http://cdn.example.com/high.m3u8'])
+        self.assertEqual(variants[0].stream_info, None)
+        self.assertEqual(variants[0].media['NAME'], 'English')
+        self.assertEqual(variants[1].stream_info['RESOLUTION'], '640x360')
+        self.assertEqual(variants[1].stream_info['CODECS'], 'avc1.4d401e,mp4a.40.2')
+        self.assertEqual(variants[1].media['NAME'], 'Main')
+        self.assertEqual(variants[2].stream_info, {'BANDWIDTH': '2560000'})
+        self.assertEqual(variants[2].media, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
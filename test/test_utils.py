@@ -13,6 +13,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Various small unit tests
 import io
 import json
+import threading
+import time
 import xml.etree.ElementTree
 
 from youtube_dl.utils import (
@@ -69,6 +71,8 @@ from youtube_dl.utils import (
     uppercase_escape,
     lowercase_escape,
     url_basename,
+    url_host_suffixes,
+    url_pattern_hosts,
     urlencode_postdata,
     urshift,
     update_url_query,
@@ -437,6 +441,41 @@ class TestUtil(unittest.TestCase):
             url_basename('http://media.w3.org/2010/05/sintel/trailer.mp4'),
             'trailer.mp4')
 
+    def test_url_pattern_hosts(self):
+        self.assertEqual(
+            url_pattern_hosts(r'https?://(?:www\.)?example\.com/(?P<id>\d+)'),
+            ['example.com'])
+        self.assertEqual(
+            url_pattern_hosts(r'(?:https?://)?(?:www\.|m\.)?foo\.(?:com|net)(?:/|$)'),
+            ['foo.com', 'foo.net'])
+        self.assertEqual(
+            url_pattern_hosts(r'https?://(?:[^/]+\.)?example\.com/'), ['example.com'])
+        self.assertEqual(
+            url_pattern_hosts(r'https?://cdn\d+\.example\.com/'), ['example.com'])
+        self.assertEqual(
+            url_pattern_hosts(r'https?://(?:www\.example\.com/v/|player\.example\.org/\?id=)(?P<id>\d+)'),
+            ['player.example.org', 'www.example.com'])
+        # The host could be anything
+        self.assertEqual(url_pattern_hosts(r'https?://.*?example\.com/'), None)
+        self.assertEqual(url_pattern_hosts(r'https?://(?:www\.)?example\.com'), None)
+        self.assertEqual(url_pattern_hosts(r'https?://example\.com(?:[/?#]|$)'), None)
+        self.assertEqual(url_pattern_hosts(r'(?:example|https?://[^/]+):(?P<id>\d+)'), None)
+        self.assertEqual(url_pattern_hosts(r'.*'), None)
+        # Pseudo schemes
+        self.assertEqual(
+            url_pattern_hosts(r'(?:example:|https?://example\.com/)(?P<id>\d+)'),
+            ['example.com', 'example:'])
+        self.assertEqual(url_pattern_hosts(r'test(?:url)?:(?P<id>.+)'), ['test:', 'testurl:'])
+        self.assertEqual(url_pattern_hosts(r':ytfav(?:ou?rites)?'), [':'])
+
+    def test_url_host_suffixes(self):
+        self.assertEqual(
+            url_host_suffixes('http://WWW.Example.com/foo?bar'),
+            ['www.example.com', 'example.com', 'com', 'http:'])
+        self.assertEqual(url_host_suffixes('//example.com'), ['example.com', 'com'])
+        self.assertEqual(url_host_suffixes('example.com/foo'), ['example.com', 'com'])
+        self.assertEqual(url_host_suffixes('ytsearch:foo'), ['ytsearch:foo', 'ytsearch:'])
+
     def test_parse_age_limit(self):
         self.assertEqual(parse_age_limit(None), None)
         self.assertEqual(parse_age_limit(False), None)
@@ -503,13 +542,15 @@ class TestUtil(unittest.TestCase):
                 for i in range(firstid, upto):
                     yield i
 
-            pl = OnDemandPagedList(get_page, pagesize)
-            got = pl.getslice(*sliceargs)
-            self.assertEqual(got, expected)
+            for prefetch in (1, 3):
+                pl = OnDemandPagedList(get_page, pagesize, prefetch=prefetch)
+                got = pl.getslice(*sliceargs)
+                self.assertEqual(got, expected)
 
-            iapl = InAdvancePagedList(get_page, size // pagesize + 1, pagesize)
-            got = iapl.getslice(*sliceargs)
-            self.assertEqual(got, expected)
+                iapl = InAdvancePagedList(
+                    get_page, size // pagesize + 1, pagesize, prefetch=prefetch)
+                got = iapl.getslice(*sliceargs)
+                self.assertEqual(got, expected)
 
         testPL(5, 2, (), [0, 1, 2, 3, 4])
         testPL(5, 2, (1,), [1, 2, 3, 4])
@@ -520,6 +561,41 @@ class TestUtil(unittest.TestCase):
         testPL(5, 2, (2, 99), [2, 3, 4])
         testPL(5, 2, (20, 99), [])
 
+    def test_paged_list_prefetch(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max_running': 0, 'fetched': []}
+
+        def get_page(pagenum):
+            with lock:
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'], state['running'])
+                state['fetched'].append(pagenum)
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            if pagenum >= 5:
+                # Past the last page
+                raise ExtractorError('page %d does not exist' % pagenum)
+            return range(pagenum * 10, pagenum * 10 + (10 if pagenum < 4 else 5))
+
+        pl = OnDemandPagedList(get_page, 10)
+        self.assertEqual(pl.getslice(0, None, 4), list(range(45)))
+        self.assertTrue(state['max_running'] > 1)
+        self.assertEqual(sorted(state['fetched'])[:5], [0, 1, 2, 3, 4])
+        self.assertTrue(max(state['fetched']) < 8)
+
+        state['fetched'] = []
+        self.assertEqual(pl.getslice(5, 25, 4), list(range(5, 25)))
+        self.assertEqual(sorted(state['fetched']), [0, 1, 2])
+
+        pl = OnDemandPagedList(get_page, 5)
+        self.assertRaises(ExtractorError, pl.getslice, 0, None, 4)
+
+        state['fetched'] = []
+        iapl = InAdvancePagedList(get_page, 5, 10, prefetch=4)
+        self.assertEqual(iapl.getslice(12, 33), list(range(12, 33)))
+        self.assertEqual(sorted(state['fetched']), [1, 2, 3])
+
     def test_read_batch_urls(self):
         f = io.StringIO('''\xef\xbb\xbf foo
             bar\r
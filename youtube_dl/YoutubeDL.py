@@ -9,6 +9,7 @@ import copy
 import datetime
 import errno
 import fileinput
+import hashlib
 import io
 import itertools
 import json
@@ -21,6 +22,7 @@ import shutil
 import subprocess
 import socket
 import sys
+import threading
 import time
 import tokenize
 import traceback
@@ -33,9 +35,11 @@ from .compat import (
     compat_http_client,
     compat_kwargs,
     compat_os_name,
+    compat_parse_qs,
     compat_str,
     compat_tokenize_tokenize,
     compat_urllib_error,
+    compat_urllib_parse_urlparse,
     compat_urllib_request,
     compat_urllib_request_DataHandler,
 )
@@ -77,6 +81,8 @@ from .utils import (
     subtitles_filename,
     UnavailableVideoError,
     url_basename,
+    url_host_suffixes,
+    url_pattern_hosts,
     version_tuple,
     write_json_file,
     write_string,
@@ -85,7 +91,13 @@ from .utils import (
 )
 from .cache import Cache
 from .extractor import get_info_extractor, gen_extractor_classes, _LAZY_LOADER
-from .downloader import get_suitable_downloader
+from .downloader import (
+    FileDownloader,
+    get_suitable_downloader,
+)
+from .downloader.dash import DashSegmentsFD, template_fragments
+from .downloader.external import FFmpegRemuxer
+from .downloader.fragment import FragmentFD
 from .downloader.rtmp import rtmpdump_version
 from .postprocessor import (
     FFmpegFixupM3u8PP,
@@ -95,6 +107,7 @@ from .postprocessor import (
     FFmpegPostProcessor,
     get_postprocessor,
 )
+from .postprocessor.ffmpeg import EXT_TO_OUT_FORMATS
 from .version import __version__
 
 if compat_os_name == 'nt':
@@ -148,6 +161,11 @@ class YoutubeDL(object):
     forcejson:         Force printing info_dict as JSON.
     dump_single_json:  Force printing the info_dict of the whole playlist
                        (or video) as a single JSON line.
+    json_stream:       With dump_single_json, print a playlist while its
+                       entries are processed instead of at the end:
+                       "single" for the same single JSON line, "lines" for
+                       the playlist without its entries followed by a line
+                       per entry. Entries are then not kept in memory.
     simulate:          Do not download the video files.
     format:            Video format code. See options.py for more information.
     outtmpl:           Template for output names.
@@ -159,6 +177,12 @@ class YoutubeDL(object):
     playlistend:       Playlist item to end at.
     playlist_items:    Specific indices of playlist to download.
     playlistreverse:   Download playlist items in reverse order.
+    playlist_prefetch: Number of pages of paged playlists to fetch at the
+                       same time.
+    lazy_playlist:     Process the entries of playlists as they are received
+                       instead of collecting them first (n_entries is then
+                       unknown). When downloading, the info dicts of the
+                       entries are only kept with dump_single_json.
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            Log messages to a logging.Logger instance.
@@ -180,6 +204,22 @@ class YoutubeDL(object):
     skip_download:     Skip the actual download of the video file
     cachedir:          Location of the cache files in the filesystem.
                        False to disable filesystem cache.
+    cache_backend:     How the cache is stored in cachedir: "files" (one
+                       file per entry, the default) or "sqlite" (a single
+                       database file, better suited to many small entries).
+    cache_ttl:         Number of seconds after which cache entries expire.
+    cache_max_size:    Maximum size of the cache in bytes, the least
+                       recently used entries are removed to stay below it.
+    extraction_cache_ttl: Number of seconds to keep the results of the
+                       information extraction in the filesystem cache, to
+                       reuse them for the same URL. Disabled by default.
+                       Results expire earlier if their media URLs do.
+                       The cookies set during the extraction are restored
+                       with its result. Not used with usenetrc or
+                       cookiefile.
+    extraction_cache_size: Maximum size of the cached extraction results in
+                       bytes (default 50 MiB), the oldest ones are removed
+                       first.
     noplaylist:        Download single video instead of a playlist if in doubt.
     age_limit:         An integer representing the user's age in years.
                        Unsuitable videos for the given age are skipped.
@@ -250,6 +290,18 @@ class YoutubeDL(object):
                        - "detect_or_warn": check whether we can do anything
                                            about it, warn otherwise (default)
     source_address:    (Experimental) Client-side IP address to bind to.
+    concurrent_videos: Number of URLs or playlist entries to extract,
+                       download and post-process at the same time.
+    concurrent_formats: Download the formats that are merged (e.g. with
+                       "bestvideo+bestaudio") at the same time.
+    remux_fragments:   Feed DASH and hlsnative downloads to ffmpeg while they
+                       are downloaded, writing the final file in a single pass
+                       instead of fixing it up or merging the formats
+                       afterwards. Single formats are only remuxed when they
+                       would be fixed up (fixup is "detect_or_warn" and, for
+                       hlsnative, the audio codec is known to be AAC).
+    no_keep_alive:     Do not keep HTTP connections alive for reuse by later
+                       requests (connections are only reused with Python 3).
     call_home:         Boolean, true iff we are allowed to contact the
                        youtube-dl servers for debugging.
     sleep_interval:    Number of seconds to sleep before each download when
@@ -282,7 +334,9 @@ class YoutubeDL(object):
     the downloader (see youtube_dl/downloader/common.py):
     nopart, updatetime, buffersize, ratelimit, min_filesize, max_filesize, test,
     noresizebuffer, retries, continuedl, noprogress, consoletitle,
-    xattr_set_filesize, external_downloader_args, hls_use_mpegts.
+    xattr_set_filesize, external_downloader_args, hls_use_mpegts,
+    fragment_retries, skip_unavailable_fragments, concurrent_fragment_downloads,
+    keep_fragments, http_connections.
 
     The following options are used by the post processors:
     prefer_ffmpeg:     If True, use ffmpeg instead of avconv if both are available,
@@ -304,10 +358,24 @@ class YoutubeDL(object):
             params = {}
         self._ies = []
         self._ies_instances = {}
+        # Maps URL hosts to the positions of the IEs in _ies, see _suitable_ies
+        self._ies_index = None
         self._pps = []
         self._progress_hooks = []
         self._download_retcode = 0
         self._num_downloads = 0
+        # Guards _num_downloads when videos are processed concurrently
+        self._num_downloads_lock = threading.Lock()
+        self._archive_lock = threading.Lock()
+        # In-memory copy of the download archive, see _update_download_archive
+        self._download_archive = None
+        self._output_lock = threading.RLock()
+        # Manifests downloaded during the extraction, by format URL, see
+        # add_downloaded_manifest
+        self._downloaded_manifests = {}
+        self._downloaded_manifests_lock = threading.Lock()
+        self._extraction_cache_stores = 0
+        self._thread_state = threading.local()
         self._screen_file = [sys.stdout, sys.stderr][params.get('logtostderr', False)]
         self._err_file = sys.stderr
         self.params = {
@@ -401,6 +469,8 @@ class YoutubeDL(object):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         self._ies.append(ie)
+        if self._ies_index is not None:
+            self._index_info_extractor(self._ies_index, len(self._ies) - 1, ie)
         if not isinstance(ie, type):
             self._ies_instances[ie.ie_key()] = ie
             ie.set_downloader(self)
@@ -417,6 +487,55 @@ class YoutubeDL(object):
             self.add_info_extractor(ie)
         return ie
 
+    @staticmethod
+    def ie_url_hosts(ie):
+        """
+        Return the hosts the URLs an IE (class or instance) is suitable for
+        can have, as url_pattern_hosts() does, or None if they are unknown.
+        """
+        ie_cls = ie if isinstance(ie, type) else type(ie)
+        if '_VALID_URL_HOSTS' in ie_cls.__dict__:
+            # Precomputed by devscripts/make_lazy_extractors.py
+            return ie_cls._VALID_URL_HOSTS
+        # IEs that override suitable() may accept URLs their _VALID_URL
+        # doesn't match, they have to be tried for every URL
+        suitable_cls = next(
+            cls for cls in ie_cls.__mro__ if 'suitable' in cls.__dict__)
+        valid_url = getattr(ie_cls, '_VALID_URL', None)
+        if (suitable_cls.__name__ in ('InfoExtractor', 'LazyLoadExtractor') and
+                isinstance(valid_url, compat_str)):
+            return url_pattern_hosts(valid_url)
+        return None
+
+    @classmethod
+    def _index_info_extractor(cls, ies_index, pos, ie):
+        by_host, unindexed = ies_index
+        hosts = cls.ie_url_hosts(ie)
+        if hosts is None:
+            unindexed.append(pos)
+        else:
+            for host in hosts:
+                by_host.setdefault(host, []).append(pos)
+
+    def _suitable_ies(self, url):
+        """
+        Return the IEs that may be suitable for url, in the order of _ies.
+
+        Instead of trying every IE, only those whose _VALID_URL requires the
+        host of url (or one of its parent domains) are returned, along with
+        the IEs whose hosts can't be determined.
+        """
+        if self._ies_index is None:
+            ies_index = ({}, [])
+            for pos, ie in enumerate(self._ies):
+                self._index_info_extractor(ies_index, pos, ie)
+            self._ies_index = ies_index
+        by_host, unindexed = self._ies_index
+        positions = set(unindexed)
+        for host in url_host_suffixes(url):
+            positions.update(by_host.get(host, []))
+        return [self._ies[pos] for pos in sorted(positions)]
+
     def add_default_info_extractors(self):
         """
         Add the InfoExtractors returned by gen_extractors to the end of the list
@@ -458,11 +577,12 @@ class YoutubeDL(object):
         if self.params.get('logger'):
             self.params['logger'].debug(message)
         elif not check_quiet or not self.params.get('quiet', False):
-            message = self._bidi_workaround(message)
-            terminator = ['\n', ''][skip_eol]
-            output = message + terminator
+            with self._output_lock:
+                message = self._bidi_workaround(message)
+                terminator = ['\n', ''][skip_eol]
+                output = message + terminator
 
-            self._write_string(output, self._screen_file)
+                self._write_string(output, self._screen_file)
 
     def to_stderr(self, message):
         """Print message to stderr."""
@@ -470,9 +590,10 @@ class YoutubeDL(object):
         if self.params.get('logger'):
             self.params['logger'].error(message)
         else:
-            message = self._bidi_workaround(message)
-            output = message + '\n'
-            self._write_string(output, self._err_file)
+            with self._output_lock:
+                message = self._bidi_workaround(message)
+                output = message + '\n'
+                self._write_string(output, self._err_file)
 
     def to_console_title(self, message):
         if not self.params.get('consoletitle', False):
@@ -508,6 +629,12 @@ class YoutubeDL(object):
         if self.params.get('cookiefile') is not None:
             self.cookiejar.save()
 
+        cache_stats = self.cache.stats
+        if self.params.get('verbose') and cache_stats:
+            self._write_string('[debug] Cache hits/misses: %s\n' % ', '.join(
+                '%s %d/%d' % (section, hits, misses)
+                for section, (hits, misses) in sorted(cache_stats.items())))
+
     def trouble(self, message=None, tb=None):
         """Determine action to take when a download problem appears.
 
@@ -586,7 +713,10 @@ class YoutubeDL(object):
             autonumber_templ = '%0' + str(autonumber_size) + 'd'
             template_dict['autonumber'] = autonumber_templ % self._num_downloads
             if template_dict.get('playlist_index') is not None:
-                template_dict['playlist_index'] = '%0*d' % (len(str(template_dict['n_entries'])), template_dict['playlist_index'])
+                n_entries = template_dict.get('n_entries')
+                template_dict['playlist_index'] = '%0*d' % (
+                    len(str(n_entries)) if n_entries is not None else 0,
+                    template_dict['playlist_index'])
             if template_dict.get('resolution') is None:
                 if template_dict.get('width') and template_dict.get('height'):
                     template_dict['resolution'] = '%dx%d' % (template_dict['width'], template_dict['height'])
@@ -679,7 +809,7 @@ class YoutubeDL(object):
         if ie_key:
             ies = [self.get_info_extractor(ie_key)]
         else:
-            ies = self._ies
+            ies = self._suitable_ies(url)
 
         for ie in ies:
             if not ie.suitable(url):
@@ -691,9 +821,13 @@ class YoutubeDL(object):
                                     'and will probably not work.')
 
             try:
-                ie_result = ie.extract(url)
-                if ie_result is None:  # Finished already (backwards compatibility; listformats and friends should be moved here)
-                    break
+                ie_result = self._load_extraction_result(ie, url)
+                if ie_result is None:
+                    cookies_before = self._cookies_snapshot()
+                    ie_result = ie.extract(url)
+                    if ie_result is None:  # Finished already (backwards compatibility; listformats and friends should be moved here)
+                        break
+                    self._store_extraction_result(ie, url, ie_result, cookies_before)
                 if isinstance(ie_result, list):
                     # Backwards compatibility: old IE result format
                     ie_result = {
@@ -719,6 +853,110 @@ class YoutubeDL(object):
         else:
             self.report_error('no suitable InfoExtractor for URL %s' % url)
 
+    # Parameters that change what extractors return for the same URL, the
+    # key is hashed so that the credentials aren't stored
+    _EXTRACTION_CACHE_PARAMS = (
+        'username', 'password', 'twofactor', 'videopassword', 'ap_mso',
+        'ap_username', 'ap_password', 'noplaylist',
+        'youtube_include_dash_manifest', 'writesubtitles', 'writeautomaticsub',
+        'allsubtitles', 'listsubtitles', 'subtitleslangs', 'proxy',
+        'geo_verification_proxy')
+
+    # Number of stored extraction results between two prunings of the cache
+    _EXTRACTION_CACHE_PRUNE_INTERVAL = 100
+
+    def _use_extraction_cache(self):
+        # The credentials in the netrc and cookie files may change without
+        # the parameters changing
+        return bool(
+            self.params.get('extraction_cache_ttl') and
+            not self.params.get('usenetrc') and
+            not self.params.get('cookiefile'))
+
+    def _extraction_cache_key(self, ie, url):
+        key = json.dumps([ie.ie_key(), url] + [
+            self.params.get(param) for param in self._EXTRACTION_CACHE_PARAMS])
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _media_urls_expiry(ie_result):
+        # Signed media URLs commonly carry their expiry timestamp in the query
+        expiry = None
+        urls = [f.get('url') for f in ie_result.get('formats') or []]
+        urls.append(ie_result.get('url'))
+        for url in urls:
+            if not isinstance(url, compat_str):
+                continue
+            qs = compat_parse_qs(compat_urllib_parse_urlparse(url).query)
+            for param in ('expire', 'expires', 'Expires'):
+                value = qs.get(param, [None])[0]
+                if value and value.isdigit() and int(value) > 1000000000:
+                    expiry = min(expiry or int(value), int(value))
+        return expiry
+
+    def _cookies_snapshot(self):
+        return set(
+            (cookie.domain, cookie.path, cookie.name, cookie.value)
+            for cookie in self.cookiejar)
+
+    def _load_extraction_result(self, ie, url):
+        if not self._use_extraction_cache():
+            return None
+        data = self.cache.load('extraction', self._extraction_cache_key(ie, url))
+        if not isinstance(data, dict) or data.get('expires', 0) < time.time():
+            return None
+        ie_result = data.get('result')
+        if not isinstance(ie_result, dict):
+            return None
+        self.to_screen('[%s] %s: Using cached information' % (
+            ie.IE_NAME, ie_result.get('id') or url))
+        # The media may only be available with the cookies set during the
+        # extraction
+        for cookie in data.get('cookies') or []:
+            self.cookiejar.set_cookie(compat_cookiejar.Cookie(
+                0, cookie['name'], cookie['value'], None, False,
+                cookie['domain'], cookie['domain_specified'],
+                cookie['domain'].startswith('.'), cookie['path'], True,
+                cookie['secure'], cookie['expires'], cookie['expires'] is None,
+                None, None, {}))
+        return ie_result
+
+    def _store_extraction_result(self, ie, url, ie_result, cookies_before):
+        """
+        Cache ie_result with the cookies set since the cookies_before
+        snapshot was taken with _cookies_snapshot.
+        """
+        ttl = self.params.get('extraction_cache_ttl')
+        if not self._use_extraction_cache() or not isinstance(ie_result, dict):
+            return
+        try:
+            # Lazy playlists and the like can't be cached
+            json.dumps(ie_result)
+        except (TypeError, ValueError):
+            return
+        expires = time.time() + ttl
+        urls_expiry = self._media_urls_expiry(ie_result)
+        if urls_expiry is not None:
+            expires = min(expires, urls_expiry)
+        cookies = [{
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'domain_specified': cookie.domain_specified,
+            'path': cookie.path,
+            'secure': cookie.secure,
+            'expires': cookie.expires,
+        } for cookie in self.cookiejar
+            if (cookie.domain, cookie.path, cookie.name, cookie.value) not in cookies_before]
+        self.cache.store(
+            'extraction', self._extraction_cache_key(ie, url),
+            {'expires': expires, 'result': ie_result, 'cookies': cookies})
+        # Going through the whole cache takes a while
+        if self._extraction_cache_stores % self._EXTRACTION_CACHE_PRUNE_INTERVAL == 0:
+            self.cache.prune(
+                'extraction', self.params.get('extraction_cache_size') or 50 * 1024 * 1024)
+        self._extraction_cache_stores += 1
+
     def add_default_extra_info(self, ie_result, ie, url):
         self.add_extra_info(ie_result, {
             'extractor': ie.IE_NAME,
@@ -800,8 +1038,56 @@ class YoutubeDL(object):
                             yield int(string_segment)
                 playlistitems = iter_playlistitems(playlistitems_str)
 
+            def select_playlist_items(entries, items):
+                # Only the requested entries are kept, until their turn comes
+                items = list(items)
+                if any(item <= 0 for item in items):
+                    # Counting from the end needs the whole playlist
+                    entry_list = list(entries)
+                    for item in items:
+                        yield entry_list[item - 1]
+                    return
+                pending = collections.deque(items)
+                wanted = set(items)
+                found = {}
+                for i, entry in enumerate(entries, 1):
+                    if not pending:
+                        break
+                    if i in wanted:
+                        found[i] = entry
+                    while pending and pending[0] in found:
+                        yield found[pending.popleft()]
+                for item in pending:
+                    if item in found:
+                        yield found[item]
+
             ie_entries = ie_result['entries']
-            if isinstance(ie_entries, list):
+            lazy = (
+                self.params.get('lazy_playlist', False) and
+                not isinstance(ie_entries, list) and
+                not self.params.get('playlistreverse', False))
+            if lazy:
+                # Entries are processed as they are received, so their number
+                # is not known in advance
+                n_entries = None
+                prefetch = self.params.get('playlist_prefetch')
+                if isinstance(ie_entries, PagedList):
+                    if playlistitems:
+                        entries = (
+                            entry for item in playlistitems
+                            for entry in ie_entries.getslice(item - 1, item, prefetch))
+                    else:
+                        entries = ie_entries.iterslice(
+                            playliststart, playlistend, prefetch)
+                elif playlistitems:
+                    entries = select_playlist_items(ie_entries, playlistitems)
+                else:
+                    entries = itertools.islice(
+                        ie_entries, playliststart, playlistend)
+                self.to_screen(
+                    '[%s] playlist %s: Downloading videos as they are found' %
+                    (ie_result['extractor'], playlist))
+            elif isinstance(ie_entries, list):
                 n_all_entries = len(ie_entries)
                 if playlistitems:
                     entries = [
@@ -818,11 +1104,12 @@ class YoutubeDL(object):
                     entries = []
                     for item in playlistitems:
                         entries.extend(ie_entries.getslice(
-                            item - 1, item
+                            item - 1, item, self.params.get('playlist_prefetch')
                         ))
                 else:
                     entries = ie_entries.getslice(
-                        playliststart, playlistend)
+                        playliststart, playlistend,
+                        self.params.get('playlist_prefetch'))
                 n_entries = len(entries)
                 self.to_screen(
                     '[%s] playlist %s: Downloading %d videos' %
@@ -842,29 +1129,52 @@ class YoutubeDL(object):
             if self.params.get('playlistreverse', False):
                 entries = entries[::-1]
 
-            for i, entry in enumerate(entries, 1):
-                self.to_screen('[download] Downloading video %s of %s' % (i, n_entries))
-                extra = {
-                    'n_entries': n_entries,
-                    'playlist': playlist,
-                    'playlist_id': ie_result.get('id'),
-                    'playlist_title': ie_result.get('title'),
-                    'playlist_index': i + playliststart,
-                    'extractor': ie_result['extractor'],
-                    'webpage_url': ie_result['webpage_url'],
-                    'webpage_url_basename': url_basename(ie_result['webpage_url']),
-                    'extractor_key': ie_result['extractor_key'],
-                }
-
-                reason = self._match_entry(entry, incomplete=True)
-                if reason is not None:
-                    self.to_screen('[download] ' + reason)
-                    continue
+            def entries_to_process():
+                for i, entry in enumerate(entries, 1):
+                    if n_entries is None:
+                        self.to_screen('[download] Downloading video %s' % i)
+                    else:
+                        self.to_screen('[download] Downloading video %s of %s' % (i, n_entries))
+                    extra = {
+                        'n_entries': n_entries,
+                        'playlist': playlist,
+                        'playlist_id': ie_result.get('id'),
+                        'playlist_title': ie_result.get('title'),
+                        'playlist_index': i + playliststart,
+                        'extractor': ie_result['extractor'],
+                        'webpage_url': ie_result['webpage_url'],
+                        'webpage_url_basename': url_basename(ie_result['webpage_url']),
+                        'extractor_key': ie_result['extractor_key'],
+                    }
 
-                entry_result = self.process_ie_result(entry,
-                                                      download=download,
-                                                      extra_info=extra)
-                playlist_results.append(entry_result)
+                    reason = self._match_entry(entry, incomplete=True)
+                    if reason is not None:
+                        self.to_screen('[download] ' + reason)
+                        continue
+
+                    yield entry, extra
+
+            # The playlist given on the command line is printed while its
+            # entries are processed, unless the URLs are processed by workers
+            stream_json = (
+                self.params.get('dump_single_json', False) and
+                self.params.get('json_stream') is not None and
+                'playlist' not in extra_info and
+                not getattr(self._thread_state, 'in_worker', False))
+            # When streaming a playlist that is downloaded, the results are
+            # only needed to print the whole playlist as JSON
+            keep_results = not stream_json and (
+                not lazy or not download or
+                self.params.get('dump_single_json', False))
+            entry_results = self._map_concurrently(
+                lambda entry_extra: self.process_ie_result(
+                    entry_extra[0], download=download, extra_info=entry_extra[1]),
+                entries_to_process())
+            if stream_json:
+                entry_results = self._stream_playlist_json(ie_result, entry_results)
+            for entry_result in entry_results:
+                if keep_results:
+                    playlist_results.append(entry_result)
             ie_result['entries'] = playlist_results
             self.to_screen('[download] Finished downloading playlist: %s' % playlist)
             return ie_result
@@ -1433,6 +1743,10 @@ class YoutubeDL(object):
                 new_info = dict(info_dict)
                 new_info.update(format)
                 self.process_info(new_info)
+        # The manifests of the formats that were not downloaded aren't needed
+        # anymore
+        for format in formats:
+            self.pop_downloaded_manifest(format['url'])
         # We update the info dict with the best quality format (backwards compatibility)
         info_dict.update(formats_to_download[-1])
         return info_dict
@@ -1493,7 +1807,8 @@ class YoutubeDL(object):
 
         max_downloads = self.params.get('max_downloads')
         if max_downloads is not None:
-            if self._num_downloads >= int(max_downloads):
+            max_downloads = int(max_downloads)
+            if self._num_downloads >= max_downloads:
                 raise MaxDownloadsReached()
 
         info_dict['fulltitle'] = info_dict['title']
@@ -1508,9 +1823,13 @@ class YoutubeDL(object):
             self.to_screen('[download] ' + reason)
             return
 
-        self._num_downloads += 1
+        with self._num_downloads_lock:
+            # Other videos may have been started in the meantime
+            if max_downloads is not None and self._num_downloads >= max_downloads:
+                raise MaxDownloadsReached()
+            self._num_downloads += 1
 
-        info_dict['_filename'] = filename = self.prepare_filename(info_dict)
+            info_dict['_filename'] = filename = self.prepare_filename(info_dict)
 
         # Forced printings
         if self.params.get('forcetitle', False):
@@ -1535,7 +1854,7 @@ class YoutubeDL(object):
         if self.params.get('forceformat', False):
             self.to_stdout(info_dict['format'])
         if self.params.get('forcejson', False):
-            self.to_stdout(json.dumps(info_dict))
+            self.to_stdout(json.dumps(self.expand_fragments(info_dict)))
 
         # Do nothing else if in simulate mode
         if self.params.get('simulate', False):
@@ -1623,7 +1942,7 @@ class YoutubeDL(object):
             else:
                 self.to_screen('[info] Writing video description metadata as JSON to: ' + infofn)
                 try:
-                    write_json_file(self.filter_requested_info(info_dict), infofn)
+                    write_json_file(self.expand_fragments(self.filter_requested_info(info_dict)), infofn)
                 except (OSError, IOError):
                     self.report_error('Cannot write metadata to JSON file ' + infofn)
                     return
@@ -1632,8 +1951,12 @@ class YoutubeDL(object):
 
         if not self.params.get('skip_download', False):
             try:
-                def dl(name, info):
+                def dl(name, info, report_progress=None, output_stream=None):
                     fd = get_suitable_downloader(info, self.params)(self, self.params)
+                    if report_progress is not None:
+                        fd.set_progress_reporter(report_progress)
+                    if output_stream is not None:
+                        fd.set_output_stream(output_stream)
                     for ph in self._progress_hooks:
                         fd.add_progress_hook(ph)
                     if self.params.get('verbose'):
@@ -1684,14 +2007,29 @@ class YoutubeDL(object):
                             '[download] %s has already been downloaded and '
                             'merged' % filename)
                     else:
+                        downloads = []
                         for f in requested_formats:
                             new_info = dict(info_dict)
                             new_info.update(f)
                             fname = self.prepare_filename(new_info)
                             fname = prepend_extension(fname, 'f%s' % f['format_id'], new_info['ext'])
                             downloaded.append(fname)
-                            partial_success = dl(fname, new_info)
-                            success = success and partial_success
+                            downloads.append((fname, new_info))
+                        if (self.params.get('remux_fragments', False) and filename != '-' and
+                                merger.available and
+                                all(get_suitable_downloader(new_info, self.params) is DashSegmentsFD
+                                    for _, new_info in downloads) and
+                                FFmpegRemuxer.available(len(downloads))):
+                            success = self._download_and_merge(dl, downloads, filename, info_dict)
+                            # The formats are already merged
+                            postprocessors = []
+                            downloaded = []
+                        elif self.params.get('concurrent_formats', False) and filename != '-':
+                            success = self._download_concurrently(dl, downloads)
+                        else:
+                            for fname, new_info in downloads:
+                                partial_success = dl(fname, new_info)
+                                success = success and partial_success
                         info_dict['__postprocessors'] = postprocessors
                         info_dict['__files_to_merge'] = downloaded
                 else:
@@ -1712,6 +2050,14 @@ class YoutubeDL(object):
                 if fixup_policy is None:
                     fixup_policy = 'detect_or_warn'
 
+                # Fragments remuxed by ffmpeg while downloading need no fixup
+                remuxed = False
+                if info_dict.get('requested_formats') is None:
+                    fd = get_suitable_downloader(info_dict, self.params)
+                    remuxed = (
+                        issubclass(fd, FragmentFD) and
+                        fd.get_remux_options(info_dict, self.params) is not None)
+
                 INSTALL_FFMPEG_MESSAGE = 'Install ffmpeg or avconv to fix this automatically.'
 
                 stretched_ratio = info_dict.get('stretched_ratio')
@@ -1732,7 +2078,7 @@ class YoutubeDL(object):
                         assert fixup_policy in ('ignore', 'never')
 
                 if (info_dict.get('requested_formats') is None and
-                        info_dict.get('container') == 'm4a_dash'):
+                        info_dict.get('container') == 'm4a_dash' and not remuxed):
                     if fixup_policy == 'warn':
                         self.report_warning(
                             '%s: writing DASH m4a. '
@@ -1751,9 +2097,9 @@ class YoutubeDL(object):
                     else:
                         assert fixup_policy in ('ignore', 'never')
 
-                if (info_dict.get('protocol') == 'm3u8_native' or
+                if ((info_dict.get('protocol') == 'm3u8_native' or
                         info_dict.get('protocol') == 'm3u8' and
-                        self.params.get('hls_prefer_native')):
+                        self.params.get('hls_prefer_native')) and not remuxed):
                     if fixup_policy == 'warn':
                         self.report_warning('%s: malformated aac bitstream.' % (
                             info_dict['id']))
@@ -1776,6 +2122,32 @@ class YoutubeDL(object):
                     return
                 self.record_download_archive(info_dict)
 
+    def add_downloaded_manifest(self, url, manifest):
+        """
+        Keep the manifest of the format at url downloaded by an extractor,
+        for the downloader. manifest is a dictionary with the following
+        entries:
+        * "url" - URL after redirections
+        * "content" - content of the manifest
+        * "expires" - timestamp after which it must be downloaded again
+        The manifests are not part of the info dicts, so that they aren't
+        written with them.
+        """
+        now = time.time()
+        with self._downloaded_manifests_lock:
+            for manifest_url, old_manifest in list(self._downloaded_manifests.items()):
+                if old_manifest['expires'] <= now:
+                    del self._downloaded_manifests[manifest_url]
+            self._downloaded_manifests[url] = manifest
+
+    def pop_downloaded_manifest(self, url):
+        """Return the manifest kept for the format at url if it has not expired, None otherwise"""
+        with self._downloaded_manifests_lock:
+            manifest = self._downloaded_manifests.pop(url, None)
+        if manifest and manifest['expires'] > time.time():
+            return manifest
+        return None
+
     def download(self, url_list):
         """Download a given list of URLs."""
         outtmpl = self.params.get('outtmpl', DEFAULT_OUTTMPL)
@@ -1784,22 +2156,220 @@ class YoutubeDL(object):
                 self.params.get('max_downloads') != 1):
             raise SameFileError(outtmpl)
 
-        for url in url_list:
+        def process_url(url):
+            self._thread_state.json_streamed = False
             try:
                 # It also downloads the videos
-                res = self.extract_info(
+                return self.extract_info(
                     url, force_generic_extractor=self.params.get('force_generic_extractor', False))
             except UnavailableVideoError:
                 self.report_error('unable to download video')
-            except MaxDownloadsReached:
-                self.to_screen('[info] Maximum number of downloaded files reached.')
-                raise
-            else:
-                if self.params.get('dump_single_json', False):
-                    self.to_stdout(json.dumps(res))
+
+        # The workers are kept for the playlist entries of a single URL
+        results = (
+            self._map_concurrently(process_url, url_list) if len(url_list) > 1
+            else (process_url(url) for url in url_list))
+        try:
+            for res in results:
+                # A playlist may have been printed while it was processed
+                if (res is not None and self.params.get('dump_single_json', False) and
+                        not getattr(self._thread_state, 'json_streamed', False)):
+                    self.to_stdout(json.dumps(self.expand_fragments(res)))
+        except MaxDownloadsReached:
+            self.to_screen('[info] Maximum number of downloaded files reached.')
+            raise
 
         return self._download_retcode
 
+    def _download_concurrently(self, dl, downloads):
+        """
+        Download all the (filename, info_dict) pairs of downloads at the same
+        time with dl(filename, info_dict, report_progress) and print their
+        combined progress. Return whether all of them succeeded.
+        """
+        reporter = FileDownloader(self, self.params)
+        lock = threading.Lock()
+        statuses = [None] * len(downloads)
+        start = time.time()
+
+        def downloaded_bytes(status):
+            if status['status'] == 'finished':
+                return status.get('total_bytes') or status.get('downloaded_bytes') or 0
+            return status.get('downloaded_bytes') or 0
+
+        def combined_status():
+            known = [s for s in statuses if s is not None]
+            status = {
+                'status': 'downloading',
+                'downloaded_bytes': sum(downloaded_bytes(s) for s in known),
+                'elapsed': time.time() - start,
+            }
+            sizes = [s.get('total_bytes') for s in known]
+            if len(known) == len(statuses) and None not in sizes:
+                status['total_bytes'] = sum(sizes)
+            else:
+                estimates = [s.get('total_bytes') or s.get('total_bytes_estimate') for s in known]
+                if len(known) == len(statuses) and None not in estimates:
+                    status['total_bytes_estimate'] = sum(estimates)
+            if all(s['status'] == 'finished' for s in known) and len(known) == len(statuses):
+                status['status'] = 'finished'
+                status['total_bytes'] = status['downloaded_bytes']
+                return status
+            speeds = [s['speed'] for s in known if s['status'] == 'downloading' and s.get('speed')]
+            if speeds:
+                status['speed'] = sum(speeds)
+                total = status.get('total_bytes') or status.get('total_bytes_estimate')
+                if total is not None:
+                    status['eta'] = max(total - status['downloaded_bytes'], 0) / status['speed']
+            return status
+
+        def run_job(job):
+            def report_progress(status):
+                if status['status'] not in ('downloading', 'finished'):
+                    return
+                with lock:
+                    statuses[job['index']] = status
+                    reporter.report_progress(combined_status())
+
+            try:
+                job['result'] = dl(job['filename'], job['info'], report_progress)
+            except Exception:
+                job['exc_info'] = sys.exc_info()
+
+        jobs = []
+        for index, (filename, info) in enumerate(downloads):
+            job = {'index': index, 'filename': filename, 'info': info}
+            job['thread'] = threading.Thread(target=run_job, args=(job,))
+            job['thread'].daemon = True
+            job['thread'].start()
+            jobs.append(job)
+        for job in jobs:
+            job['thread'].join()
+        for job in jobs:
+            if 'exc_info' in job:
+                raise job['exc_info'][1]
+        return all(job['result'] for job in jobs)
+
+    def _download_and_merge(self, dl, downloads, filename, info_dict):
+        """
+        Download all the (filename, info_dict) pairs of downloads at the same
+        time with dl(filename, info_dict, report_progress, output_stream) into
+        an ffmpeg process that merges them into filename, like FFmpegMergerPP.
+        Return whether all of them succeeded.
+        """
+        temp_filename = prepend_extension(filename, 'temp')
+        out_format = EXT_TO_OUT_FORMATS.get(info_dict['ext'], info_dict['ext'])
+        remuxer = FFmpegRemuxer(
+            self, temp_filename, len(downloads),
+            ['-map', '0:v:0', '-map', '1:a:0', '-f', out_format])
+        self.to_screen('[ffmpeg] Merging formats into "%s" while downloading' % filename)
+        remuxer.start()
+        streams = dict(
+            (fname, stream) for (fname, _), stream in zip(downloads, remuxer.inputs))
+
+        def piped_dl(name, info, report_progress=None):
+            stream = streams[name]
+            try:
+                return dl(name, info, report_progress, stream)
+            finally:
+                # ffmpeg waits for the end of every input
+                stream.close()
+
+        success = False
+        try:
+            success = self._download_concurrently(piped_dl, downloads)
+        finally:
+            if not success:
+                remuxer.abort()
+        if not success:
+            return False
+        retval = remuxer.finish()
+        if retval != 0:
+            self.report_error('ffmpeg exited with code %d' % retval)
+            return False
+        os.rename(encodeFilename(temp_filename), encodeFilename(filename))
+        return True
+
+    def _stream_playlist_json(self, ie_result, entry_results):
+        """
+        Print the JSON of the playlist ie_result, with the entries from
+        entry_results written as soon as they are yielded, and yield them.
+
+        json_stream "single" writes the same JSON object as dump_single_json
+        (with "entries" as the last key), "lines" writes the playlist without
+        its entries on a first line, followed by a line per entry.
+        """
+        single = self.params.get('json_stream') != 'lines'
+        header = dict((k, v) for k, v in ie_result.items() if k != 'entries')
+        self._thread_state.json_streamed = True
+        if single:
+            header_json = json.dumps(header)
+            self.to_stdout(
+                header_json[:-1] + (', ' if header else '') + '"entries": [',
+                skip_eol=True)
+        else:
+            self.to_stdout(json.dumps(header))
+        first = True
+        try:
+            for entry_result in entry_results:
+                if single:
+                    self.to_stdout(
+                        ('' if first else ', ') + json.dumps(self.expand_fragments(entry_result)),
+                        skip_eol=True)
+                    first = False
+                elif entry_result is not None:
+                    self.to_stdout(json.dumps(self.expand_fragments(entry_result)))
+                yield entry_result
+        finally:
+            # Keep the output valid even if processing stops half-way
+            if single:
+                self.to_stdout(']}')
+
+    def _map_concurrently(self, func, items):
+        """
+        Call func on every item and yield the results in order.
+
+        With concurrent_videos set, up to that many items are processed at
+        the same time by worker threads. Work is only ever spread at one
+        level: items handled by a worker (e.g. playlist entries of a URL) are
+        processed sequentially. An exception raised by func is re-raised
+        here, once the items already started are done.
+        """
+        max_workers = self.params.get('concurrent_videos') or 1
+        if max_workers <= 1 or getattr(self._thread_state, 'in_worker', False):
+            for item in items:
+                yield func(item)
+            return
+
+        def run_job(job):
+            self._thread_state.in_worker = True
+            try:
+                job['result'] = func(job['item'])
+            except BaseException:
+                job['exc_info'] = sys.exc_info()
+
+        def finish_job(job):
+            job['thread'].join()
+            if 'exc_info' in job:
+                raise job['exc_info'][1]
+            return job['result']
+
+        in_flight = collections.deque()
+        try:
+            for item in items:
+                job = {'item': item}
+                job['thread'] = threading.Thread(target=run_job, args=(job,))
+                job['thread'].daemon = True
+                job['thread'].start()
+                in_flight.append(job)
+                if len(in_flight) >= max_workers:
+                    yield finish_job(in_flight.popleft())
+            while in_flight:
+                yield finish_job(in_flight.popleft())
+        finally:
+            for job in in_flight:
+                job['thread'].join()
+
     def download_with_info_file(self, info_filename):
         with contextlib.closing(fileinput.FileInput(
                 [info_filename], mode='r',
@@ -1817,6 +2387,22 @@ class YoutubeDL(object):
                 raise
         return self._download_retcode
 
+    @classmethod
+    def expand_fragments(cls, info):
+        """
+        Return a copy of info (an info dict, a format or a list of them)
+        where the formats described by a fragment_template also list their
+        fragments, as they are written in the JSON output.
+        """
+        if isinstance(info, list):
+            return [cls.expand_fragments(v) for v in info]
+        if not isinstance(info, dict):
+            return info
+        res = dict((k, cls.expand_fragments(v)) for k, v in info.items())
+        if res.get('fragment_template') and 'fragments' not in res:
+            res['fragments'] = list(template_fragments(res['fragment_template']))
+        return res
+
     @staticmethod
     def filter_requested_info(info_dict):
         return dict(
@@ -1856,6 +2442,46 @@ class YoutubeDL(object):
             return None  # Incomplete video information
         return extractor.lower() + ' ' + info_dict['id']
 
+    def _update_download_archive(self, fn):
+        """
+        Bring the in-memory copy of the download archive up to date.
+
+        The archive file is only read in full the first time (or when it has
+        been replaced or truncated), afterwards only the lines appended since
+        the last look, possibly by other processes, are read.
+        """
+        try:
+            st = os.stat(encodeFilename(fn))
+        except OSError as ose:
+            if ose.errno != errno.ENOENT:
+                raise
+            st = None
+        archive = self._download_archive
+        if (archive is None or archive['filename'] != fn or st is None or
+                st.st_ino != archive['ino'] or st.st_size < archive['offset']):
+            archive = self._download_archive = {
+                'filename': fn,
+                'ids': set(),
+                'ino': st.st_ino if st else None,
+                'offset': 0,
+            }
+        if st is None or st.st_size == archive['offset']:
+            return archive['ids']
+        try:
+            with locked_file(fn, 'rb') as archive_file:
+                archive_file.seek(archive['offset'])
+                data = archive_file.read()
+        except IOError as ioe:
+            if ioe.errno != errno.ENOENT:
+                raise
+            return archive['ids']
+        # Leave an incomplete last line for the next time
+        data = data[:data.rfind(b'\n') + 1]
+        archive['offset'] += len(data)
+        archive['ids'].update(
+            line.strip() for line in data.decode('utf-8').splitlines())
+        return archive['ids']
+
     def in_download_archive(self, info_dict):
         fn = self.params.get('download_archive')
         if fn is None:
@@ -1865,15 +2491,8 @@ class YoutubeDL(object):
         if vid_id is None:
             return False  # Incomplete video information
 
-        try:
-            with locked_file(fn, 'r', encoding='utf-8') as archive_file:
-                for line in archive_file:
-                    if line.strip() == vid_id:
-                        return True
-        except IOError as ioe:
-            if ioe.errno != errno.ENOENT:
-                raise
-        return False
+        with self._archive_lock:
+            return vid_id in self._update_download_archive(fn)
 
     def record_download_archive(self, info_dict):
         fn = self.params.get('download_archive')
@@ -1881,8 +2500,11 @@ class YoutubeDL(object):
             return
         vid_id = self._make_archive_id(info_dict)
         assert vid_id
-        with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-            archive_file.write(vid_id + '\n')
+        with self._archive_lock:
+            with locked_file(fn, 'a', encoding='utf-8') as archive_file:
+                archive_file.write(vid_id + '\n')
+            if self._download_archive is not None:
+                self._download_archive['ids'].add(vid_id)
 
     @staticmethod
     def format_resolution(format, default='unknown'):
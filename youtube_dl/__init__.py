@@ -181,6 +181,23 @@ def _real_main(argv=None):
         opts.retries = parse_retries(opts.retries)
     if opts.fragment_retries is not None:
         opts.fragment_retries = parse_retries(opts.fragment_retries)
+    if opts.concurrent_fragment_downloads is not None and opts.concurrent_fragment_downloads <= 0:
+        parser.error('concurrent fragments count must be positive')
+    if opts.concurrent_videos is not None and opts.concurrent_videos <= 0:
+        parser.error('concurrent videos count must be positive')
+    if opts.http_connections is not None and opts.http_connections <= 0:
+        parser.error('HTTP connections count must be positive')
+    if opts.extraction_cache_ttl is not None and opts.extraction_cache_ttl <= 0:
+        parser.error('extraction cache TTL must be positive')
+    if opts.cache_backend not in (None, 'files', 'sqlite'):
+        parser.error('invalid cache backend %s, expected files or sqlite' % opts.cache_backend)
+    if opts.cache_ttl is not None and opts.cache_ttl <= 0:
+        parser.error('cache TTL must be positive')
+    if opts.cache_max_size is not None:
+        numeric_limit = FileDownloader.parse_bytes(opts.cache_max_size)
+        if numeric_limit is None:
+            parser.error('invalid cache max size specified')
+        opts.cache_max_size = numeric_limit
     if opts.buffersize is not None:
         numeric_buffersize = FileDownloader.parse_bytes(opts.buffersize)
         if numeric_buffersize is None:
@@ -190,6 +207,10 @@ def _real_main(argv=None):
         raise ValueError('Playlist start must be positive')
     if opts.playlistend not in (-1, None) and opts.playlistend < opts.playliststart:
         raise ValueError('Playlist end must be greater than playlist start')
+    if opts.json_stream not in (None, 'single', 'lines'):
+        parser.error('invalid JSON stream format %s, expected single or lines' % opts.json_stream)
+    if opts.playlist_prefetch is not None and opts.playlist_prefetch <= 0:
+        parser.error('playlist prefetch count must be positive')
     if opts.extractaudio:
         if opts.audioformat not in ['best', 'aac', 'mp3', 'm4a', 'opus', 'vorbis', 'wav']:
             parser.error('invalid audio format specified')
@@ -316,6 +337,7 @@ def _real_main(argv=None):
         'forceformat': opts.getformat,
         'forcejson': opts.dumpjson or opts.print_json,
         'dump_single_json': opts.dump_single_json,
+        'json_stream': opts.json_stream,
         'simulate': opts.simulate or any_getting,
         'skip_download': opts.skip_download,
         'format': opts.format,
@@ -330,6 +352,12 @@ def _real_main(argv=None):
         'retries': opts.retries,
         'fragment_retries': opts.fragment_retries,
         'skip_unavailable_fragments': opts.skip_unavailable_fragments,
+        'concurrent_fragment_downloads': opts.concurrent_fragment_downloads,
+        'keep_fragments': opts.keep_fragments,
+        'concurrent_videos': opts.concurrent_videos,
+        'concurrent_formats': opts.concurrent_formats,
+        'remux_fragments': opts.remux_fragments,
+        'http_connections': opts.http_connections,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'continuedl': opts.continue_dl,
@@ -338,6 +366,8 @@ def _real_main(argv=None):
         'playliststart': opts.playliststart,
         'playlistend': opts.playlistend,
         'playlistreverse': opts.playlist_reverse,
+        'playlist_prefetch': opts.playlist_prefetch,
+        'lazy_playlist': opts.lazy_playlist,
         'noplaylist': opts.noplaylist,
         'logtostderr': opts.outtmpl == '-',
         'consoletitle': opts.consoletitle,
@@ -369,6 +399,10 @@ def _real_main(argv=None):
         'max_views': opts.max_views,
         'daterange': date,
         'cachedir': opts.cachedir,
+        'cache_backend': opts.cache_backend,
+        'cache_ttl': opts.cache_ttl,
+        'cache_max_size': opts.cache_max_size,
+        'extraction_cache_ttl': opts.extraction_cache_ttl,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': download_archive_fn,
@@ -390,6 +424,7 @@ def _real_main(argv=None):
         'postprocessors': postprocessors,
         'fixup': opts.fixup,
         'source_address': opts.source_address,
+        'no_keep_alive': opts.no_keep_alive,
         'call_home': opts.call_home,
         'sleep_interval': opts.sleep_interval,
         'max_sleep_interval': opts.max_sleep_interval,
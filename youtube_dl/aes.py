@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import base64
 from math import ceil
 
+from .compat import compat_struct_pack, compat_struct_unpack
 from .utils import bytes_to_intlist, intlist_to_bytes
 
 BLOCK_SIZE_BYTES = 16
@@ -18,20 +19,15 @@ def aes_ctr_decrypt(data, key, counter):
                                returns the next counter block
     @returns {int[]}           decrypted data
     """
-    expanded_key = key_expansion(key)
+    round_key_words = _bytes_to_words(intlist_to_bytes(key_expansion(key)))
     block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
 
-    decrypted_data = []
+    key_stream = []
     for i in range(block_count):
-        counter_block = counter.next_value()
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
+        counter_block = _bytes_to_words(intlist_to_bytes(counter.next_value()))
+        key_stream.extend(_encrypt_block_words(counter_block, round_key_words))
 
-        cipher_counter_block = aes_encrypt(counter_block, expanded_key)
-        decrypted_data += xor(block, cipher_counter_block)
-    decrypted_data = decrypted_data[:len(data)]
-
-    return decrypted_data
+    return xor(data, bytes_to_intlist(_words_to_bytes(key_stream)))
 
 
 def aes_cbc_decrypt(data, key, iv):
@@ -43,21 +39,59 @@ def aes_cbc_decrypt(data, key, iv):
     @param {int[]} iv          16-Byte IV
     @returns {int[]}           decrypted data
     """
-    expanded_key = key_expansion(key)
-    block_count = int(ceil(float(len(data)) / BLOCK_SIZE_BYTES))
+    return bytes_to_intlist(aes_cbc_decrypt_bytes(
+        intlist_to_bytes(data), intlist_to_bytes(key), intlist_to_bytes(iv)))
 
-    decrypted_data = []
-    previous_cipher_block = iv
-    for i in range(block_count):
-        block = data[i * BLOCK_SIZE_BYTES: (i + 1) * BLOCK_SIZE_BYTES]
-        block += [0] * (BLOCK_SIZE_BYTES - len(block))
 
-        decrypted_block = aes_decrypt(block, expanded_key)
-        decrypted_data += xor(decrypted_block, previous_cipher_block)
-        previous_cipher_block = block
-    decrypted_data = decrypted_data[:len(data)]
+def aes_ctr_decrypt_bytes(data, key, iv):
+    """
+    Decrypt with aes in counter mode
+
+    @param {bytes} data        cipher
+    @param {bytes} key         16/24/32-Byte cipher key
+    @param {bytes} iv          16-Byte initial counter block, incremented
+                               as a 128-Bit big-endian integer
+    @returns {bytes}           decrypted data
+    """
+    round_key_words = _bytes_to_words(intlist_to_bytes(key_expansion(bytes_to_intlist(key))))
+    data_words = _bytes_to_words(_pad_block(data))
+    c0, c1, c2, c3 = _bytes_to_words(iv)
+    counter = c0 << 96 | c1 << 64 | c2 << 32 | c3
+
+    decrypted_words = []
+    for i in range(0, len(data_words), 4):
+        k0, k1, k2, k3 = _encrypt_block_words(
+            (counter >> 96, (counter >> 64) & 0xFFFFFFFF, (counter >> 32) & 0xFFFFFFFF, counter & 0xFFFFFFFF),
+            round_key_words)
+        counter = (counter + 1) & 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF
+        decrypted_words.extend((
+            data_words[i] ^ k0, data_words[i + 1] ^ k1, data_words[i + 2] ^ k2, data_words[i + 3] ^ k3))
+
+    return _words_to_bytes(decrypted_words)[:len(data)]
+
 
-    return decrypted_data
+def aes_cbc_decrypt_bytes(data, key, iv):
+    """
+    Decrypt with aes in CBC mode
+
+    @param {bytes} data        cipher
+    @param {bytes} key         16/24/32-Byte cipher key
+    @param {bytes} iv          16-Byte IV
+    @returns {bytes}           decrypted data
+    """
+    round_key_words = _decryption_key_words(
+        _bytes_to_words(intlist_to_bytes(key_expansion(bytes_to_intlist(key)))))
+    data_words = _bytes_to_words(_pad_block(data))
+    p0, p1, p2, p3 = _bytes_to_words(iv)
+
+    decrypted_words = []
+    for i in range(0, len(data_words), 4):
+        block = data_words[i:i + 4]
+        d0, d1, d2, d3 = _decrypt_block_words(block, round_key_words)
+        decrypted_words.extend((d0 ^ p0, d1 ^ p1, d2 ^ p2, d3 ^ p3))
+        p0, p1, p2, p3 = block
+
+    return _words_to_bytes(decrypted_words)[:len(data)]
 
 
 def key_expansion(data):
@@ -152,7 +186,7 @@ def aes_decrypt_text(data, password, key_size_bytes):
     """
     NONCE_LENGTH_BYTES = 8
 
-    data = bytes_to_intlist(base64.b64decode(data.encode('utf-8')))
+    data = base64.b64decode(data.encode('utf-8'))
     password = bytes_to_intlist(password.encode('utf-8'))
 
     key = password[:key_size_bytes] + [0] * (key_size_bytes - len(password))
@@ -161,18 +195,8 @@ def aes_decrypt_text(data, password, key_size_bytes):
     nonce = data[:NONCE_LENGTH_BYTES]
     cipher = data[NONCE_LENGTH_BYTES:]
 
-    class Counter(object):
-        __value = nonce + [0] * (BLOCK_SIZE_BYTES - NONCE_LENGTH_BYTES)
-
-        def next_value(self):
-            temp = self.__value
-            self.__value = inc(self.__value)
-            return temp
-
-    decrypted_data = aes_ctr_decrypt(cipher, key, Counter())
-    plaintext = intlist_to_bytes(decrypted_data)
-
-    return plaintext
+    return aes_ctr_decrypt_bytes(
+        cipher, intlist_to_bytes(key), nonce + b'\0' * (BLOCK_SIZE_BYTES - NONCE_LENGTH_BYTES))
 
 RCON = (0x8d, 0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1b, 0x36)
 SBOX = (0x63, 0x7C, 0x77, 0x7B, 0xF2, 0x6B, 0x6F, 0xC5, 0x30, 0x01, 0x67, 0x2B, 0xFE, 0xD7, 0xAB, 0x76,
@@ -328,4 +352,89 @@ def inc(data):
             break
     return data
 
-__all__ = ['aes_encrypt', 'key_expansion', 'aes_ctr_decrypt', 'aes_cbc_decrypt', 'aes_decrypt_text']
+
+def _make_t_tables(sbox, matrix):
+    # Table j maps a byte to the j-th column of (mix_)columns applied to its
+    # substitution, so that a whole round is 16 lookups and xors per block
+    return tuple(
+        tuple(
+            rijndael_mul(s, matrix[0][column]) << 24 | rijndael_mul(s, matrix[1][column]) << 16 |
+            rijndael_mul(s, matrix[2][column]) << 8 | rijndael_mul(s, matrix[3][column])
+            for s in sbox)
+        for column in range(4))
+
+
+TE0, TE1, TE2, TE3 = _make_t_tables(SBOX, MIX_COLUMN_MATRIX)
+TD0, TD1, TD2, TD3 = _make_t_tables(SBOX_INV, MIX_COLUMN_MATRIX_INV)
+
+
+def _pad_block(data):
+    data = bytes(data)
+    return data + b'\0' * (-len(data) % BLOCK_SIZE_BYTES)
+
+
+def _bytes_to_words(data):
+    return compat_struct_unpack('>%dI' % (len(data) // 4), data)
+
+
+def _words_to_bytes(words):
+    return compat_struct_pack('>%dI' % len(words), *words)
+
+
+def _decryption_key_words(round_key_words):
+    # Round keys of the equivalent inverse cipher: reversed, and with
+    # mix_columns_inv applied to all but the first and the last one
+    rounds = len(round_key_words) // 4 - 1
+    decryption_key_words = []
+    for i in range(rounds, -1, -1):
+        words = round_key_words[i * 4:(i + 1) * 4]
+        if 0 < i < rounds:
+            words = [
+                TD0[SBOX[w >> 24]] ^ TD1[SBOX[(w >> 16) & 0xFF]] ^
+                TD2[SBOX[(w >> 8) & 0xFF]] ^ TD3[SBOX[w & 0xFF]]
+                for w in words]
+        decryption_key_words.extend(words)
+    return decryption_key_words
+
+
+def _encrypt_block_words(block, round_key_words):
+    te0, te1, te2, te3 = TE0, TE1, TE2, TE3
+    rk = round_key_words
+    s0, s1, s2, s3 = block[0] ^ rk[0], block[1] ^ rk[1], block[2] ^ rk[2], block[3] ^ rk[3]
+    last = len(rk) - 4
+    for i in range(4, last, 4):
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[(s1 >> 16) & 0xFF] ^ te2[(s2 >> 8) & 0xFF] ^ te3[s3 & 0xFF] ^ rk[i],
+            te0[s1 >> 24] ^ te1[(s2 >> 16) & 0xFF] ^ te2[(s3 >> 8) & 0xFF] ^ te3[s0 & 0xFF] ^ rk[i + 1],
+            te0[s2 >> 24] ^ te1[(s3 >> 16) & 0xFF] ^ te2[(s0 >> 8) & 0xFF] ^ te3[s1 & 0xFF] ^ rk[i + 2],
+            te0[s3 >> 24] ^ te1[(s0 >> 16) & 0xFF] ^ te2[(s1 >> 8) & 0xFF] ^ te3[s2 & 0xFF] ^ rk[i + 3])
+    sbox = SBOX
+    return (
+        (sbox[s0 >> 24] << 24 | sbox[(s1 >> 16) & 0xFF] << 16 | sbox[(s2 >> 8) & 0xFF] << 8 | sbox[s3 & 0xFF]) ^ rk[last],
+        (sbox[s1 >> 24] << 24 | sbox[(s2 >> 16) & 0xFF] << 16 | sbox[(s3 >> 8) & 0xFF] << 8 | sbox[s0 & 0xFF]) ^ rk[last + 1],
+        (sbox[s2 >> 24] << 24 | sbox[(s3 >> 16) & 0xFF] << 16 | sbox[(s0 >> 8) & 0xFF] << 8 | sbox[s1 & 0xFF]) ^ rk[last + 2],
+        (sbox[s3 >> 24] << 24 | sbox[(s0 >> 16) & 0xFF] << 16 | sbox[(s1 >> 8) & 0xFF] << 8 | sbox[s2 & 0xFF]) ^ rk[last + 3])
+
+
+def _decrypt_block_words(block, decryption_key_words):
+    td0, td1, td2, td3 = TD0, TD1, TD2, TD3
+    rk = decryption_key_words
+    s0, s1, s2, s3 = block[0] ^ rk[0], block[1] ^ rk[1], block[2] ^ rk[2], block[3] ^ rk[3]
+    last = len(rk) - 4
+    for i in range(4, last, 4):
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 0xFF] ^ td2[(s2 >> 8) & 0xFF] ^ td3[s1 & 0xFF] ^ rk[i],
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 0xFF] ^ td2[(s3 >> 8) & 0xFF] ^ td3[s2 & 0xFF] ^ rk[i + 1],
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 0xFF] ^ td2[(s0 >> 8) & 0xFF] ^ td3[s3 & 0xFF] ^ rk[i + 2],
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 0xFF] ^ td2[(s1 >> 8) & 0xFF] ^ td3[s0 & 0xFF] ^ rk[i + 3])
+    sbox = SBOX_INV
+    return (
+        (sbox[s0 >> 24] << 24 | sbox[(s3 >> 16) & 0xFF] << 16 | sbox[(s2 >> 8) & 0xFF] << 8 | sbox[s1 & 0xFF]) ^ rk[last],
+        (sbox[s1 >> 24] << 24 | sbox[(s0 >> 16) & 0xFF] << 16 | sbox[(s3 >> 8) & 0xFF] << 8 | sbox[s2 & 0xFF]) ^ rk[last + 1],
+        (sbox[s2 >> 24] << 24 | sbox[(s1 >> 16) & 0xFF] << 16 | sbox[(s0 >> 8) & 0xFF] << 8 | sbox[s3 & 0xFF]) ^ rk[last + 2],
+        (sbox[s3 >> 24] << 24 | sbox[(s2 >> 16) & 0xFF] << 16 | sbox[(s1 >> 8) & 0xFF] << 8 | sbox[s0 & 0xFF]) ^ rk[last + 3])
+
+__all__ = [
+    'aes_encrypt', 'key_expansion', 'aes_ctr_decrypt', 'aes_cbc_decrypt', 'aes_decrypt_text',
+    'aes_ctr_decrypt_bytes', 'aes_cbc_decrypt_bytes',
+]
@@ -6,15 +6,187 @@ import json
 import os
 import re
 import shutil
+import threading
+import time
 import traceback
 
+try:
+    import sqlite3
+except ImportError:  # Python built without sqlite
+    sqlite3 = None
+
 from .compat import compat_expanduser, compat_getenv
 from .utils import write_json_file
 
 
+class _FileCacheBackend(object):
+    """Stores every entry in its own file, <root_dir>/<section>/<key>.<dtype>
+
+    The modification time of a file is when it was stored, its access time
+    when it was last used.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+    def location(self, section, key, dtype):
+        return os.path.join(self.root_dir, section, '%s.%s' % (key, dtype))
+
+    def load(self, section, key, dtype, max_age=None):
+        fn = self.location(section, key, dtype)
+        try:
+            st = os.stat(fn)
+            now = time.time()
+            if max_age is not None and st.st_mtime < now - max_age:
+                os.remove(fn)
+                return None
+            with io.open(fn, 'r', encoding='utf-8') as cachef:
+                data = cachef.read()
+            os.utime(fn, (now, st.st_mtime))
+        except (IOError, OSError):
+            return None  # No cache available
+        return data
+
+    def store(self, section, key, dtype, data):
+        fn = self.location(section, key, dtype)
+        try:
+            os.makedirs(os.path.dirname(fn))
+        except OSError as ose:
+            if ose.errno != errno.EEXIST:
+                raise
+        write_json_file(data, fn)
+        return os.path.getsize(fn)
+
+    def entries(self, section=None):
+        """Return (last use, size, section, key, dtype) tuples"""
+        try:
+            sections = [section] if section else os.listdir(self.root_dir)
+        except OSError:
+            return []  # Nothing cached yet
+        entries = []
+        for section in sections:
+            dirname = os.path.join(self.root_dir, section)
+            try:
+                fns = os.listdir(dirname)
+            except OSError:
+                continue  # Not a section
+            for fn in fns:
+                key, _, dtype = fn.rpartition('.')
+                if not key or dtype == 'tmp':
+                    continue  # Being written
+                try:
+                    st = os.stat(os.path.join(dirname, fn))
+                except OSError:
+                    continue  # Removed in the meantime
+                entries.append((st.st_atime, st.st_size, section, key, dtype))
+        return entries
+
+    def delete(self, section, key, dtype):
+        try:
+            os.remove(self.location(section, key, dtype))
+        except OSError:
+            pass
+
+    def close(self):
+        pass
+
+
+class _SQLiteCacheBackend(object):
+    """Stores all the entries in a single SQLite database, <root_dir>/cache.sqlite
+
+    Better suited than files to many small entries.
+    """
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self.filename = os.path.join(root_dir, 'cache.sqlite')
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def location(self, section, key, dtype):
+        return '%s (%s/%s.%s)' % (self.filename, section, key, dtype)
+
+    def _execute(self, sql, args=()):
+        with self._lock:
+            if self._conn is None:
+                try:
+                    os.makedirs(self.root_dir)
+                except OSError as ose:
+                    if ose.errno != errno.EEXIST:
+                        raise
+                conn = sqlite3.connect(
+                    self.filename, timeout=10, check_same_thread=False,
+                    isolation_level=None)
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS entries ('
+                    'section TEXT, key TEXT, dtype TEXT, data TEXT, size INTEGER, '
+                    'stored REAL, used REAL, PRIMARY KEY (section, key, dtype))')
+                self._conn = conn
+            return self._conn.execute(sql, args).fetchall()
+
+    def load(self, section, key, dtype, max_age=None):
+        where_args = (section, key, dtype)
+        try:
+            rows = self._execute(
+                'SELECT data, stored FROM entries WHERE section = ? AND key = ? AND dtype = ?',
+                where_args)
+            if not rows:
+                return None
+            data, stored = rows[0]
+            now = time.time()
+            if max_age is not None and stored < now - max_age:
+                self.delete(section, key, dtype)
+                return None
+            self._execute(
+                'UPDATE entries SET used = ? WHERE section = ? AND key = ? AND dtype = ?',
+                (now, ) + where_args)
+        except (sqlite3.Error, OSError):
+            return None  # No cache available
+        return data
+
+    def store(self, section, key, dtype, data):
+        data = json.dumps(data)
+        now = time.time()
+        self._execute(
+            'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (section, key, dtype, data, len(data), now, now))
+        return len(data)
+
+    def entries(self, section=None):
+        """Return (last use, size, section, key, dtype) tuples"""
+        if not os.path.exists(self.filename):
+            return []  # Nothing cached yet
+        try:
+            if section:
+                return self._execute(
+                    'SELECT used, size, section, key, dtype FROM entries WHERE section = ?',
+                    (section, ))
+            return self._execute('SELECT used, size, section, key, dtype FROM entries')
+        except sqlite3.Error:
+            return []
+
+    def delete(self, section, key, dtype):
+        try:
+            self._execute(
+                'DELETE FROM entries WHERE section = ? AND key = ? AND dtype = ?',
+                (section, key, dtype))
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
 class Cache(object):
     def __init__(self, ydl):
         self._ydl = ydl
+        self._backend = None
+        # Total size of the entries, once known
+        self._size = None
+        self._stats = {}
 
     def _get_root_dir(self):
         res = self._ydl.params.get('cachedir')
@@ -23,59 +195,96 @@ class Cache(object):
             res = os.path.join(cache_root, 'youtube-dl')
         return compat_expanduser(res)
 
-    def _get_cache_fn(self, section, key, dtype):
+    def _get_backend(self):
+        root_dir = self._get_root_dir()
+        if self._backend is None or self._backend.root_dir != root_dir:
+            backend_name = self._ydl.params.get('cache_backend') or 'files'
+            if backend_name == 'sqlite' and sqlite3 is None:
+                self._ydl.report_warning(
+                    'sqlite3 is not available, storing the cache in files instead')
+                backend_name = 'files'
+            self._backend = (
+                _SQLiteCacheBackend if backend_name == 'sqlite'
+                else _FileCacheBackend)(root_dir)
+            self._size = None
+        return self._backend
+
+    def _check_entry(self, section, key, dtype):
+        assert dtype in ('json',)
         assert re.match(r'^[a-zA-Z0-9_.-]+$', section), \
             'invalid section %r' % section
         assert re.match(r'^[a-zA-Z0-9_.-]+$', key), 'invalid key %r' % key
-        return os.path.join(
-            self._get_root_dir(), section, '%s.%s' % (key, dtype))
 
     @property
     def enabled(self):
         return self._ydl.params.get('cachedir') is not False
 
-    def store(self, section, key, data, dtype='json'):
-        assert dtype in ('json',)
+    @property
+    def stats(self):
+        """Dictionary of section -> (hits, misses) for the loads so far"""
+        return dict((section, tuple(counts)) for section, counts in self._stats.items())
 
+    def store(self, section, key, data, dtype='json'):
         if not self.enabled:
             return
 
-        fn = self._get_cache_fn(section, key, dtype)
+        self._check_entry(section, key, dtype)
+        backend = self._get_backend()
         try:
-            try:
-                os.makedirs(os.path.dirname(fn))
-            except OSError as ose:
-                if ose.errno != errno.EEXIST:
-                    raise
-            write_json_file(data, fn)
+            size = backend.store(section, key, dtype, data)
         except Exception:
             tb = traceback.format_exc()
             self._ydl.report_warning(
-                'Writing cache to %r failed: %s' % (fn, tb))
+                'Writing cache to %r failed: %s' % (backend.location(section, key, dtype), tb))
+            return
 
-    def load(self, section, key, dtype='json', default=None):
-        assert dtype in ('json',)
+        max_size = self._ydl.params.get('cache_max_size')
+        if max_size:
+            if self._size is not None:
+                self._size += size
+            if self._size is None or self._size > max_size:
+                self._size = self._evict(max_size)
 
+    def load(self, section, key, dtype='json', default=None):
         if not self.enabled:
             return default
 
-        cache_fn = self._get_cache_fn(section, key, dtype)
-        try:
+        self._check_entry(section, key, dtype)
+        backend = self._get_backend()
+        counts = self._stats.setdefault(section, [0, 0])
+        data = backend.load(section, key, dtype, self._ydl.params.get('cache_ttl'))
+        if data is not None:
             try:
-                with io.open(cache_fn, 'r', encoding='utf-8') as cachef:
-                    return json.load(cachef)
+                res = json.loads(data)
             except ValueError:
-                try:
-                    file_size = os.path.getsize(cache_fn)
-                except (OSError, IOError) as oe:
-                    file_size = str(oe)
-                self._ydl.report_warning(
-                    'Cache retrieval from %s failed (%s)' % (cache_fn, file_size))
-        except IOError:
-            pass  # No cache available
-
+                self._ydl.report_warning('Cache retrieval from %s failed (%s)' % (
+                    backend.location(section, key, dtype), len(data)))
+            else:
+                counts[0] += 1
+                return res
+        counts[1] += 1
         return default
 
+    def _evict(self, max_size, section=None):
+        """Remove the least recently used entries until the cache (or section)
+        takes at most max_size bytes and return its remaining size"""
+        backend = self._get_backend()
+        entries = backend.entries(section)
+        total_size = sum(entry[1] for entry in entries)
+        for _, size, entry_section, key, dtype in sorted(entries):
+            if total_size <= max_size:
+                break
+            backend.delete(entry_section, key, dtype)
+            total_size -= size
+        return total_size
+
+    def prune(self, section, max_size):
+        """Remove the least recently used entries of section until it takes at most max_size bytes"""
+        if not self.enabled:
+            return
+
+        self._evict(max_size, section)
+
     def remove(self):
         if not self.enabled:
             self._ydl.to_screen('Cache is disabled (Did you combine --no-cache-dir and --rm-cache-dir?)')
@@ -85,6 +294,10 @@ class Cache(object):
         if not any((term in cachedir) for term in ('cache', 'tmp')):
             raise Exception('Not removing directory %s - this does not look like a cache dir' % cachedir)
 
+        if self._backend is not None:
+            self._backend.close()
+        self._size = None
+
         self._ydl.to_screen(
             'Removing cache dir %s .' % cachedir, skip_eol=True)
         if os.path.exists(cachedir):
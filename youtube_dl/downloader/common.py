@@ -182,6 +182,11 @@ class FileDownloader(object):
             return filename
         return filename + '.part'
 
+    @staticmethod
+    def ytdl_filename(filename):
+        """Returns the name of the file the state of an unfinished download is kept in."""
+        return filename + '.ytdl'
+
     def undo_temp_name(self, filename):
         if filename.endswith('.part'):
             return filename[:-len('.part')]
@@ -222,7 +227,9 @@ class FileDownloader(object):
 
     def _report_progress_status(self, msg, is_last_line=False):
         fullmsg = '[download] ' + msg
-        if self.params.get('progress_with_newline', False):
+        # Progress lines of concurrent downloads would overwrite each other
+        if (self.params.get('progress_with_newline', False) or
+                (self.params.get('concurrent_videos') or 1) > 1):
             self.to_screen(fullmsg)
         else:
             if compat_os_name == 'nt':
@@ -366,6 +373,12 @@ class FileDownloader(object):
         # this interface
         self._progress_hooks.append(ph)
 
+    def set_progress_reporter(self, reporter):
+        """Call reporter with the progress instead of printing it"""
+        self._progress_hooks = [
+            reporter if ph == self.report_progress else ph
+            for ph in self._progress_hooks]
+
     def _debug_cmd(self, args, exe=None):
         if not self.params.get('verbose', False):
             return
@@ -1,13 +1,57 @@
 from __future__ import unicode_literals
 
-import os
+import itertools
 
 from .fragment import FragmentFD
-from ..compat import compat_urllib_error
-from ..utils import (
-    sanitize_open,
-    encodeFilename,
-)
+from ..utils import float_or_none
+
+
+def template_fragments(fragment_template):
+    """Generate the fragments described by a fragment_template format entry"""
+    if 'initialization_url' in fragment_template:
+        yield {'url': fragment_template['initialization_url']}
+    media_template = fragment_template['media_template']
+    timescale = fragment_template['timescale']
+    bandwidth = fragment_template.get('bandwidth')
+    segment_number = fragment_template['start_number']
+    timeline = fragment_template.get('timeline')
+    if timeline is None:
+        for segment_number in range(
+                segment_number, segment_number + fragment_template['total_number']):
+            yield {
+                'url': media_template % {
+                    'Number': segment_number,
+                    'Bandwidth': bandwidth,
+                },
+                'duration': fragment_template.get('segment_duration'),
+            }
+        return
+    segment_time = 0
+    for t, d, r in timeline:
+        segment_time = t or segment_time
+        duration = float_or_none(d, timescale)
+        for _ in range(max(r, 0) + 1):
+            yield {
+                'url': media_template % {
+                    'Time': segment_time,
+                    'Bandwidth': bandwidth,
+                    'Number': segment_number,
+                },
+                'duration': duration,
+            }
+            segment_number += 1
+            segment_time += d
+
+
+def count_template_fragments(fragment_template):
+    """Return the number of fragments described by a fragment_template format entry"""
+    timeline = fragment_template.get('timeline')
+    count = (
+        fragment_template['total_number'] if timeline is None
+        else sum(max(r, 0) + 1 for _, _, r in timeline))
+    if 'initialization_url' in fragment_template:
+        count += 1
+    return count
 
 
 class DashSegmentsFD(FragmentFD):
@@ -17,65 +61,51 @@ class DashSegmentsFD(FragmentFD):
 
     FD_NAME = 'dashsegments'
 
+    # Same as FFmpegFixupM4aPP
+    _REMUX_OPTIONS = ['-f', 'mp4']
+
+    @classmethod
+    def get_remux_options(cls, info_dict, params):
+        # Only DASH m4a has to be fixed up
+        if info_dict.get('container') != 'm4a_dash':
+            return None
+        return super(DashSegmentsFD, cls).get_remux_options(info_dict, params)
+
     def real_download(self, filename, info_dict):
-        segments = info_dict['fragments'][:1] if self.params.get(
-            'test', False) else info_dict['fragments']
+        fragment_template = info_dict.get('fragment_template')
+        if fragment_template:
+            segments = template_fragments(fragment_template)
+            total_frags = count_template_fragments(fragment_template)
+        else:
+            segments = info_dict['fragments']
+            total_frags = len(segments)
+        if self.params.get('test', False):
+            segments = itertools.islice(segments, 1)
+            total_frags = min(total_frags, 1)
 
         ctx = {
             'filename': filename,
-            'total_frags': len(segments),
+            'total_frags': total_frags,
+            'remux_options': self.get_remux_options(info_dict, self.params),
         }
 
         self._prepare_and_start_frag_download(ctx)
 
-        segments_filenames = []
-
-        fragment_retries = self.params.get('fragment_retries', 0)
-        skip_unavailable_fragments = self.params.get('skip_unavailable_fragments', True)
-
-        def process_segment(segment, tmp_filename, num):
-            segment_url = segment['url']
-            segment_name = 'Frag%d' % num
-            target_filename = '%s-%s' % (tmp_filename, segment_name)
-            # In DASH, the first segment contains necessary headers to
-            # generate a valid MP4 file, so always abort for the first segment
-            fatal = num == 0 or not skip_unavailable_fragments
-            count = 0
-            while count <= fragment_retries:
-                try:
-                    success = ctx['dl'].download(target_filename, {'url': segment_url})
-                    if not success:
-                        return False
-                    down, target_sanitized = sanitize_open(target_filename, 'rb')
-                    ctx['dest_stream'].write(down.read())
-                    down.close()
-                    segments_filenames.append(target_sanitized)
-                    break
-                except compat_urllib_error.HTTPError as err:
-                    # YouTube may often return 404 HTTP error for a fragment causing the
-                    # whole download to fail. However if the same fragment is immediately
-                    # retried with the same request data this usually succeeds (1-2 attemps
-                    # is usually enough) thus allowing to download the whole file successfully.
-                    # To be future-proof we will retry all fragments that fail with any
-                    # HTTP error.
-                    count += 1
-                    if count <= fragment_retries:
-                        self.report_retry_fragment(err, segment_name, count, fragment_retries)
-            if count > fragment_retries:
-                if not fatal:
-                    self.report_skip_fragment(segment_name)
-                    return True
-                self.report_error('giving up after %s fragment retries' % fragment_retries)
-                return False
-            return True
-
-        for i, segment in enumerate(segments):
-            if not process_segment(segment, ctx['tmpfilename'], i):
-                return False
-
-        self._finish_frag_download(ctx)
-
-        for segment_file in segments_filenames:
-            os.remove(encodeFilename(segment_file))
-
-        return True
+        # In DASH, the first segment contains necessary headers to
+        # generate a valid MP4 file, so always abort for the first segment.
+        # YouTube may often return 404 HTTP error for a fragment causing the
+        # whole download to fail. However if the same fragment is immediately
+        # retried with the same request data this usually succeeds (1-2 attemps
+        # is usually enough) thus allowing to download the whole file successfully.
+        # To be future-proof we will retry all fragments that fail with any
+        # HTTP error.
+        fragments = ({
+            'url': segment['url'],
+            'frag_index': i,
+            'fatal': i == 0,
+        } for i, segment in enumerate(segments))
+
+        if not self._download_fragments(ctx, fragments):
+            return False
+
+        return self._finish_frag_download(ctx)
@@ -5,6 +5,11 @@ import subprocess
 import sys
 import re
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 from .common import FileDownloader
 from ..compat import compat_setenv
 from ..postprocessor.ffmpeg import FFmpegPostProcessor, EXT_TO_OUT_FORMATS
@@ -17,6 +22,7 @@ from ..utils import (
     encodeArgument,
     handle_youtubedl_headers,
     check_executable,
+    shell_quote,
 )
 
 
@@ -293,6 +299,90 @@ class FFmpegFD(ExternalFD):
 class AVconvFD(FFmpegFD):
     pass
 
+
+class FFmpegRemuxer(object):
+    """
+    Remux streams into out_path with ffmpeg while they are being downloaded,
+    instead of writing them to disk and rewriting them afterwards.
+
+    Once started, every stream must be written to its file object in inputs,
+    which must be closed once it's complete. ffmpeg reads the inputs in an
+    interleaved way, so they must all be written at the same time.
+    """
+
+    def __init__(self, downloader, out_path, input_count, opts):
+        self._downloader = downloader
+        self.out_path = out_path
+        self.input_count = input_count
+        self.opts = opts
+        self.inputs = []
+        self._proc = None
+
+    @staticmethod
+    def available(input_count=1):
+        # Only stdin can be handed to ffmpeg on Windows
+        if input_count > 1 and fcntl is None:
+            return False
+        return FFmpegPostProcessor().available
+
+    def start(self):
+        ffpp = FFmpegPostProcessor(downloader=self._downloader)
+        ffpp.check_version()
+
+        pipes = []
+        args = [ffpp.executable, '-y']
+        if not self._downloader.params.get('verbose', False):
+            args += ['-loglevel', 'error']
+        if self.input_count == 1:
+            args += ['-i', 'pipe:0']
+        else:
+            for _ in range(self.input_count):
+                read_fd, write_fd = os.pipe()
+                # ffmpeg would never see the end of its inputs if it inherited
+                # their write ends
+                fcntl.fcntl(write_fd, fcntl.F_SETFD, fcntl.fcntl(write_fd, fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+                pipes.append((read_fd, write_fd))
+                args += ['-i', 'pipe:%d' % read_fd]
+        args += ['-c', 'copy'] + self.opts
+        args = [encodeArgument(opt) for opt in args]
+        args.append(encodeFilename(ffpp._ffmpeg_filename_argument(self.out_path), True))
+
+        if self._downloader.params.get('verbose', False):
+            self._downloader.to_screen('[debug] ffmpeg command line: %s' % shell_quote(args))
+
+        kwargs = {}
+        if pipes and sys.version_info >= (3, 2):
+            # File descriptors are not inherited by default since Python 3.4
+            kwargs['pass_fds'] = [read_fd for read_fd, _ in pipes]
+        self._proc = subprocess.Popen(
+            args, stdin=subprocess.PIPE if not pipes else None, **kwargs)
+        if pipes:
+            for read_fd, write_fd in pipes:
+                os.close(read_fd)
+                self.inputs.append(os.fdopen(write_fd, 'wb'))
+        else:
+            self.inputs.append(self._proc.stdin)
+
+    def _close_inputs(self):
+        for stream in self.inputs:
+            try:
+                stream.close()
+            except (IOError, OSError):
+                # ffmpeg has already exited
+                pass
+
+    def finish(self):
+        """Wait for ffmpeg to write the remaining data, return its exit code"""
+        self._close_inputs()
+        return self._proc.wait()
+
+    def abort(self):
+        self._close_inputs()
+        if self._proc.poll() is None:
+            self._proc.terminate()
+            self._proc.wait()
+
+
 _BY_NAME = dict(
     (klass.get_basename(), klass)
     for name, klass in globals().items()
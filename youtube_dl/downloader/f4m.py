@@ -3,7 +3,6 @@ from __future__ import division, unicode_literals
 import base64
 import io
 import itertools
-import os
 import time
 
 from .fragment import FragmentFD
@@ -16,9 +15,7 @@ from ..compat import (
     compat_struct_unpack,
 )
 from ..utils import (
-    encodeFilename,
     fix_xml_ampersands,
-    sanitize_open,
     xpath_text,
 )
 
@@ -313,13 +310,11 @@ class F4mFD(FragmentFD):
     def real_download(self, filename, info_dict):
         man_url = info_dict['url']
         requested_bitrate = info_dict.get('tbr')
-        self.to_screen('[%s] Downloading f4m manifest' % self.FD_NAME)
-        urlh = self.ydl.urlopen(man_url)
-        man_url = urlh.geturl()
+        man_url, manifest = self._get_manifest(info_dict, 'f4m')
         # Some manifests may be malformed, e.g. prosiebensat1 generated manifests
         # (see https://github.com/rg3/youtube-dl/issues/6215#issuecomment-121704244
         # and https://github.com/rg3/youtube-dl/issues/7823)
-        manifest = fix_xml_ampersands(urlh.read().decode('utf-8', 'ignore')).strip()
+        manifest = fix_xml_ampersands(manifest).strip()
 
         doc = compat_etree_fromstring(manifest)
         formats = [(int(f.attrib.get('bitrate', -1)), f)
@@ -365,17 +360,19 @@ class F4mFD(FragmentFD):
 
         dest_stream = ctx['dest_stream']
 
-        write_flv_header(dest_stream)
-        if not live:
-            write_metadata_tag(dest_stream, metadata)
+        # When resuming, the headers are already there
+        if not ctx['fragment_index']:
+            write_flv_header(dest_stream)
+            if not live:
+                write_metadata_tag(dest_stream, metadata)
+            if self._do_ytdl_file(ctx):
+                ctx['resume_len'] = dest_stream.tell()
 
         base_url_parsed = compat_urllib_parse_urlparse(base_url)
 
         self._start_frag_download(ctx)
 
-        frags_filenames = []
-        while fragments_list:
-            seg_i, frag_i = fragments_list.pop(0)
+        def fragment_info(seg_i, frag_i):
             name = 'Seg%d-Frag%d' % (seg_i, frag_i)
             query = []
             if base_url_parsed.query:
@@ -385,36 +382,45 @@ class F4mFD(FragmentFD):
             if info_dict.get('extra_param_to_segment_url'):
                 query.append(info_dict['extra_param_to_segment_url'])
             url_parsed = base_url_parsed._replace(path=base_url_parsed.path + name, query='&'.join(query))
-            frag_filename = '%s-%s' % (ctx['tmpfilename'], name)
+            return {
+                'url': url_parsed.geturl(),
+                'frag_index': frag_i,
+                'name': name,
+            }
+
+        def extract_media_data(down_data, fragment=None):
+            reader = FlvReader(down_data)
+            while True:
+                try:
+                    _, box_type, box_data = reader.read_box_info()
+                except DataTruncatedError:
+                    if test:
+                        # In tests, segments may be truncated, and thus
+                        # FlvReader may not be able to parse the whole
+                        # chunk. If so, write the segment as is
+                        # See https://github.com/rg3/youtube-dl/issues/9214
+                        return down_data
+                    raise
+                if box_type == b'mdat':
+                    return box_data
+
+        if not live:
+            fragments = [
+                fragment_info(seg_i, frag_i) for seg_i, frag_i in fragments_list]
+            if not self._download_fragments(ctx, fragments, extract_media_data):
+                return False
+
+        while live and fragments_list:
+            seg_i, frag_i = fragments_list.pop(0)
+            fragment = fragment_info(seg_i, frag_i)
             try:
-                success = ctx['dl'].download(frag_filename, {'url': url_parsed.geturl()})
+                success, down_data = self._download_fragment(
+                    ctx, fragment['url'], fragment['name'])
                 if not success:
                     return False
-                (down, frag_sanitized) = sanitize_open(frag_filename, 'rb')
-                down_data = down.read()
-                down.close()
-                reader = FlvReader(down_data)
-                while True:
-                    try:
-                        _, box_type, box_data = reader.read_box_info()
-                    except DataTruncatedError:
-                        if test:
-                            # In tests, segments may be truncated, and thus
-                            # FlvReader may not be able to parse the whole
-                            # chunk. If so, write the segment as is
-                            # See https://github.com/rg3/youtube-dl/issues/9214
-                            dest_stream.write(down_data)
-                            break
-                        raise
-                    if box_type == b'mdat':
-                        dest_stream.write(box_data)
-                        break
-                if live:
-                    os.remove(encodeFilename(frag_sanitized))
-                else:
-                    frags_filenames.append(frag_sanitized)
+                dest_stream.write(extract_media_data(down_data))
             except (compat_urllib_error.HTTPError, ) as err:
-                if live and (err.code == 404 or err.code == 410):
+                if err.code == 404 or err.code == 410:
                     # We didn't keep up with the live window. Continue
                     # with the next available fragment.
                     msg = 'Fragment %d unavailable' % frag_i
@@ -423,7 +429,7 @@ class F4mFD(FragmentFD):
                 else:
                     raise
 
-            if not fragments_list and not test and live and bootstrap_url:
+            if not fragments_list and not test and bootstrap_url:
                 fragments_list = self._update_live_fragments(bootstrap_url, frag_i)
                 total_frags += len(fragments_list)
                 if fragments_list and (fragments_list[0][1] > frag_i + 1):
@@ -432,7 +438,4 @@ class F4mFD(FragmentFD):
 
         self._finish_frag_download(ctx)
 
-        for frag_file in frags_filenames:
-            os.remove(encodeFilename(frag_file))
-
         return True
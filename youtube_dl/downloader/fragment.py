@@ -1,10 +1,19 @@
 from __future__ import division, unicode_literals
 
+import collections
+import io
+import itertools
+import json
 import os
+import sys
+import threading
 import time
+import zlib
 
 from .common import FileDownloader
+from .external import FFmpegRemuxer
 from .http import HttpFD
+from ..compat import compat_urllib_error
 from ..utils import (
     error_to_compat_str,
     encodeFilename,
@@ -17,18 +26,99 @@ class HttpQuietDownloader(HttpFD):
         pass
 
 
+class _FragmentBuffer(io.BytesIO):
+    def close(self):
+        # HttpFD closes its output once done, the data must stay available
+        # until the fragment has been appended
+        pass
+
+
+class HttpMemoryDownloader(HttpQuietDownloader):
+    """A quiet HTTP downloader that keeps the downloaded data in memory"""
+
+    def download(self, filename, info_dict):
+        # Nothing is ever stored on disk so there is nothing to reuse
+        self.buffer = _FragmentBuffer()
+        return self.real_download(filename, info_dict)
+
+    def temp_name(self, filename):
+        return filename
+
+    def _open_stream(self, tmpfilename, open_mode):
+        return self.buffer, tmpfilename
+
+
 class FragmentFD(FileDownloader):
     """
     A base file downloader class for fragmented media (e.g. f4m/m3u8 manifests).
 
     Available options:
 
-    fragment_retries:   Number of times to retry a fragment for HTTP error (DASH
-                        and hlsnative only)
+    fragment_retries:   Number of times to retry a fragment for HTTP error (DASH,
+                        hlsnative and f4m only)
     skip_unavailable_fragments:
-                        Skip unavailable fragments (DASH and hlsnative only)
+                        Skip unavailable fragments (DASH, hlsnative and f4m only)
+    concurrent_fragment_downloads:
+                        Number of fragments to download concurrently (DASH,
+                        hlsnative and f4m only)
+    keep_fragments:     Write fragments to disk and keep them after the
+                        download has finished. Fragments are only held in
+                        memory by default.
+    remux_fragments:    Feed the fragments to ffmpeg as they are downloaded
+                        to write the final container directly, when the
+                        downloaded media would otherwise need to be fixed up
+                        (DASH and hlsnative only)
+
+    Unless downloading a live stream, to stdout or through ffmpeg, the
+    progress of an unfinished download is recorded in a '<filename>.ytdl' file
+    next to the temporary file, so that it can be resumed at the last complete
+    fragment when continuedl is set.
     """
 
+    # Writable file object the media is written to instead of a file, see
+    # set_output_stream
+    _output_stream = None
+
+    # ffmpeg output options remuxing the media into its final container, for
+    # the downloaders whose output needs to be fixed up
+    _REMUX_OPTIONS = None
+
+    @classmethod
+    def get_remux_options(cls, info_dict, params):
+        """
+        Return the ffmpeg output options used to remux the download of
+        info_dict on the fly, None if it is written as downloaded.
+        """
+        if not params.get('remux_fragments', False) or not cls._REMUX_OPTIONS:
+            return None
+        # Remuxing replaces the fixups, the container is left alone when
+        # they are not wanted
+        if params.get('fixup') not in (None, 'detect_or_warn'):
+            return None
+        if not FFmpegRemuxer.available():
+            return None
+        return cls._REMUX_OPTIONS
+
+    def set_output_stream(self, stream):
+        """
+        Write the media to stream (e.g. an input of an FFmpegRemuxer) rather
+        than to a file. The stream is not closed once done.
+        """
+        self._output_stream = stream
+
+    def _get_manifest(self, info_dict, manifest_type):
+        """
+        Return the final URL and the content of the manifest at
+        info_dict['url'], the one downloaded during the extraction is used
+        until it expires.
+        """
+        downloaded_manifest = self.ydl.pop_downloaded_manifest(info_dict['url'])
+        if downloaded_manifest:
+            return downloaded_manifest['url'], downloaded_manifest['content']
+        self.to_screen('[%s] Downloading %s manifest' % (self.FD_NAME, manifest_type))
+        urlh = self.ydl.urlopen(info_dict['url'])
+        return urlh.geturl(), urlh.read().decode('utf-8', 'ignore')
+
     def report_retry_fragment(self, err, fragment_name, count, retries):
         self.to_screen(
             '[download] Got server HTTP error: %s. Retrying fragment %s (attempt %d of %s)...'
@@ -37,21 +127,72 @@ class FragmentFD(FileDownloader):
     def report_skip_fragment(self, fragment_name):
         self.to_screen('[download] Skipping fragment %s...' % fragment_name)
 
+    def report_resuming_fragment(self, frag_index, resume_len):
+        self.to_screen(
+            '[download] Resuming download at fragment %d (byte %d)' % (frag_index, resume_len))
+
+    def _do_ytdl_file(self, ctx):
+        return (
+            not ctx['live'] and ctx['tmpfilename'] != '-' and
+            self._output_stream is None and 'remuxer' not in ctx)
+
+    def _read_ytdl_file(self, ctx):
+        """
+        Load the fragment index persisted by a previous run and check it
+        against the temporary file.
+
+        Returns a (fragment_index, resume_len) tuple, (0, 0) if the download
+        must start over.
+        """
+        tmpfilename = encodeFilename(ctx['tmpfilename'])
+        try:
+            with open(encodeFilename(self.ytdl_filename(ctx['filename'])), 'rb') as f:
+                current_fragment = json.loads(f.read().decode('utf-8'))['downloader']['current_fragment']
+            frag_index = int(current_fragment['index'])
+            resume_len = int(current_fragment['offset'])
+            last_size = int(current_fragment['last_size'])
+            last_crc32 = int(current_fragment['last_crc32'])
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            self.report_warning('.ytdl file is corrupt. Restarting from the beginning...')
+            return 0, 0
+        if frag_index == 0:
+            return 0, 0
+        consistent = False
+        if os.path.isfile(tmpfilename) and os.path.getsize(tmpfilename) >= resume_len >= last_size:
+            with open(tmpfilename, 'rb') as f:
+                f.seek(resume_len - last_size)
+                consistent = zlib.crc32(f.read(last_size)) & 0xffffffff == last_crc32
+        if not consistent:
+            self.report_warning(
+                'Inconsistent state of incomplete fragment download. '
+                'Restarting from the beginning...')
+            return 0, 0
+        return frag_index, resume_len
+
+    def _write_ytdl_file(self, ctx, last_fragment=b''):
+        ytdl_data = {
+            'downloader': {
+                'current_fragment': {
+                    'index': ctx['fragment_index'],
+                    'offset': ctx['resume_len'],
+                    'last_size': len(last_fragment),
+                    'last_crc32': zlib.crc32(last_fragment) & 0xffffffff,
+                },
+            },
+        }
+        with open(encodeFilename(self.ytdl_filename(ctx['filename'])), 'wb') as f:
+            f.write(json.dumps(ytdl_data).encode('utf-8'))
+
     def _prepare_and_start_frag_download(self, ctx):
         self._prepare_frag_download(ctx)
         self._start_frag_download(ctx)
 
-    def _prepare_frag_download(self, ctx):
-        if 'live' not in ctx:
-            ctx['live'] = False
-        self.to_screen(
-            '[%s] Total fragments: %s'
-            % (self.FD_NAME, ctx['total_frags'] if not ctx['live'] else 'unknown (live)'))
-        self.report_destination(ctx['filename'])
-        dl = HttpQuietDownloader(
+    def _create_frag_downloader(self, ctx):
+        keep_fragments = self.params.get('keep_fragments', False)
+        dl = (HttpQuietDownloader if keep_fragments else HttpMemoryDownloader)(
             self.ydl,
             {
-                'continuedl': True,
+                'continuedl': keep_fragments,
                 'quiet': True,
                 'noprogress': True,
                 'ratelimit': self.params.get('ratelimit'),
@@ -59,8 +200,55 @@ class FragmentFD(FileDownloader):
                 'test': self.params.get('test', False),
             }
         )
-        tmpfilename = self.temp_name(ctx['filename'])
-        dest_stream, tmpfilename = sanitize_open(tmpfilename, 'wb')
+        if 'frag_progress_hook' in ctx:
+            dl.add_progress_hook(ctx['frag_progress_hook']())
+        return dl
+
+    def _prepare_frag_download(self, ctx):
+        if 'live' not in ctx:
+            ctx['live'] = False
+        self.to_screen(
+            '[%s] Total fragments: %s'
+            % (self.FD_NAME, ctx['total_frags'] if not ctx['live'] else 'unknown (live)'))
+        self.report_destination(ctx['filename'])
+        dl = self._create_frag_downloader(ctx)
+        ctx.update({
+            'tmpfilename': self.temp_name(ctx['filename']),
+            # Number of fragments processed so far, in manifest order
+            'fragment_index': 0,
+            # Size of the temporary file once these have been written
+            'resume_len': 0,
+        })
+        remux_options = ctx.get('remux_options')
+        if self._output_stream is None and remux_options and ctx['tmpfilename'] != '-':
+            ctx['remuxer'] = FFmpegRemuxer(self, ctx['tmpfilename'], 1, remux_options)
+
+        open_mode = 'wb'
+        if self._do_ytdl_file(ctx):
+            if (self.params.get('continuedl', True) and
+                    os.path.isfile(encodeFilename(self.ytdl_filename(ctx['filename'])))):
+                frag_index, resume_len = self._read_ytdl_file(ctx)
+                if frag_index > 0:
+                    self.report_resuming_fragment(frag_index, resume_len)
+                    open_mode = 'ab'
+                    ctx.update({
+                        'fragment_index': frag_index,
+                        'resume_len': resume_len,
+                    })
+            if open_mode == 'wb':
+                self._write_ytdl_file(ctx)
+
+        if self._output_stream is not None:
+            dest_stream, tmpfilename = self._output_stream, ctx['tmpfilename']
+        elif 'remuxer' in ctx:
+            self.to_screen('[%s] Remuxing the fragments with ffmpeg' % self.FD_NAME)
+            ctx['remuxer'].start()
+            dest_stream, tmpfilename = ctx['remuxer'].inputs[0], ctx['tmpfilename']
+        else:
+            dest_stream, tmpfilename = sanitize_open(ctx['tmpfilename'], open_mode)
+            if open_mode == 'ab':
+                # Drop whatever was written after the last complete fragment
+                dest_stream.truncate(ctx['resume_len'])
         ctx.update({
             'dl': dl,
             'dest_stream': dest_stream,
@@ -73,8 +261,8 @@ class FragmentFD(FileDownloader):
         # hook
         state = {
             'status': 'downloading',
-            'downloaded_bytes': 0,
-            'frag_index': 0,
+            'downloaded_bytes': ctx['resume_len'],
+            'frag_index': ctx['fragment_index'],
             'frag_count': total_frags,
             'filename': ctx['filename'],
             'tmpfilename': ctx['tmpfilename'],
@@ -84,51 +272,236 @@ class FragmentFD(FileDownloader):
         ctx.update({
             'started': start,
             # Total complete fragments downloaded so far in bytes
-            'complete_frags_downloaded_bytes': 0,
-            # Amount of fragment's bytes downloaded by the time of the previous
-            # frag progress hook invocation
-            'prev_frag_downloaded_bytes': 0,
+            'complete_frags_downloaded_bytes': ctx['resume_len'],
+            # Fragments may be downloaded by several threads at once, progress
+            # reporting must be serialized
+            'lock': threading.Lock(),
         })
 
-        def frag_progress_hook(s):
-            if s['status'] not in ('downloading', 'finished'):
-                return
+        def make_frag_progress_hook():
+            # Amount of fragment's bytes downloaded by the time of the previous
+            # frag progress hook invocation, tracked separately for every
+            # fragment downloader
+            frag_state = {'prev_frag_downloaded_bytes': 0}
 
-            time_now = time.time()
-            state['elapsed'] = time_now - start
-            frag_total_bytes = s.get('total_bytes') or 0
-            if not ctx['live']:
-                estimated_size = (
-                    (ctx['complete_frags_downloaded_bytes'] + frag_total_bytes) /
-                    (state['frag_index'] + 1) * total_frags)
-                state['total_bytes_estimate'] = estimated_size
-
-            if s['status'] == 'finished':
-                state['frag_index'] += 1
-                state['downloaded_bytes'] += frag_total_bytes - ctx['prev_frag_downloaded_bytes']
-                ctx['complete_frags_downloaded_bytes'] = state['downloaded_bytes']
-                ctx['prev_frag_downloaded_bytes'] = 0
-            else:
-                frag_downloaded_bytes = s['downloaded_bytes']
-                state['downloaded_bytes'] += frag_downloaded_bytes - ctx['prev_frag_downloaded_bytes']
-                if not ctx['live']:
-                    state['eta'] = self.calc_eta(
-                        start, time_now, estimated_size,
-                        state['downloaded_bytes'])
-                state['speed'] = s.get('speed') or ctx.get('speed')
-                ctx['speed'] = state['speed']
-                ctx['prev_frag_downloaded_bytes'] = frag_downloaded_bytes
-            self._hook_progress(state)
-
-        ctx['dl'].add_progress_hook(frag_progress_hook)
+            def frag_progress_hook(s):
+                if s['status'] not in ('downloading', 'finished'):
+                    return
+
+                with ctx['lock']:
+                    time_now = time.time()
+                    state['elapsed'] = time_now - start
+                    frag_total_bytes = s.get('total_bytes') or 0
+                    if not ctx['live']:
+                        estimated_size = (
+                            (ctx['complete_frags_downloaded_bytes'] + frag_total_bytes) /
+                            (state['frag_index'] + 1) * total_frags)
+                        state['total_bytes_estimate'] = estimated_size
+
+                    if s['status'] == 'finished':
+                        state['frag_index'] += 1
+                        state['downloaded_bytes'] += frag_total_bytes - frag_state['prev_frag_downloaded_bytes']
+                        ctx['complete_frags_downloaded_bytes'] = state['downloaded_bytes']
+                        frag_state['prev_frag_downloaded_bytes'] = 0
+                    else:
+                        frag_downloaded_bytes = s['downloaded_bytes']
+                        state['downloaded_bytes'] += frag_downloaded_bytes - frag_state['prev_frag_downloaded_bytes']
+                        if not ctx['live']:
+                            state['eta'] = self.calc_eta(
+                                start, time_now, estimated_size,
+                                state['downloaded_bytes'])
+                        state['speed'] = s.get('speed') or ctx.get('speed')
+                        ctx['speed'] = state['speed']
+                        frag_state['prev_frag_downloaded_bytes'] = frag_downloaded_bytes
+                    self._hook_progress(state)
+
+            return frag_progress_hook
+
+        ctx['frag_progress_hook'] = make_frag_progress_hook
+        ctx['dl'].add_progress_hook(make_frag_progress_hook())
 
         return start
 
+    def _download_fragment(self, ctx, frag_url, frag_name, dl=None, byte_range=None):
+        """
+        Download a single fragment with the given fragment downloader
+        (ctx['dl'] by default), only its byte_range part if given.
+
+        Returns a (success, frag_content) tuple.
+        """
+        dl = dl or ctx['dl']
+        frag_filename = '%s-%s' % (ctx['tmpfilename'], frag_name)
+        frag_info = {'url': frag_url}
+        if byte_range:
+            frag_info['http_headers'] = {
+                'Range': 'bytes=%d-%d' % (byte_range['start'], byte_range['end']),
+            }
+        success = dl.download(frag_filename, frag_info)
+        if not success:
+            return False, None
+        if isinstance(dl, HttpMemoryDownloader):
+            frag_content = dl.buffer.getvalue()
+        else:
+            down, frag_sanitized = sanitize_open(frag_filename, 'rb')
+            frag_content = down.read()
+            down.close()
+        if byte_range and len(frag_content) > byte_range['end'] - byte_range['start'] + 1:
+            # The server has ignored the Range header and sent the whole file
+            frag_content = frag_content[byte_range['start']:byte_range['end'] + 1]
+        return True, frag_content
+
+    def _download_fragments(self, ctx, fragments, pack_func=None):
+        """
+        Download fragments and write them to ctx['dest_stream'] in order.
+
+        fragments is an iterable of dicts with the following fields:
+        url:            Fragment URL
+        frag_index:     Fragment number
+        name:           (optional) Fragment name, "Frag<frag_index>" by default
+        byte_range:     (optional) Dictionary with the first and last bytes
+                        ("start" and "end") of the fragment in the file at url
+        fatal:          (optional) Abort the whole download if this fragment
+                        is unavailable regardless of skip_unavailable_fragments
+
+        Up to concurrent_fragment_downloads fragments are fetched at the same
+        time, the iterable is only consumed as far as needed to keep them busy.
+        Fragments already processed by an interrupted download that is being
+        resumed are skipped.
+
+        pack_func, if given, is called with the fragment content and the
+        fragment dict and must return the data to write.
+
+        Live downloads are stopped gracefully on KeyboardInterrupt, keeping
+        the fragments written so far.
+
+        Returns True on success and False otherwise.
+        """
+        success = False
+        try:
+            success = self._write_fragments(ctx, fragments, pack_func)
+        except KeyboardInterrupt:
+            if not ctx['live']:
+                raise
+            self.to_screen('\n[%s] Interrupted by user, stopping the live download' % self.FD_NAME)
+            success = True
+        finally:
+            if not success and 'remuxer' in ctx:
+                # Don't leave ffmpeg waiting for more data
+                ctx['remuxer'].abort()
+        return success
+
+    def _write_fragments(self, ctx, fragments, pack_func):
+        fragment_retries = self.params.get('fragment_retries', 0)
+        skip_unavailable_fragments = self.params.get('skip_unavailable_fragments', True)
+        max_workers = max(self.params.get('concurrent_fragment_downloads') or 1, 1)
+
+        def download_fragment(fragment, dl):
+            frag_name = fragment.get('name') or 'Frag%d' % fragment['frag_index']
+            count = 0
+            while count <= fragment_retries:
+                try:
+                    return self._download_fragment(
+                        ctx, fragment['url'], frag_name, dl, fragment.get('byte_range'))
+                except compat_urllib_error.HTTPError as err:
+                    # Unavailable (possibly temporary) fragments may be served.
+                    # First we try to retry then either skip or abort.
+                    # See https://github.com/rg3/youtube-dl/issues/10165,
+                    # https://github.com/rg3/youtube-dl/issues/10448).
+                    count += 1
+                    if count <= fragment_retries:
+                        self.report_retry_fragment(err, frag_name, count, fragment_retries)
+            if skip_unavailable_fragments and not fragment.get('fatal'):
+                self.report_skip_fragment(frag_name)
+                return True, None
+            self.report_error(
+                'giving up after %s fragment retries' % fragment_retries)
+            return False, None
+
+        def append_fragment(fragment, result):
+            success, frag_content = result
+            if not success:
+                return False
+            ctx['fragment_index'] += 1
+            if frag_content is not None:
+                if pack_func:
+                    frag_content = pack_func(frag_content, fragment)
+                ctx['dest_stream'].write(frag_content)
+                ctx['resume_len'] += len(frag_content)
+            if self._do_ytdl_file(ctx):
+                # The data must hit the file before the index refers to it
+                ctx['dest_stream'].flush()
+                self._write_ytdl_file(ctx, frag_content or b'')
+            return True
+
+        fragments = itertools.islice(fragments, ctx['fragment_index'], None)
+
+        if max_workers == 1:
+            for fragment in fragments:
+                if not append_fragment(fragment, download_fragment(fragment, ctx['dl'])):
+                    return False
+            return True
+
+        def run_job(job):
+            try:
+                job['result'] = download_fragment(job['fragment'], job['dl'])
+            except Exception:
+                job['exc_info'] = sys.exc_info()
+
+        def submit_job(fragment):
+            job = {
+                'fragment': fragment,
+                'dl': self._create_frag_downloader(ctx),
+            }
+            job['thread'] = threading.Thread(target=run_job, args=(job,))
+            job['thread'].daemon = True
+            job['thread'].start()
+            in_flight.append(job)
+
+        # Fragments in flight, in playlist order. At most max_workers fragments
+        # are downloaded at once, finished ones are written as soon as all
+        # their predecessors have been.
+        in_flight = collections.deque()
+        success = True
+        try:
+            for fragment in fragments:
+                submit_job(fragment)
+                if len(in_flight) < max_workers:
+                    continue
+                job = in_flight.popleft()
+                job['thread'].join()
+                if 'exc_info' in job:
+                    raise job['exc_info'][1]
+                if not append_fragment(job['fragment'], job['result']):
+                    success = False
+                    break
+            while success and in_flight:
+                job = in_flight.popleft()
+                job['thread'].join()
+                if 'exc_info' in job:
+                    raise job['exc_info'][1]
+                success = append_fragment(job['fragment'], job['result'])
+        finally:
+            # Let the remaining workers finish so that no thread is left
+            # running behind our back
+            for job in in_flight:
+                job['thread'].join()
+        return success
+
     def _finish_frag_download(self, ctx):
-        ctx['dest_stream'].close()
+        """Returns True on success and False otherwise."""
+        if 'remuxer' in ctx:
+            retval = ctx['remuxer'].finish()
+            if retval != 0:
+                self.report_error('ffmpeg exited with code %d' % retval)
+                return False
+        elif self._output_stream is None:
+            ctx['dest_stream'].close()
         elapsed = time.time() - ctx['started']
-        self.try_rename(ctx['tmpfilename'], ctx['filename'])
-        fsize = os.path.getsize(encodeFilename(ctx['filename']))
+        if self._output_stream is None:
+            self.try_rename(ctx['tmpfilename'], ctx['filename'])
+            fsize = os.path.getsize(encodeFilename(ctx['filename']))
+        else:
+            fsize = ctx['resume_len']
 
         self._hook_progress({
             'downloaded_bytes': fsize,
@@ -137,3 +510,9 @@ class FragmentFD(FileDownloader):
             'status': 'finished',
             'elapsed': elapsed,
         })
+
+        if self._do_ytdl_file(ctx):
+            ytdl_filename = encodeFilename(self.ytdl_filename(ctx['filename']))
+            if os.path.isfile(ytdl_filename):
+                os.remove(ytdl_filename)
+        return True
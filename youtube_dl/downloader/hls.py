@@ -1,26 +1,26 @@
 from __future__ import unicode_literals
 
-import os.path
 import re
-import binascii
+import socket
+import time
 try:
     from Crypto.Cipher import AES
-    can_decrypt_frag = True
 except ImportError:
-    can_decrypt_frag = False
+    AES = None
 
 from .fragment import FragmentFD
 from .external import FFmpegFD
 
+from ..aes import aes_cbc_decrypt_bytes
 from ..compat import (
+    compat_http_client,
     compat_urllib_error,
     compat_urlparse,
     compat_struct_pack,
 )
+from ..m3u8 import parse_m3u8
 from ..utils import (
-    encodeFilename,
-    sanitize_open,
-    parse_m3u8_attributes,
+    error_to_compat_str,
     update_url_query,
 )
 
@@ -30,11 +30,34 @@ class HlsFD(FragmentFD):
 
     FD_NAME = 'hlsnative'
 
+    # Same as FFmpegFixupM3u8PP
+    _REMUX_OPTIONS = ['-f', 'mp4', '-bsf:a', 'aac_adtstoasc']
+
+    @classmethod
+    def get_remux_options(cls, info_dict, params):
+        # Like FFmpegFixupM3u8PP, only AAC audio has to be fixed up, ffmpeg
+        # rejects the filter for the other codecs. When the codec isn't known
+        # the download is written as is and fixed up afterwards.
+        acodec = (info_dict.get('acodec') or '').lower()
+        if not re.match(r'^(?:aac|mp4a\.40(?:\.\d+)?|mp4a\.6[678])$', acodec):
+            return None
+        return super(HlsFD, cls).get_remux_options(info_dict, params)
+
+    # Number of fragments before the end of a live playlist to start at, the
+    # same as ffmpeg
+    _LIVE_START_FRAGMENTS = 3
+
+    # Number of playlist reloads without any new fragment after which a live
+    # stream is assumed to have ended
+    _LIVE_MAX_STALE_RELOADS = 10
+
+    # Maximum size of the adjacent byte ranges fetched with a single request
+    _MAX_COALESCED_RANGE_SIZE = 10 * 1024 * 1024
+
     @staticmethod
     def can_download(manifest, info_dict):
         UNSUPPORTED_FEATURES = (
             r'#EXT-X-KEY:METHOD=(?!NONE|AES-128)',  # encrypted streams [1]
-            r'#EXT-X-BYTERANGE',  # playlists composed of byte ranges of media files [2]
 
             # Live streams heuristic does not always work (e.g. geo restricted to Germany
             # http://hls-geo.daserste.de/i/videoportal/Film/c_620000/622873/format,716451,716457,716450,716458,716459,.mp4.csmil/index_4_av.m3u8?null=0)
@@ -47,21 +70,15 @@ class HlsFD(FragmentFD):
             #                                 # event media playlists [4]
 
             # 1. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.2.4
-            # 2. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.2.2
             # 3. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.3.2
             # 4. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.3.5
         )
         check_results = [not re.search(feature, manifest) for feature in UNSUPPORTED_FEATURES]
-        check_results.append(can_decrypt_frag or '#EXT-X-KEY:METHOD=AES-128' not in manifest)
-        check_results.append(not info_dict.get('is_live'))
         return all(check_results)
 
     def real_download(self, filename, info_dict):
         man_url = info_dict['url']
-        self.to_screen('[%s] Downloading m3u8 manifest' % self.FD_NAME)
-        manifest = self.ydl.urlopen(man_url).read()
-
-        s = manifest.decode('utf-8', 'ignore')
+        _, s = self._get_manifest(info_dict, 'm3u8')
 
         if not self.can_download(s, info_dict):
             self.report_warning(
@@ -72,98 +89,171 @@ class HlsFD(FragmentFD):
                 fd.add_progress_hook(ph)
             return fd.real_download(filename, info_dict)
 
-        total_frags = 0
-        for line in s.splitlines():
-            line = line.strip()
-            if line and not line.startswith('#'):
-                total_frags += 1
+        test = self.params.get('test', False)
+
+        # Segments keep being appended to live playlists until they end with
+        # EXT-X-ENDLIST [1]
+        # 1. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-6.3.4
+        m3u8_playlist = parse_m3u8(s, man_url)
+        live = bool(info_dict.get('is_live')) and not m3u8_playlist.ended and not test
+
+        extra_query = None
+        extra_param_to_segment_url = info_dict.get('extra_param_to_segment_url')
+        if extra_param_to_segment_url:
+            extra_query = compat_urlparse.parse_qs(extra_param_to_segment_url)
+
+        def playlist_fragments(playlist):
+            for segment in playlist.segments:
+                frag_url = segment.uri
+                if extra_query:
+                    frag_url = update_url_query(frag_url, extra_query)
+                fragment = {
+                    'url': frag_url,
+                    'media_sequence': segment.media_sequence,
+                    'key': segment.key,
+                }
+                if segment.byte_range:
+                    fragment['byte_range'] = {
+                        'start': segment.byte_range[0],
+                        'end': segment.byte_range[1],
+                    }
+                yield fragment
+
+        def coalesce_fragments(fragments):
+            # Fetch the adjacent byte ranges of the same resource at once, the
+            # parts are split again when written
+            coalesced = []
+            for fragment in fragments:
+                last = coalesced[-1] if coalesced else None
+                byte_range = fragment.get('byte_range')
+                if (byte_range and last and last.get('byte_range') and
+                        last['url'] == fragment['url'] and
+                        last['byte_range']['end'] + 1 == byte_range['start'] and
+                        byte_range['end'] + 1 - last['byte_range']['start'] <= self._MAX_COALESCED_RANGE_SIZE):
+                    if 'parts' not in last:
+                        last = coalesced[-1] = {
+                            'url': last['url'],
+                            'byte_range': dict(last['byte_range']),
+                            'parts': [last],
+                        }
+                    last['byte_range']['end'] = byte_range['end']
+                    last['parts'].append(fragment)
+                    last['media_sequence'] = fragment['media_sequence']
+                else:
+                    coalesced.append(fragment)
+            return coalesced
+
+        total_frags = None
+        if not live:
+            total_frags = len(
+                m3u8_playlist.segments if test
+                else coalesce_fragments(playlist_fragments(m3u8_playlist)))
 
         ctx = {
             'filename': filename,
             'total_frags': total_frags,
+            'live': live,
+            'remux_options': self.get_remux_options(info_dict, self.params),
         }
 
         self._prepare_and_start_frag_download(ctx)
 
-        fragment_retries = self.params.get('fragment_retries', 0)
-        skip_unavailable_fragments = self.params.get('skip_unavailable_fragments', True)
-        test = self.params.get('test', False)
-
-        extra_query = None
-        extra_param_to_segment_url = info_dict.get('extra_param_to_segment_url')
-        if extra_param_to_segment_url:
-            extra_query = compat_urlparse.parse_qs(extra_param_to_segment_url)
-        i = 0
-        media_sequence = 0
-        decrypt_info = {'METHOD': 'NONE'}
-        frags_filenames = []
-        for line in s.splitlines():
-            line = line.strip()
-            if line:
-                if not line.startswith('#'):
-                    frag_url = (
-                        line
-                        if re.match(r'^https?://', line)
-                        else compat_urlparse.urljoin(man_url, line))
-                    frag_name = 'Frag%d' % i
-                    frag_filename = '%s-%s' % (ctx['tmpfilename'], frag_name)
-                    if extra_query:
-                        frag_url = update_url_query(frag_url, extra_query)
-                    count = 0
-                    while count <= fragment_retries:
-                        try:
-                            success = ctx['dl'].download(frag_filename, {'url': frag_url})
-                            if not success:
-                                return False
-                            down, frag_sanitized = sanitize_open(frag_filename, 'rb')
-                            frag_content = down.read()
-                            down.close()
-                            break
-                        except compat_urllib_error.HTTPError as err:
-                            # Unavailable (possibly temporary) fragments may be served.
-                            # First we try to retry then either skip or abort.
-                            # See https://github.com/rg3/youtube-dl/issues/10165,
-                            # https://github.com/rg3/youtube-dl/issues/10448).
-                            count += 1
-                            if count <= fragment_retries:
-                                self.report_retry_fragment(err, frag_name, count, fragment_retries)
-                    if count > fragment_retries:
-                        if skip_unavailable_fragments:
-                            i += 1
-                            media_sequence += 1
-                            self.report_skip_fragment(frag_name)
-                            continue
-                        self.report_error(
-                            'giving up after %s fragment retries' % fragment_retries)
-                        return False
-                    if decrypt_info['METHOD'] == 'AES-128':
-                        iv = decrypt_info.get('IV') or compat_struct_pack('>8xq', media_sequence)
-                        frag_content = AES.new(
-                            decrypt_info['KEY'], AES.MODE_CBC, iv).decrypt(frag_content)
-                    ctx['dest_stream'].write(frag_content)
-                    frags_filenames.append(frag_sanitized)
+        def fragments():
+            i = 0
+            playlist = m3u8_playlist
+            last_media_sequence = None
+            playlist_media_sequence = playlist.media_sequence
+            # Only the last key is kept, they are seldom rotated
+            last_key = (None, None)
+            stale_reloads = 0
+            loaded = time.time()
+            while True:
+                # Media sequence numbers never go backwards [1], unless the
+                # stream has been restarted and numbered from scratch
+                # 1. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-6.2.1
+                restarted = (
+                    last_media_sequence is not None and playlist.segments and (
+                        playlist.media_sequence < playlist_media_sequence or
+                        playlist.segments[-1].media_sequence < last_media_sequence))
+                if restarted:
+                    self.report_warning(
+                        'The media sequence of the playlist went backwards, '
+                        'assuming the live stream has restarted')
+                playlist_media_sequence = playlist.media_sequence
+                new_fragments = [
+                    fragment for fragment in playlist_fragments(playlist)
+                    if restarted or last_media_sequence is None or
+                    fragment['media_sequence'] > last_media_sequence]
+                if live and last_media_sequence is None:
+                    new_fragments = new_fragments[-self._LIVE_START_FRAGMENTS:]
+                elif new_fragments and last_media_sequence is not None and not restarted:
+                    missed = new_fragments[0]['media_sequence'] - last_media_sequence - 1
+                    if missed > 0:
+                        self.report_warning('Missed %d fragments' % missed)
+                if not test:
+                    new_fragments = coalesce_fragments(new_fragments)
+                for fragment in new_fragments:
+                    for part in fragment.get('parts', [fragment]):
+                        key = part['key']
+                        if key and key.method == 'AES-128':
+                            key_url = key.uri
+                            if extra_query:
+                                key_url = update_url_query(key_url, extra_query)
+                            if last_key[0] != key_url:
+                                last_key = (key_url, self.ydl.urlopen(key_url).read())
+                            part['key_data'] = last_key[1]
+                    fragment['frag_index'] = i
+                    yield fragment
                     # We only download the first fragment during the test
                     if test:
-                        break
+                        return
                     i += 1
-                    media_sequence += 1
-                elif line.startswith('#EXT-X-KEY'):
-                    decrypt_info = parse_m3u8_attributes(line[11:])
-                    if decrypt_info['METHOD'] == 'AES-128':
-                        if 'IV' in decrypt_info:
-                            decrypt_info['IV'] = binascii.unhexlify(decrypt_info['IV'][2:].zfill(32))
-                        if not re.match(r'^https?://', decrypt_info['URI']):
-                            decrypt_info['URI'] = compat_urlparse.urljoin(
-                                man_url, decrypt_info['URI'])
-                        if extra_query:
-                            decrypt_info['URI'] = update_url_query(decrypt_info['URI'], extra_query)
-                        decrypt_info['KEY'] = self.ydl.urlopen(decrypt_info['URI']).read()
-                elif line.startswith('#EXT-X-MEDIA-SEQUENCE'):
-                    media_sequence = int(line[22:])
-
-        self._finish_frag_download(ctx)
-
-        for frag_file in frags_filenames:
-            os.remove(encodeFilename(frag_file))
-
-        return True
+                    last_media_sequence = fragment['media_sequence']
+
+                if not live or playlist.ended:
+                    return
+                if new_fragments:
+                    stale_reloads = 0
+                else:
+                    stale_reloads += 1
+                    if stale_reloads > self._LIVE_MAX_STALE_RELOADS:
+                        self.report_warning(
+                            'No new fragment has been added to the playlist for a while, '
+                            'assuming the live stream has ended')
+                        return
+                # Wait for the target duration before reloading a playlist
+                # that has changed, half of it otherwise [1]
+                # 1. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-6.3.4
+                target_duration = playlist.target_duration or 10
+                delay = target_duration if new_fragments else target_duration / 2.0
+                time.sleep(max(loaded + delay - time.time(), 0))
+                loaded = time.time()
+                try:
+                    playlist = parse_m3u8(
+                        self.ydl.urlopen(man_url).read().decode('utf-8', 'ignore'), man_url)
+                except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as err:
+                    self.report_warning(
+                        'Unable to reload the playlist: %s' % error_to_compat_str(err))
+
+        def decrypt_fragment(frag_content, fragment):
+            if 'parts' in fragment:
+                start = fragment['byte_range']['start']
+                return b''.join(
+                    decrypt_fragment(
+                        frag_content[part['byte_range']['start'] - start:part['byte_range']['end'] + 1 - start],
+                        part)
+                    for part in fragment['parts'])
+            key = fragment['key']
+            if key and key.method == 'AES-128':
+                iv = key.iv or compat_struct_pack('>8xq', fragment['media_sequence'])
+                if AES:
+                    frag_content = AES.new(
+                        fragment['key_data'], AES.MODE_CBC, iv).decrypt(frag_content)
+                else:
+                    frag_content = aes_cbc_decrypt_bytes(frag_content, fragment['key_data'], iv)
+            return frag_content
+
+        if not self._download_fragments(ctx, fragments(), decrypt_fragment):
+            return False
+
+        return self._finish_frag_download(ctx)
@@ -1,8 +1,11 @@
 from __future__ import unicode_literals
 
 import errno
+import json
 import os
 import socket
+import sys
+import threading
 import time
 import re
 
@@ -11,6 +14,7 @@ from ..compat import compat_urllib_error
 from ..utils import (
     ContentTooShortError,
     encodeFilename,
+    format_bytes,
     sanitize_open,
     sanitized_Request,
     write_xattr,
@@ -20,6 +24,224 @@ from ..utils import (
 
 
 class HttpFD(FileDownloader):
+    """
+    Available options:
+
+    http_connections:   Number of connections to download a file with, each
+                        one fetching a byte range of it, if the server
+                        supports range requests (default is 1).
+
+    The progress of every range of an unfinished multi-connection download is
+    recorded in a '<filename>.ytdl' file, so that it can be resumed when
+    continuedl is set.
+    """
+
+    # Files are not split into ranges smaller than this
+    _MIN_RANGE_SIZE = 1024 * 1024
+
+    def _open_stream(self, tmpfilename, open_mode):
+        return sanitize_open(tmpfilename, open_mode)
+
+    def _read_ranges_state(self, filename, tmpfilename):
+        try:
+            with open(encodeFilename(self.ytdl_filename(filename)), 'rb') as f:
+                state = json.loads(f.read().decode('utf-8'))['downloader']['http_ranges']
+            size = int(state['size'])
+            ranges = [[int(start), int(end), int(done)] for start, end, done in state['ranges']]
+        except (IOError, OSError, ValueError, KeyError, TypeError):
+            return None
+        if (os.path.getsize(encodeFilename(tmpfilename)) != size or
+                not all(0 <= done <= end - start + 1 for start, end, done in ranges)):
+            return None
+        return {'size': size, 'ranges': ranges}
+
+    def _write_ranges_state(self, filename, state):
+        with open(encodeFilename(self.ytdl_filename(filename)), 'wb') as f:
+            f.write(json.dumps({'downloader': {'http_ranges': state}}).encode('utf-8'))
+
+    def _download_ranges(self, filename, tmpfilename, info_dict, headers):
+        """
+        Download the file in byte ranges over several connections at once.
+
+        Returns None if the file can't be downloaded that way, it has to be
+        downloaded with a single connection then.
+        """
+        url = info_dict['url']
+        ytdl_filename = encodeFilename(self.ytdl_filename(filename))
+
+        state = None
+        if os.path.isfile(encodeFilename(tmpfilename)) and self.params.get('continuedl', True):
+            if not os.path.isfile(ytdl_filename):
+                # Left over by a single connection download, resume that
+                return None
+            state = self._read_ranges_state(filename, tmpfilename)
+            if state is None:
+                self.report_warning('.ytdl file is corrupt. Restarting from the beginning...')
+
+        # Find out whether the server supports range requests and the size of
+        # the file
+        request = sanitized_Request(url, None, headers)
+        request.add_header('Range', 'bytes=0-0')
+        try:
+            probe = self.ydl.urlopen(request)
+            mobj = re.match(r'bytes 0-0/(\d+)$', probe.headers.get('Content-Range') or '')
+            if mobj:
+                probe.read()
+            probe.close()
+        except (compat_urllib_error.HTTPError, socket.error):
+            return None
+        if not mobj:
+            return None
+        size = int(mobj.group(1))
+        num_ranges = min(self.params.get('http_connections'), size // self._MIN_RANGE_SIZE)
+        min_data_len = self.params.get('min_filesize')
+        max_data_len = self.params.get('max_filesize')
+        if (num_ranges < 2 or (min_data_len is not None and size < min_data_len) or
+                (max_data_len is not None and size > max_data_len)):
+            return None
+
+        if state is not None and state['size'] != size:
+            self.report_unable_to_resume()
+            state = None
+        if state is None:
+            bounds = [size * i // num_ranges for i in range(num_ranges + 1)]
+            state = {
+                'size': size,
+                'ranges': [[bounds[i], bounds[i + 1] - 1, 0] for i in range(num_ranges)],
+            }
+            try:
+                with open(encodeFilename(tmpfilename), 'wb') as f:
+                    f.truncate(size)
+                self._write_ranges_state(filename, state)
+            except (IOError, OSError) as err:
+                self.report_error('unable to open for writing: %s' % str(err))
+                return False
+        resume_len = sum(done for _, _, done in state['ranges'])
+        if resume_len:
+            self.to_screen('[download] Resuming download at %s of %s' % (
+                format_bytes(resume_len), format_bytes(size)))
+        self.report_destination(filename)
+        self.to_screen('[download] Downloading in %d byte ranges at once' % len(state['ranges']))
+
+        if self.params.get('xattr_set_filesize', False):
+            try:
+                write_xattr(tmpfilename, 'user.ytdl.filesize', str(size).encode('utf-8'))
+            except (XAttrUnavailableError, XAttrMetadataError) as err:
+                self.report_error('unable to set filesize xattr: %s' % str(err))
+
+        lock = threading.Lock()
+        ctx = {
+            'byte_counter': resume_len,
+            'start': time.time(),
+            'state_written': time.time(),
+        }
+
+        def report_block(rng, block_len):
+            with lock:
+                rng[2] += block_len
+                ctx['byte_counter'] += block_len
+                now = time.time()
+                downloaded = ctx['byte_counter'] - resume_len
+                self._hook_progress({
+                    'status': 'downloading',
+                    'downloaded_bytes': ctx['byte_counter'],
+                    'total_bytes': size,
+                    'tmpfilename': tmpfilename,
+                    'filename': filename,
+                    'eta': self.calc_eta(ctx['start'], now, size - resume_len, downloaded),
+                    'speed': self.calc_speed(ctx['start'], now, downloaded),
+                    'elapsed': now - ctx['start'],
+                })
+                if now - ctx['state_written'] >= 1:
+                    self._write_ranges_state(filename, state)
+                    ctx['state_written'] = now
+            self.slow_down(ctx['start'], now, downloaded)
+
+        def download_range(rng):
+            start, end = rng[0], rng[1]
+            count = 0
+            retries = self.params.get('retries', 0)
+            block_size = self.params.get('buffersize', 1024)
+            with open(encodeFilename(tmpfilename), 'r+b') as stream:
+                while start + rng[2] <= end:
+                    offset = start + rng[2]
+                    request = sanitized_Request(url, None, headers)
+                    request.add_header('Range', 'bytes=%d-%d' % (offset, end))
+                    try:
+                        data = self.ydl.urlopen(request)
+                        if not (data.headers.get('Content-Range') or '').startswith('bytes %d-' % offset):
+                            self.report_error('server did not honour the requested byte range')
+                            return False
+                        stream.seek(offset)
+                        before = time.time()
+                        while start + rng[2] <= end:
+                            data_block = data.read(min(block_size, end - start - rng[2] + 1))
+                            if not data_block:
+                                break
+                            stream.write(data_block)
+                            # The data has to be on disk before the .ytdl file says so
+                            stream.flush()
+                            after = time.time()
+                            if not self.params.get('noresizebuffer', False):
+                                block_size = self.best_block_size(after - before, len(data_block))
+                            before = after
+                            report_block(rng, len(data_block))
+                        data.close()
+                        if start + rng[2] > end:
+                            continue
+                        error = ContentTooShortError(rng[2], end - start + 1)
+                    except (compat_urllib_error.HTTPError, ) as err:
+                        if err.code < 500 or err.code >= 600:
+                            raise
+                        error = err
+                    except socket.error as err:
+                        error = err
+                    count += 1
+                    if count > retries:
+                        raise error
+                    self.report_retry(count, retries)
+            return True
+
+        def run_job(job):
+            try:
+                job['result'] = download_range(job['range'])
+            except Exception:
+                job['exc_info'] = sys.exc_info()
+
+        jobs = []
+        for rng in state['ranges']:
+            if rng[0] + rng[2] > rng[1]:
+                continue
+            job = {'range': rng}
+            job['thread'] = threading.Thread(target=run_job, args=(job,))
+            job['thread'].daemon = True
+            job['thread'].start()
+            jobs.append(job)
+        try:
+            for job in jobs:
+                job['thread'].join()
+        finally:
+            with lock:
+                self._write_ranges_state(filename, state)
+        for job in jobs:
+            if 'exc_info' in job:
+                raise job['exc_info'][1]
+        if not all(job['result'] for job in jobs):
+            return False
+
+        os.remove(ytdl_filename)
+        self.try_rename(tmpfilename, filename)
+        if self.params.get('updatetime', True):
+            info_dict['filetime'] = self.try_utime(filename, probe.headers.get('last-modified', None))
+        self._hook_progress({
+            'downloaded_bytes': size,
+            'total_bytes': size,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': time.time() - ctx['start'],
+        })
+        return True
+
     def real_download(self, filename, info_dict):
         url = info_dict['url']
         tmpfilename = self.temp_name(filename)
@@ -37,6 +259,10 @@ class HttpFD(FileDownloader):
 
         if is_test:
             request.add_header('Range', 'bytes=0-%s' % str(self._TEST_FILE_SIZE - 1))
+        elif (self.params.get('http_connections') or 1) > 1 and tmpfilename != '-':
+            result = self._download_ranges(filename, tmpfilename, info_dict, headers)
+            if result is not None:
+                return result
 
         # Establish possible resume length
         if os.path.isfile(encodeFilename(tmpfilename)):
@@ -172,7 +398,7 @@ class HttpFD(FileDownloader):
             # Open destination file just in time
             if stream is None:
                 try:
-                    (stream, tmpfilename) = sanitize_open(tmpfilename, open_mode)
+                    (stream, tmpfilename) = self._open_stream(tmpfilename, open_mode)
                     assert stream is not None
                     filename = self.undo_temp_name(tmpfilename)
                     self.report_destination(filename)
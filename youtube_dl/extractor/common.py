@@ -26,6 +26,7 @@ from ..compat import (
     compat_urlparse,
 )
 from ..downloader.f4m import remove_encrypted_media
+from ..m3u8 import parse_m3u8
 from ..utils import (
     NO_DEFAULT,
     age_restricted,
@@ -54,7 +55,6 @@ from ..utils import (
     mimetype2ext,
     update_Request,
     update_url_query,
-    parse_m3u8_attributes,
     extract_attributes,
     parse_codecs,
 )
@@ -123,6 +123,32 @@ class InfoExtractor(object):
                                  * "url" (mandatory) - fragment's URL
                                  * "duration" (optional, int or float)
                                  * "filesize" (optional, int)
+                    * fragment_template
+                                 Compact description of the fragments of
+                                 DASH media with a SegmentTemplate, used
+                                 instead of fragments and expanded when
+                                 downloading (fragments is still included
+                                 in the JSON output, and
+                                 YoutubeDL.expand_fragments lists them for
+                                 other uses). A dictionary with the
+                                 following entries:
+                                 * "media_template" - %-format string of the
+                                   fragments' URLs, with the Number, Time and
+                                   Bandwidth keys
+                                 * "initialization_url" (optional) - URL of
+                                   the first fragment
+                                 * "start_number" - Number of the first
+                                   media fragment
+                                 * "timescale" - Units per second of the
+                                   times and durations
+                                 * "bandwidth" (optional, int)
+                                 * "timeline" (optional) - list of
+                                   [start time, duration, repeat count] runs
+                                   (SegmentTimeline S elements, a start time
+                                   of 0 continues the previous run)
+                                 * "total_number", "segment_duration" - number
+                                   and duration in seconds of the fragments
+                                   without timeline
                     * preference Order number of this format. If this field is
                                  present and not None, the formats get sorted
                                  by this field, regardless of all other values.
@@ -1050,27 +1076,54 @@ class InfoExtractor(object):
         self.to_screen(msg)
         time.sleep(timeout)
 
+    # Number of seconds during which a manifest downloaded during the
+    # extraction is used by the downloader, at most
+    _MANIFEST_REUSE_TTL = 600
+
+    def _downloaded_manifest(self, content, urlh):
+        """
+        Return the manifest content downloaded with urlh as expected by
+        YoutubeDL.add_downloaded_manifest, None if it should not be reused.
+        """
+        ttl = self._MANIFEST_REUSE_TTL
+        cache_control = urlh.headers.get('Cache-Control') or ''
+        if re.search(r'\bno-(?:cache|store)\b', cache_control):
+            return None
+        mobj = re.search(r'\bmax-age=(\d+)', cache_control)
+        if mobj:
+            ttl = min(ttl, int(mobj.group(1)))
+        if not ttl:
+            return None
+        return {
+            'url': urlh.geturl(),
+            'content': content,
+            'expires': time.time() + ttl,
+        }
+
     def _extract_f4m_formats(self, manifest_url, video_id, preference=None, f4m_id=None,
                              transform_source=lambda s: fix_xml_ampersands(s).strip(),
                              fatal=True, m3u8_id=None):
-        manifest = self._download_xml(
+        res = self._download_webpage_handle(
             manifest_url, video_id, 'Downloading f4m manifest',
-            'Unable to download f4m manifest',
-            # Some manifests may be malformed, e.g. prosiebensat1 generated manifests
-            # (see https://github.com/rg3/youtube-dl/issues/6215#issuecomment-121704244)
-            transform_source=transform_source,
-            fatal=fatal)
+            'Unable to download f4m manifest', fatal=fatal)
 
-        if manifest is False:
+        if res is False:
             return []
 
+        content, urlh = res
+        # Some manifests may be malformed, e.g. prosiebensat1 generated manifests
+        # (see https://github.com/rg3/youtube-dl/issues/6215#issuecomment-121704244)
+        manifest = compat_etree_fromstring(
+            (transform_source(content) if transform_source else content).encode('utf-8'))
+
         return self._parse_f4m_formats(
             manifest, manifest_url, video_id, preference=preference, f4m_id=f4m_id,
-            transform_source=transform_source, fatal=fatal, m3u8_id=m3u8_id)
+            transform_source=transform_source, fatal=fatal, m3u8_id=m3u8_id,
+            downloaded_manifest=self._downloaded_manifest(content, urlh))
 
     def _parse_f4m_formats(self, manifest, manifest_url, video_id, preference=None, f4m_id=None,
                            transform_source=lambda s: fix_xml_ampersands(s).strip(),
-                           fatal=True, m3u8_id=None):
+                           fatal=True, m3u8_id=None, downloaded_manifest=None):
         # currently youtube-dl cannot decode the playerVerificationChallenge as Akamai uses Adobe Alchemy
         akamai_pv = manifest.find('{http://ns.adobe.com/f4m/1.0}pv-2.0')
         if akamai_pv is not None and ';' in akamai_pv.text:
@@ -1147,7 +1200,7 @@ class InfoExtractor(object):
                         manifest_url, video_id, 'mp4', preference=preference,
                         m3u8_id=m3u8_id, fatal=fatal))
                     continue
-            formats.append({
+            f = {
                 'format_id': format_id,
                 'url': manifest_url,
                 'manifest_url': manifest_url,
@@ -1156,7 +1209,11 @@ class InfoExtractor(object):
                 'width': width,
                 'height': height,
                 'preference': preference,
-            })
+            }
+            # The downloader only needs stream-level manifests
+            if bootstrap_info is not None and downloaded_manifest:
+                self._downloader.add_downloaded_manifest(f['url'], downloaded_manifest)
+            formats.append(f)
         return formats
 
     def _m3u8_meta_format(self, m3u8_url, ext=None, preference=None, m3u8_id=None):
@@ -1187,11 +1244,6 @@ class InfoExtractor(object):
 
         formats = [self._m3u8_meta_format(m3u8_url, ext, preference, m3u8_id)]
 
-        format_url = lambda u: (
-            u
-            if re.match(r'^https?://', u)
-            else compat_urlparse.urljoin(m3u8_url, u))
-
         # We should try extracting formats only from master playlists [1], i.e.
         # playlists that describe available qualities. On the other hand media
         # playlists [2] should be returned as is since they contain just the media
@@ -1200,92 +1252,87 @@ class InfoExtractor(object):
         # playlist based on particular tags availability. As of [1, 2] master
         # playlist tags MUST NOT appear in a media playist and vice versa.
         # As of [3] #EXT-X-TARGETDURATION tag is REQUIRED for every media playlist
-        # and MUST NOT appear in master playlist thus we can clearly detect media
-        # playlist with this criterion.
+        # but it is missing from some of them, so media playlists are detected
+        # by the lack of the #EXT-X-STREAM-INF and #EXT-X-MEDIA master playlist
+        # tags instead, see parse_m3u8.
         # 1. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.4
         # 2. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.3
         # 3. https://tools.ietf.org/html/draft-pantos-http-live-streaming-17#section-4.3.3.1
-        if '#EXT-X-TARGETDURATION' in m3u8_doc:  # media playlist, return as is
-            return [{
+        playlist = parse_m3u8(m3u8_doc, m3u8_url)
+        is_media = not playlist.is_master and (
+            '#EXT-X-TARGETDURATION' in m3u8_doc or '#EXTINF' in m3u8_doc)
+        if is_media:  # media playlist, return as is
+            f = {
                 'url': m3u8_url,
                 'format_id': m3u8_id,
                 'ext': ext,
                 'protocol': entry_protocol,
                 'preference': preference,
-            }]
-        last_info = {}
-        last_media = {}
-        for line in m3u8_doc.splitlines():
-            if line.startswith('#EXT-X-STREAM-INF:'):
-                last_info = parse_m3u8_attributes(line)
-            elif line.startswith('#EXT-X-MEDIA:'):
-                media = parse_m3u8_attributes(line)
-                media_type = media.get('TYPE')
-                if media_type in ('VIDEO', 'AUDIO'):
-                    media_url = media.get('URI')
-                    if media_url:
-                        format_id = []
-                        for v in (media.get('GROUP-ID'), media.get('NAME')):
-                            if v:
-                                format_id.append(v)
-                        formats.append({
-                            'format_id': '-'.join(format_id),
-                            'url': format_url(media_url),
-                            'language': media.get('LANGUAGE'),
-                            'vcodec': 'none' if media_type == 'AUDIO' else None,
-                            'ext': ext,
-                            'protocol': entry_protocol,
-                            'preference': preference,
-                        })
-                    else:
-                        # When there is no URI in EXT-X-MEDIA let this tag's
-                        # data be used by regular URI lines below
-                        last_media = media
-            elif line.startswith('#') or not line.strip():
-                continue
-            else:
-                tbr = int_or_none(last_info.get('AVERAGE-BANDWIDTH') or last_info.get('BANDWIDTH'), scale=1000)
+            }
+            # Live playlists keep changing
+            downloaded_manifest = self._downloaded_manifest(m3u8_doc, urlh)
+            if playlist.ended and downloaded_manifest:
+                self._downloader.add_downloaded_manifest(f['url'], downloaded_manifest)
+            return [f]
+        for variant in playlist.variants:
+            media = variant.media
+            if variant.stream_info is None:
+                # Alternative rendition
                 format_id = []
-                if m3u8_id:
-                    format_id.append(m3u8_id)
-                # Despite specification does not mention NAME attribute for
-                # EXT-X-STREAM-INF it still sometimes may be present
-                stream_name = last_info.get('NAME') or last_media.get('NAME')
-                # Bandwidth of live streams may differ over time thus making
-                # format_id unpredictable. So it's better to keep provided
-                # format_id intact.
-                if not live:
-                    format_id.append(stream_name if stream_name else '%d' % (tbr if tbr else len(formats)))
-                manifest_url = format_url(line.strip())
-                f = {
+                for v in (media.get('GROUP-ID'), media.get('NAME')):
+                    if v:
+                        format_id.append(v)
+                formats.append({
                     'format_id': '-'.join(format_id),
-                    'url': manifest_url,
-                    'manifest_url': manifest_url,
-                    'tbr': tbr,
+                    'url': variant.uri,
+                    'language': media.get('LANGUAGE'),
+                    'vcodec': 'none' if media['TYPE'] == 'AUDIO' else None,
                     'ext': ext,
-                    'fps': float_or_none(last_info.get('FRAME-RATE')),
                     'protocol': entry_protocol,
                     'preference': preference,
-                }
-                resolution = last_info.get('RESOLUTION')
-                if resolution:
-                    width_str, height_str = resolution.split('x')
-                    f['width'] = int(width_str)
-                    f['height'] = int(height_str)
-                # Unified Streaming Platform
-                mobj = re.search(
-                    r'audio.*?(?:%3D|=)(\d+)(?:-video.*?(?:%3D|=)(\d+))?', f['url'])
-                if mobj:
-                    abr, vbr = mobj.groups()
-                    abr, vbr = float_or_none(abr, 1000), float_or_none(vbr, 1000)
-                    f.update({
-                        'vbr': vbr,
-                        'abr': abr,
-                    })
-                f.update(parse_codecs(last_info.get('CODECS')))
-                formats.append(f)
-                last_info = {}
-                last_media = {}
+                })
+                continue
+            stream_info = variant.stream_info
+            tbr = int_or_none(stream_info.get('AVERAGE-BANDWIDTH') or stream_info.get('BANDWIDTH'), scale=1000)
+            format_id = []
+            if m3u8_id:
+                format_id.append(m3u8_id)
+            # Despite specification does not mention NAME attribute for
+            # EXT-X-STREAM-INF it still sometimes may be present
+            stream_name = stream_info.get('NAME') or media.get('NAME')
+            # Bandwidth of live streams may differ over time thus making
+            # format_id unpredictable. So it's better to keep provided
+            # format_id intact.
+            if not live:
+                format_id.append(stream_name if stream_name else '%d' % (tbr if tbr else len(formats)))
+            manifest_url = variant.uri
+            f = {
+                'format_id': '-'.join(format_id),
+                'url': manifest_url,
+                'manifest_url': manifest_url,
+                'tbr': tbr,
+                'ext': ext,
+                'fps': float_or_none(stream_info.get('FRAME-RATE')),
+                'protocol': entry_protocol,
+                'preference': preference,
+            }
+            resolution = stream_info.get('RESOLUTION')
+            if resolution:
+                width_str, height_str = resolution.split('x')
+                f['width'] = int(width_str)
+                f['height'] = int(height_str)
+            # Unified Streaming Platform
+            mobj = re.search(
+                r'audio.*?(?:%3D|=)(\d+)(?:-video.*?(?:%3D|=)(\d+))?', f['url'])
+            if mobj:
+                abr, vbr = mobj.groups()
+                abr, vbr = float_or_none(abr, 1000), float_or_none(vbr, 1000)
+                f.update({
+                    'vbr': vbr,
+                    'abr': abr,
+                })
+            f.update(parse_codecs(stream_info.get('CODECS')))
+            formats.append(f)
         return formats
 
     @staticmethod
@@ -1674,13 +1721,21 @@ class InfoExtractor(object):
                         }
                         representation_ms_info = extract_multisegment_info(representation, adaption_set_ms_info)
                         if 'segment_urls' not in representation_ms_info and 'media_template' in representation_ms_info:
-
                             media_template = representation_ms_info['media_template']
                             media_template = media_template.replace('$RepresentationID$', representation_id)
                             media_template = re.sub(r'\$(Number|Bandwidth|Time)\$', r'%(\1)d', media_template)
                             media_template = re.sub(r'\$(Number|Bandwidth|Time)%([^$]+)\$', r'%(\1)\2', media_template)
                             media_template.replace('$$', '$')
 
+                            # The fragments are only expanded when downloading, see
+                            # DashSegmentsFD, as there may be a lot of them for every
+                            # representation
+                            fragment_template = {
+                                'media_template': combine_url(base_url.replace('%', '%%'), media_template),
+                                'start_number': representation_ms_info['start_number'],
+                                'timescale': representation_ms_info['timescale'],
+                                'bandwidth': int_or_none(representation_attrib.get('bandwidth')),
+                            }
                             # As per [1, 5.3.9.4.4, Table 16, page 55] $Number$ and $Time$
                             # can't be used at the same time
                             if '%(Number' in media_template and 's' not in representation_ms_info:
@@ -1688,45 +1743,25 @@ class InfoExtractor(object):
                                 if 'total_number' not in representation_ms_info and 'segment_duration':
                                     segment_duration = float_or_none(representation_ms_info['segment_duration'], representation_ms_info['timescale'])
                                     representation_ms_info['total_number'] = int(math.ceil(float(period_duration) / segment_duration))
-                                representation_ms_info['fragments'] = [{
-                                    'url': media_template % {
-                                        'Number': segment_number,
-                                        'Bandwidth': representation_attrib.get('bandwidth'),
-                                    },
-                                    'duration': segment_duration,
-                                } for segment_number in range(
-                                    representation_ms_info['start_number'],
-                                    representation_ms_info['total_number'] + representation_ms_info['start_number'])]
+                                fragment_template.update({
+                                    'total_number': representation_ms_info['total_number'],
+                                    'segment_duration': segment_duration,
+                                })
                             else:
                                 # $Number*$ or $Time$ in media template with S list available
                                 # Example $Number*$: http://www.svtplay.se/klipp/9023742/stopptid-om-bjorn-borg
                                 # Example $Time$: https://play.arkena.com/embed/avp/v2/player/media/b41dda37-d8e7-4d3f-b1b5-9a9db578bdfe/1/129411
-                                representation_ms_info['fragments'] = []
-                                segment_time = 0
-                                segment_d = None
-                                segment_number = representation_ms_info['start_number']
-
-                                def add_segment_url():
-                                    segment_url = media_template % {
-                                        'Time': segment_time,
-                                        'Bandwidth': representation_attrib.get('bandwidth'),
-                                        'Number': segment_number,
-                                    }
-                                    representation_ms_info['fragments'].append({
-                                        'url': segment_url,
-                                        'duration': float_or_none(segment_d, representation_ms_info['timescale']),
-                                    })
-
-                                for num, s in enumerate(representation_ms_info['s']):
-                                    segment_time = s.get('t') or segment_time
-                                    segment_d = s['d']
-                                    add_segment_url()
-                                    segment_number += 1
-                                    for r in range(s.get('r', 0)):
-                                        segment_time += segment_d
-                                        add_segment_url()
-                                        segment_number += 1
-                                    segment_time += segment_d
+                                fragment_template['timeline'] = [
+                                    [s['t'], s['d'], s['r']] for s in representation_ms_info['s']]
+                            if 'initialization_url' in representation_ms_info:
+                                initialization_url = representation_ms_info['initialization_url'].replace('$RepresentationID$', representation_id)
+                                if not f.get('url'):
+                                    f['url'] = initialization_url
+                                fragment_template['initialization_url'] = combine_url(base_url, initialization_url)
+                            f.update({
+                                'fragment_template': fragment_template,
+                                'protocol': 'http_dash_segments',
+                            })
                         elif 'segment_urls' in representation_ms_info and 's' in representation_ms_info:
                             # No media template
                             # Example: https://www.youtube.com/watch?v=iXZV5uAYMJI
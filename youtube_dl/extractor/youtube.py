@@ -865,9 +865,11 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         }
     ]
 
-    def __init__(self, *args, **kwargs):
-        super(YoutubeIE, self).__init__(*args, **kwargs)
-        self._player_cache = {}
+    # Signature functions only depend on the player code, so they are shared
+    # by all instances: (player URL, signature cache id) -> function
+    _player_cache = {}
+    # Player URL -> signature function parsed from its code
+    _player_functions = {}
 
     def report_video_info_webpage_download(self, video_id):
         """Report attempt to download video info webpage."""
@@ -907,26 +909,29 @@ class YoutubeIE(YoutubeBaseInfoExtractor):
         if cache_spec is not None:
             return lambda s: ''.join(s[i] for i in cache_spec)
 
-        download_note = (
-            'Downloading player %s' % player_url
-            if self._downloader.params.get('verbose') else
-            'Downloading %s player %s' % (player_type, player_id)
-        )
-        if player_type == 'js':
-            code = self._download_webpage(
-                player_url, video_id,
-                note=download_note,
-                errnote='Download of %s failed' % player_url)
-            res = self._parse_sig_js(code)
-        elif player_type == 'swf':
-            urlh = self._request_webpage(
-                player_url, video_id,
-                note=download_note,
-                errnote='Download of %s failed' % player_url)
-            code = urlh.read()
-            res = self._parse_sig_swf(code)
-        else:
-            assert False, 'Invalid player type %r' % player_type
+        res = self._player_functions.get(player_url)
+        if res is None:
+            download_note = (
+                'Downloading player %s' % player_url
+                if self._downloader.params.get('verbose') else
+                'Downloading %s player %s' % (player_type, player_id)
+            )
+            if player_type == 'js':
+                code = self._download_webpage(
+                    player_url, video_id,
+                    note=download_note,
+                    errnote='Download of %s failed' % player_url)
+                res = self._parse_sig_js(code)
+            elif player_type == 'swf':
+                urlh = self._request_webpage(
+                    player_url, video_id,
+                    note=download_note,
+                    errnote='Download of %s failed' % player_url)
+                code = urlh.read()
+                res = self._parse_sig_swf(code)
+            else:
+                assert False, 'Invalid player type %r' % player_type
+            self._player_functions[player_url] = res
 
         test_string = ''.join(map(compat_chr, range(len(example_sig))))
         cache_res = res(test_string)
@@ -35,6 +35,19 @@ class JSInterpreter(object):
         self._objects = objects
 
     def interpret_statement(self, stmt, local_vars, allow_recursion=100):
+        func, should_abort = self.compile_statement(stmt, allow_recursion)
+        return func(local_vars), should_abort
+
+    def interpret_expression(self, expr, local_vars, allow_recursion):
+        return self.compile_expression(expr, allow_recursion)(local_vars)
+
+    def compile_statement(self, stmt, allow_recursion=100):
+        """
+        Parse a statement once
+
+        Returns a (func, should_abort) tuple, func evaluates the statement
+        given a dict of local variables.
+        """
         if allow_recursion < 0:
             raise ExtractorError('Recursion limit reached')
 
@@ -52,14 +65,19 @@ class JSInterpreter(object):
                 # Try interpreting it as an expression
                 expr = stmt
 
-        v = self.interpret_expression(expr, local_vars, allow_recursion)
-        return v, should_abort
+        return self.compile_expression(expr, allow_recursion), should_abort
 
-    def interpret_expression(self, expr, local_vars, allow_recursion):
+    def compile_expression(self, expr, allow_recursion):
+        """
+        Parse an expression once
+
+        Returns a function evaluating the expression given a dict of local
+        variables.
+        """
         expr = expr.strip()
 
         if expr == '':  # Empty expression
-            return None
+            return lambda local_vars: None
 
         if expr.startswith('('):
             parens_count = 0
@@ -70,14 +88,13 @@ class JSInterpreter(object):
                     parens_count -= 1
                     if parens_count == 0:
                         sub_expr = expr[1:m.start()]
-                        sub_result = self.interpret_expression(
-                            sub_expr, local_vars, allow_recursion)
                         remaining_expr = expr[m.end():].strip()
                         if not remaining_expr:
-                            return sub_result
-                        else:
-                            expr = json.dumps(sub_result) + remaining_expr
-                        break
+                            return self.compile_expression(sub_expr, allow_recursion)
+                        # The rest of the expression can only be parsed
+                        # once the value in parens is known
+                        return self._compile_parens_expression(
+                            sub_expr, remaining_expr, allow_recursion)
             else:
                 raise ExtractorError('Premature end of parens in %r' % expr)
 
@@ -88,67 +105,124 @@ class JSInterpreter(object):
                 (?P<expr>.*)$''' % (_NAME_RE, re.escape(op)), expr)
             if not m:
                 continue
-            right_val = self.interpret_expression(
-                m.group('expr'), local_vars, allow_recursion - 1)
-
-            if m.groupdict().get('index'):
-                lvar = local_vars[m.group('out')]
-                idx = self.interpret_expression(
-                    m.group('index'), local_vars, allow_recursion)
-                assert isinstance(idx, int)
-                cur = lvar[idx]
-                val = opfunc(cur, right_val)
-                lvar[idx] = val
-                return val
-            else:
-                cur = local_vars.get(m.group('out'))
-                val = opfunc(cur, right_val)
-                local_vars[m.group('out')] = val
-                return val
+            return self._compile_assignment(
+                m.group('out'), m.group('index'), m.group('expr'), opfunc,
+                allow_recursion)
 
         if expr.isdigit():
-            return int(expr)
+            value = int(expr)
+            return lambda local_vars: value
 
         var_m = re.match(
             r'(?!if|return|true|false)(?P<name>%s)$' % _NAME_RE,
             expr)
         if var_m:
-            return local_vars[var_m.group('name')]
+            name = var_m.group('name')
+            return lambda local_vars: local_vars[name]
 
         try:
-            return json.loads(expr)
+            value = json.loads(expr)
         except ValueError:
             pass
+        else:
+            if isinstance(value, (list, dict)):
+                # Every evaluation must yield a new object
+                return lambda local_vars: json.loads(expr)
+            return lambda local_vars: value
 
         m = re.match(
             r'(?P<var>%s)\.(?P<member>[^(]+)(?:\(+(?P<args>[^()]*)\))?$' % _NAME_RE,
             expr)
         if m:
-            variable = m.group('var')
-            member = m.group('member')
-            arg_str = m.group('args')
+            return self._compile_member_expression(
+                m.group('var'), m.group('member'), m.group('args'), allow_recursion)
+
+        m = re.match(
+            r'(?P<in>%s)\[(?P<idx>.+)\]$' % _NAME_RE, expr)
+        if m:
+            name = m.group('in')
+            idx_func = self.compile_expression(m.group('idx'), allow_recursion - 1)
+            return lambda local_vars: local_vars[name][idx_func(local_vars)]
+
+        for op, opfunc in _OPERATORS:
+            m = re.match(r'(?P<x>.+?)%s(?P<y>.+)' % re.escape(op), expr)
+            if not m:
+                continue
+            x_func, abort = self.compile_statement(m.group('x'), allow_recursion - 1)
+            if abort:
+                raise ExtractorError(
+                    'Premature left-side return of %s in %r' % (op, expr))
+            y_func, abort = self.compile_statement(m.group('y'), allow_recursion - 1)
+            if abort:
+                raise ExtractorError(
+                    'Premature right-side return of %s in %r' % (op, expr))
+            return self._compile_operation(opfunc, x_func, y_func)
+
+        m = re.match(
+            r'^(?P<func>%s)\((?P<args>[a-zA-Z0-9_$,]+)\)$' % _NAME_RE, expr)
+        if m:
+            return self._compile_function_call(m.group('func'), m.group('args'))
+
+        raise ExtractorError('Unsupported JS expression %r' % expr)
+
+    def _compile_parens_expression(self, sub_expr, remaining_expr, allow_recursion):
+        sub_func = self.compile_expression(sub_expr, allow_recursion)
 
+        def evaluate(local_vars):
+            return self.interpret_expression(
+                json.dumps(sub_func(local_vars)) + remaining_expr,
+                local_vars, allow_recursion)
+        return evaluate
+
+    def _compile_assignment(self, out, index, right_expr, opfunc, allow_recursion):
+        right_func = self.compile_expression(right_expr, allow_recursion - 1)
+
+        if index:
+            idx_func = self.compile_expression(index, allow_recursion)
+
+            def assign(local_vars):
+                right_val = right_func(local_vars)
+                lvar = local_vars[out]
+                idx = idx_func(local_vars)
+                assert isinstance(idx, int)
+                cur = lvar[idx]
+                val = opfunc(cur, right_val)
+                lvar[idx] = val
+                return val
+        else:
+            def assign(local_vars):
+                right_val = right_func(local_vars)
+                cur = local_vars.get(out)
+                val = opfunc(cur, right_val)
+                local_vars[out] = val
+                return val
+        return assign
+
+    def _compile_member_expression(self, variable, member, arg_str, allow_recursion):
+        def get_object(local_vars):
             if variable in local_vars:
-                obj = local_vars[variable]
-            else:
-                if variable not in self._objects:
-                    self._objects[variable] = self.extract_object(variable)
-                obj = self._objects[variable]
-
-            if arg_str is None:
-                # Member access
-                if member == 'length':
-                    return len(obj)
-                return obj[member]
-
-            assert expr.endswith(')')
-            # Function call
-            if arg_str == '':
-                argvals = tuple()
-            else:
-                argvals = tuple([
-                    self.interpret_expression(v, local_vars, allow_recursion)
-                    for v in arg_str.split(',')])
+                return local_vars[variable]
+            if variable not in self._objects:
+                self._objects[variable] = self.extract_object(variable)
+            return self._objects[variable]
+
+        if arg_str is None:
+            # Member access
+            if member == 'length':
+                return lambda local_vars: len(get_object(local_vars))
+            return lambda local_vars: get_object(local_vars)[member]
+
+        # Function call
+        if arg_str == '':
+            arg_funcs = []
+        else:
+            arg_funcs = [
+                self.compile_expression(v, allow_recursion)
+                for v in arg_str.split(',')]
+
+        def call(local_vars):
+            obj = get_object(local_vars)
+            argvals = tuple([f(local_vars) for f in arg_funcs])
 
             if member == 'split':
                 assert argvals == ('',)
@@ -172,43 +246,23 @@ class JSInterpreter(object):
                 return res
 
             return obj[member](argvals)
+        return call
 
-        m = re.match(
-            r'(?P<in>%s)\[(?P<idx>.+)\]$' % _NAME_RE, expr)
-        if m:
-            val = local_vars[m.group('in')]
-            idx = self.interpret_expression(
-                m.group('idx'), local_vars, allow_recursion - 1)
-            return val[idx]
+    @staticmethod
+    def _compile_operation(opfunc, x_func, y_func):
+        return lambda local_vars: opfunc(x_func(local_vars), y_func(local_vars))
 
-        for op, opfunc in _OPERATORS:
-            m = re.match(r'(?P<x>.+?)%s(?P<y>.+)' % re.escape(op), expr)
-            if not m:
-                continue
-            x, abort = self.interpret_statement(
-                m.group('x'), local_vars, allow_recursion - 1)
-            if abort:
-                raise ExtractorError(
-                    'Premature left-side return of %s in %r' % (op, expr))
-            y, abort = self.interpret_statement(
-                m.group('y'), local_vars, allow_recursion - 1)
-            if abort:
-                raise ExtractorError(
-                    'Premature right-side return of %s in %r' % (op, expr))
-            return opfunc(x, y)
+    def _compile_function_call(self, fname, arg_str):
+        argnames = arg_str.split(',')
 
-        m = re.match(
-            r'^(?P<func>%s)\((?P<args>[a-zA-Z0-9_$,]+)\)$' % _NAME_RE, expr)
-        if m:
-            fname = m.group('func')
+        def call(local_vars):
             argvals = tuple([
                 int(v) if v.isdigit() else local_vars[v]
-                for v in m.group('args').split(',')])
+                for v in argnames])
             if fname not in self._functions:
                 self._functions[fname] = self.extract_function(fname)
             return self._functions[fname](argvals)
-
-        raise ExtractorError('Unsupported JS expression %r' % expr)
+        return call
 
     def extract_object(self, objname):
         obj = {}
@@ -248,11 +302,24 @@ class JSInterpreter(object):
         return f(args)
 
     def build_function(self, argnames, code):
+        statements = [self._compile_lazy_statement(stmt) for stmt in code.split(';')]
+
         def resf(args):
             local_vars = dict(zip(argnames, args))
-            for stmt in code.split(';'):
-                res, abort = self.interpret_statement(stmt, local_vars)
+            for stmt_func, abort in statements:
+                res = stmt_func(local_vars)
                 if abort:
                     break
             return res
         return resf
+
+    def _compile_lazy_statement(self, stmt):
+        # Statements that cannot be parsed only fail when they are reached
+        try:
+            return self.compile_statement(stmt)
+        except ExtractorError as e:
+            error = e
+
+            def raise_error(local_vars):
+                raise error
+            return raise_error, False
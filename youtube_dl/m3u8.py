@@ -0,0 +1,170 @@
+from __future__ import unicode_literals
+
+# References:
+# HTTP Live Streaming https://tools.ietf.org/html/draft-pantos-http-live-streaming-17
+
+import binascii
+import math
+import re
+
+from .compat import compat_urlparse
+from .utils import (
+    float_or_none,
+    parse_m3u8_attributes,
+)
+
+
+class M3U8Key(object):
+    """An EXT-X-KEY, shared by all the segments it applies to"""
+
+    __slots__ = ('method', 'uri', 'iv')
+
+    def __init__(self, method, uri=None, iv=None):
+        self.method = method
+        self.uri = uri
+        # Bytes, None to use the media sequence number of the segment
+        self.iv = iv
+
+
+class M3U8Segment(object):
+    __slots__ = (
+        'uri', 'duration', 'title', 'media_sequence', 'key', 'byte_range',
+        'discontinuity')
+
+    def __init__(self, uri, duration, title, media_sequence, key, byte_range, discontinuity):
+        self.uri = uri
+        self.duration = duration
+        self.title = title
+        self.media_sequence = media_sequence
+        # M3U8Key, None if the segment is not encrypted
+        self.key = key
+        # (first byte, last byte) tuple, None for the whole resource
+        self.byte_range = byte_range
+        # Whether the segment follows an EXT-X-DISCONTINUITY
+        self.discontinuity = discontinuity
+
+
+class M3U8Variant(object):
+    """
+    A rendition listed in a master playlist: a variant stream (stream_info
+    holds its EXT-X-STREAM-INF attributes) or an alternative rendition with
+    a URI (stream_info is None).
+    """
+
+    __slots__ = ('uri', 'stream_info', 'media')
+
+    def __init__(self, uri, stream_info, media):
+        self.uri = uri
+        self.stream_info = stream_info
+        # EXT-X-MEDIA attributes of the rendition, for a variant stream the
+        # ones of the last video or audio EXT-X-MEDIA without URI before it
+        self.media = media
+
+
+class M3U8Playlist(object):
+    __slots__ = (
+        'is_master', 'target_duration', 'media_sequence', 'playlist_type',
+        'ended', 'segments', 'variants')
+
+    def __init__(self, is_master):
+        self.is_master = is_master
+        self.target_duration = None
+        self.media_sequence = 0
+        self.playlist_type = None
+        # Whether the playlist has an EXT-X-ENDLIST, no segment is appended
+        # to it anymore
+        self.ended = False
+        self.segments = []
+        self.variants = []
+
+
+def _resolve_uri(base_url, uri):
+    if not base_url or re.match(r'^https?://', uri):
+        return uri
+    return compat_urlparse.urljoin(base_url, uri)
+
+
+def parse_m3u8(content, base_url=None):
+    """
+    Parse the m3u8 playlist content in a single pass and return an
+    M3U8Playlist. Relative URIs are resolved against base_url.
+    """
+    # EXT-X-STREAM-INF and EXT-X-MEDIA only appear in master playlists
+    # (EXT-X-TARGETDURATION, required in media playlists, is often missing)
+    playlist = M3U8Playlist(
+        '#EXT-X-STREAM-INF' in content or '#EXT-X-MEDIA:' in content)
+    segments = playlist.segments
+    variants = playlist.variants
+
+    media_sequence = 0
+    duration = title = key = byte_range = None
+    discontinuity = False
+    # The sub-range of a segment starts after the one of the previous segment
+    # by default
+    byte_range_end = 0
+    stream_info = media = None
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith('#'):
+            uri = _resolve_uri(base_url, line)
+            if playlist.is_master:
+                variants.append(M3U8Variant(uri, stream_info or {}, media or {}))
+                stream_info = media = None
+                continue
+            segments.append(M3U8Segment(
+                uri, duration, title, media_sequence, key, byte_range, discontinuity))
+            if byte_range:
+                byte_range_end = byte_range[1] + 1
+            media_sequence += 1
+            duration = title = byte_range = None
+            discontinuity = False
+            continue
+        tag, _, value = line.partition(':')
+        if tag == '#EXTINF':
+            duration, _, title = value.partition(',')
+            try:
+                duration = float(duration)
+            except ValueError:
+                duration = None
+            title = title or None
+        elif tag == '#EXT-X-BYTERANGE':
+            length, _, offset = value.partition('@')
+            start = int(offset) if offset else byte_range_end
+            byte_range = (start, start + int(length) - 1)
+        elif tag == '#EXT-X-KEY':
+            attributes = parse_m3u8_attributes(value)
+            method = attributes.get('METHOD')
+            if method == 'NONE':
+                key = None
+            else:
+                iv = attributes.get('IV')
+                key = M3U8Key(
+                    method, _resolve_uri(base_url, attributes['URI']) if 'URI' in attributes else None,
+                    binascii.unhexlify(iv[2:].zfill(32)) if iv else None)
+        elif tag == '#EXT-X-DISCONTINUITY':
+            discontinuity = True
+        elif tag == '#EXT-X-MEDIA-SEQUENCE':
+            media_sequence = playlist.media_sequence = int(value)
+        elif tag == '#EXT-X-TARGETDURATION':
+            # Although it must be an integer, it is often written as a
+            # decimal number
+            target_duration = float_or_none(value)
+            playlist.target_duration = (
+                int(math.ceil(target_duration)) if target_duration else None)
+        elif tag == '#EXT-X-PLAYLIST-TYPE':
+            playlist.playlist_type = value
+        elif tag == '#EXT-X-ENDLIST':
+            playlist.ended = True
+        elif tag == '#EXT-X-STREAM-INF':
+            stream_info = parse_m3u8_attributes(value)
+        elif tag == '#EXT-X-MEDIA':
+            attributes = parse_m3u8_attributes(value)
+            if attributes.get('TYPE') in ('VIDEO', 'AUDIO'):
+                if attributes.get('URI'):
+                    attributes['URI'] = _resolve_uri(base_url, attributes['URI'])
+                    variants.append(M3U8Variant(attributes['URI'], None, attributes))
+                else:
+                    media = attributes
+    return playlist
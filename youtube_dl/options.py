@@ -224,6 +224,10 @@ def parseOpts(overrideArguments=None):
         action='store_const', const='::', dest='source_address',
         help='Make all connections via IPv6 (experimental)',
     )
+    network.add_option(
+        '--no-keep-alive',
+        action='store_true', dest='no_keep_alive', default=False,
+        help='Do not reuse HTTP connections across requests, open a new one every time')
     network.add_option(
         '--geo-verification-proxy',
         dest='geo_verification_proxy', default=None, metavar='URL',
@@ -249,6 +253,14 @@ def parseOpts(overrideArguments=None):
         '--playlist-items',
         dest='playlist_items', metavar='ITEM_SPEC', default=None,
         help='Playlist video items to download. Specify indices of the videos in the playlist separated by commas like: "--playlist-items 1,2,5,8" if you want to download videos indexed 1, 2, 5, 8 in the playlist. You can specify range: "--playlist-items 1-3,7,10-13", it will download the videos at index 1, 2, 3, 7, 10, 11, 12 and 13.')
+    selection.add_option(
+        '--playlist-prefetch',
+        dest='playlist_prefetch', metavar='N', default=1, type=int,
+        help='Number of pages to fetch at the same time for playlists that are retrieved page by page (default is %default)')
+    selection.add_option(
+        '--lazy-playlist',
+        action='store_true', dest='lazy_playlist', default=False,
+        help='Process playlist entries as they are received, instead of collecting the whole playlist first. The number of entries is then unknown, and --playlist-reverse still collects the whole playlist')
     selection.add_option(
         '--match-title',
         dest='matchtitle', metavar='REGEX',
@@ -441,15 +453,39 @@ def parseOpts(overrideArguments=None):
     downloader.add_option(
         '--fragment-retries',
         dest='fragment_retries', metavar='RETRIES', default=10,
-        help='Number of retries for a fragment (default is %default), or "infinite" (DASH and hlsnative only)')
+        help='Number of retries for a fragment (default is %default), or "infinite" (DASH, hlsnative and f4m only)')
     downloader.add_option(
         '--skip-unavailable-fragments',
         action='store_true', dest='skip_unavailable_fragments', default=True,
-        help='Skip unavailable fragments (DASH and hlsnative only)')
+        help='Skip unavailable fragments (DASH, hlsnative and f4m only)')
     general.add_option(
         '--abort-on-unavailable-fragment',
         action='store_false', dest='skip_unavailable_fragments',
         help='Abort downloading when some fragment is not available')
+    downloader.add_option(
+        '--concurrent-fragments',
+        dest='concurrent_fragment_downloads', metavar='N', default=1, type=int,
+        help='Number of fragments to download concurrently (default is %default) (DASH, hlsnative and f4m only)')
+    downloader.add_option(
+        '--concurrent-videos',
+        dest='concurrent_videos', metavar='N', default=1, type=int,
+        help='Number of URLs or playlist entries to extract, download and post-process at the same time (default is %default)')
+    downloader.add_option(
+        '--concurrent-formats',
+        action='store_true', dest='concurrent_formats', default=False,
+        help='Download the formats that are merged (e.g. with -f bestvideo+bestaudio) at the same time')
+    downloader.add_option(
+        '--remux-fragments',
+        action='store_true', dest='remux_fragments', default=False,
+        help='Feed DASH and hlsnative downloads to ffmpeg while they are downloaded, writing the final file in a single pass instead of fixing it up or merging the formats afterwards (requires ffmpeg or avconv). Single formats are only remuxed when they would be fixed up, see --fixup')
+    downloader.add_option(
+        '--http-connections',
+        dest='http_connections', metavar='N', default=1, type=int,
+        help='Number of connections to download a single file over HTTP with, each one fetching a part of it, if the server supports it (default is %default)')
+    downloader.add_option(
+        '--keep-fragments',
+        action='store_true', dest='keep_fragments', default=False,
+        help='Write downloaded fragments to disk and keep them after downloading is finished; fragments are only kept in memory by default')
     downloader.add_option(
         '--buffer-size',
         dest='buffersize', metavar='SIZE', default='1024',
@@ -597,6 +633,11 @@ def parseOpts(overrideArguments=None):
         '-J', '--dump-single-json',
         action='store_true', dest='dump_single_json', default=False,
         help='Simulate, quiet but print JSON information for each command-line argument. If the URL refers to a playlist, dump the whole playlist information in a single line.')
+    verbosity.add_option(
+        '--json-stream',
+        dest='json_stream', metavar='FORMAT', default=None,
+        help='With -J, print a playlist while its entries are processed instead of at the end. '
+             'FORMAT is "single" for the same single line of JSON, or "lines" for the playlist without its entries on a first line, followed by a line per entry')
     verbosity.add_option(
         '--print-json',
         action='store_true', dest='print_json', default=False,
@@ -725,6 +766,22 @@ def parseOpts(overrideArguments=None):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--cache-backend',
+        dest='cache_backend', metavar='BACKEND',
+        help='How to store the cache: "files" (default, one file per entry) or "sqlite" (a single database file)')
+    filesystem.add_option(
+        '--cache-ttl',
+        dest='cache_ttl', metavar='SECONDS', type=int,
+        help='Expire cache entries SECONDS after they have been stored')
+    filesystem.add_option(
+        '--cache-max-size',
+        dest='cache_max_size', metavar='SIZE',
+        help='Maximum size of the cache directory, the least recently used entries are removed to stay below it (e.g. 50k or 44.6m)')
+    filesystem.add_option(
+        '--extraction-cache-ttl',
+        dest='extraction_cache_ttl', metavar='SECONDS', type=int,
+        help='Keep the extracted information of every URL in the cache directory for SECONDS, and reuse it when the same URL is processed again (e.g. -j followed by a download). Expires earlier if the media URLs do. Not used with --netrc or --cookies')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail images')
     thumbnail.add_option(
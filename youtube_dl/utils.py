@@ -13,7 +13,6 @@ import datetime
 import email.utils
 import errno
 import functools
-import gzip
 import io
 import itertools
 import json
@@ -29,6 +28,7 @@ import ssl
 import subprocess
 import sys
 import tempfile
+import threading
 import traceback
 import xml.etree.ElementTree
 import zlib
@@ -64,6 +64,11 @@ from .socks import (
     sockssocket,
 )
 
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
 
 def register_socks_protocols():
     # "Register" SOCKS protocols
@@ -219,14 +224,18 @@ def write_json_file(obj, fn):
     try:
         with tf:
             json.dump(obj, tf)
-        if sys.platform == 'win32':
-            # Need to remove existing file on Windows, else os.rename raises
-            # WindowsError or FileExistsError.
-            try:
-                os.unlink(fn)
-            except OSError:
-                pass
-        os.rename(tf.name, fn)
+        if hasattr(os, 'replace'):
+            # Replaces an existing file atomically, even on Windows
+            os.replace(tf.name, fn)
+        else:
+            if sys.platform == 'win32':
+                # Need to remove existing file on Windows, else os.rename raises
+                # WindowsError or FileExistsError.
+                try:
+                    os.unlink(fn)
+                except OSError:
+                    pass
+            os.rename(tf.name, fn)
     except Exception:
         try:
             os.remove(tf.name)
@@ -825,6 +834,146 @@ def _create_http_connection(ydl_handler, http_class, is_https, *args, **kwargs):
     return hc
 
 
+class HTTPConnectionPool(object):
+    """
+    Idle keep-alive HTTP(S) connections available for reuse.
+
+    Connections are keyed by everything that determines where they lead to
+    (scheme, host and port, proxy tunnel, SOCKS proxy), so a connection is
+    only handed out for requests it could have been established for.
+    """
+
+    def __init__(self, max_idle_per_key=16):
+        self._max_idle_per_key = max_idle_per_key
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            conns = self._idle.get(key)
+            while conns:
+                conn = conns.pop()
+                if conn.sock is not None:
+                    return conn
+
+    def put(self, key, conn):
+        with self._lock:
+            conns = self._idle.setdefault(key, [])
+            if len(conns) < self._max_idle_per_key:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class _PooledHTTPResponse(compat_http_client.HTTPResponse):
+    """
+    HTTP response giving its connection back to the pool once the body has
+    been read completely. Python 3 only.
+    """
+
+    _ytdl_release = None
+    _ytdl_closing = False
+    _ytdl_complete = False
+
+    def _close_conn(self):
+        # Called on its own only once the whole body has been read, an
+        # explicit close() may leave unread data on the connection
+        if not self._ytdl_closing:
+            self._ytdl_complete = True
+        compat_http_client.HTTPResponse._close_conn(self)
+        self._release_conn()
+
+    def close(self):
+        self._ytdl_closing = True
+        try:
+            compat_http_client.HTTPResponse.close(self)
+        finally:
+            self._release_conn()
+
+    def _release_conn(self):
+        release, self._ytdl_release = self._ytdl_release, None
+        if release:
+            release(self._ytdl_complete and not self.will_close)
+
+
+def _pooled_do_open(handler, http_class, req, pool_key, **http_conn_args):
+    """
+    Same as urllib's AbstractHTTPHandler.do_open, except that the connection
+    is kept alive and taken from/returned to handler._pool.
+    """
+    host = req.host
+    if not host:
+        raise compat_urllib_error.URLError('no host given')
+
+    headers = dict(req.unredirected_hdrs)
+    headers.update(dict(
+        (k, v) for k, v in req.headers.items() if k not in headers))
+    headers = dict((name.title(), val) for name, val in headers.items())
+    tunnel_headers = {}
+    if req._tunnel_host:
+        proxy_auth_hdr = 'Proxy-Authorization'
+        if proxy_auth_hdr in headers:
+            tunnel_headers[proxy_auth_hdr] = headers.pop(proxy_auth_hdr)
+    request_kwargs = {}
+    if sys.version_info >= (3, 6):
+        request_kwargs['encode_chunked'] = req.has_header('Transfer-encoding')
+
+    pool = handler._pool
+    key = (req.type, host, req._tunnel_host) + pool_key
+    # The server may drop an idle connection while it is in the pool, the
+    # requests are then sent again on a fresh one. This is only safe for
+    # the requests that can be sent twice: the server may have processed the
+    # first one, so the others always get a fresh connection.
+    idempotent = req.get_method() in ('GET', 'HEAD')
+    while True:
+        conn = pool.get(key) if idempotent else None
+        reused = conn is not None
+        if not reused:
+            conn = http_class(host, timeout=req.timeout, **http_conn_args)
+            conn.set_debuglevel(handler._debuglevel)
+            conn.response_class = _PooledHTTPResponse
+            if req._tunnel_host:
+                conn.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+        elif req.timeout is not None:
+            conn.sock.settimeout(req.timeout)
+        try:
+            try:
+                conn.request(
+                    req.get_method(), req.selector, req.data, headers,
+                    **request_kwargs)
+            except socket.error as err:
+                raise compat_urllib_error.URLError(err)
+            resp = conn.getresponse()
+        except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as err:
+            conn.close()
+            # Try again on a fresh connection, unless it timed out
+            if reused and not isinstance(getattr(err, 'reason', err), socket.timeout):
+                continue
+            raise
+        except Exception:
+            conn.close()
+            raise
+        break
+
+    def release(reusable):
+        if reusable and conn.sock is not None:
+            pool.put(key, conn)
+        else:
+            conn.close()
+
+    resp._ytdl_release = release
+    resp.url = req.get_full_url()
+    resp.msg = resp.reason
+    return resp
+
+
 def handle_youtubedl_headers(headers):
     filtered_headers = headers
 
@@ -835,6 +984,95 @@ def handle_youtubedl_headers(headers):
     return filtered_headers
 
 
+class _DecompressingReader(io.RawIOBase):
+    """Raw stream decompressing a gzip or deflate encoded response as it is read
+
+    Only as much of the compressed body as needed to fill the caller's buffer
+    is decompressed at a time. Junk after the end of the compressed stream
+    is ignored (see http://stackoverflow.com/q/4928560/35070).
+    """
+
+    _CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, fp, encoding):
+        self._fp = fp
+        self._encoding = encoding
+        self._decompressor = None
+        self._wbits = None
+        # Compressed data not yet fed to the decompressor
+        self._input = b''
+        self._output = b''
+        self._fp_eof = False
+        self._stream_end = False
+        self._started = False
+
+    def readable(self):
+        return True
+
+    def _deflate_wbits(self, data):
+        # Servers send either raw deflate data or a zlib stream (RFC 1950)
+        header = bytearray(data[:2])
+        if (len(header) == 2 and header[0] & 0x0f == 8
+                and (header[0] << 8 | header[1]) % 31 == 0):
+            return zlib.MAX_WBITS
+        return -zlib.MAX_WBITS
+
+    def _decompress(self, max_length):
+        if self._decompressor is None:
+            self._wbits = (
+                16 + zlib.MAX_WBITS if self._encoding == 'gzip'
+                else self._deflate_wbits(self._input))
+            self._decompressor = zlib.decompressobj(self._wbits)
+        try:
+            data = self._decompressor.decompress(self._input, max_length)
+        except zlib.error as e:
+            if self._encoding != 'deflate' or self._started or self._wbits < 0:
+                raise IOError('Unable to decompress %s data: %s' % (self._encoding, e))
+            # Not a zlib stream after all, try raw deflate
+            self._wbits = -zlib.MAX_WBITS
+            self._decompressor = zlib.decompressobj(self._wbits)
+            return self._decompress(max_length)
+        self._started = self._started or bool(data)
+        self._input = self._decompressor.unconsumed_tail
+        unused_data = self._decompressor.unused_data
+        if unused_data:
+            if self._encoding == 'gzip' and unused_data[:2] in (b'\x1f\x8b', b'\x1f'):
+                # Another gzip member follows
+                self._decompressor = zlib.decompressobj(self._wbits)
+                self._input = unused_data
+            else:
+                self._stream_end = True
+                self._input = b''
+        return data
+
+    def readinto(self, b):
+        while not self._output:
+            if not self._input and not self._fp_eof:
+                self._input = self._fp.read(self._CHUNK_SIZE)
+                self._fp_eof = not self._input
+            if self._stream_end:
+                # Drain the junk so that the connection can be reused
+                self._input = b''
+                if self._fp_eof:
+                    break
+            elif self._input:
+                self._output = self._decompress(len(b))
+            elif self._fp_eof:
+                if self._decompressor is not None and not self._stream_end:
+                    self._output = self._decompressor.flush()
+                    self._decompressor = None
+                break
+        n = min(len(b), len(self._output))
+        b[:n] = self._output[:n]
+        self._output = self._output[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._fp.close()
+        io.RawIOBase.close(self)
+
+
 class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     """Handler for HTTP requests and responses.
 
@@ -856,6 +1094,7 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     def __init__(self, params, *args, **kwargs):
         compat_urllib_request.HTTPHandler.__init__(self, *args, **kwargs)
         self._params = params
+        self._pool = HTTPConnectionPool()
 
     def http_open(self, req):
         conn_class = compat_http_client.HTTPConnection
@@ -865,9 +1104,11 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
             del req.headers['Ytdl-socks-proxy']
 
-        return self.do_open(functools.partial(
-            _create_http_connection, self, conn_class, False),
-            req)
+        http_class = functools.partial(
+            _create_http_connection, self, conn_class, False)
+        if sys.version_info >= (3, 0) and not self._params.get('no_keep_alive'):
+            return _pooled_do_open(self, http_class, req, (socks_proxy, ))
+        return self.do_open(http_class, req)
 
     @staticmethod
     def deflate(data):
@@ -917,33 +1158,13 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
 
     def http_response(self, req, resp):
         old_resp = resp
-        # gzip
-        if resp.headers.get('Content-encoding', '') == 'gzip':
-            content = resp.read()
-            gz = gzip.GzipFile(fileobj=io.BytesIO(content), mode='rb')
-            try:
-                uncompressed = io.BytesIO(gz.read())
-            except IOError as original_ioerror:
-                # There may be junk add the end of the file
-                # See http://stackoverflow.com/q/4928560/35070 for details
-                for i in range(1, 1024):
-                    try:
-                        gz = gzip.GzipFile(fileobj=io.BytesIO(content[:-i]), mode='rb')
-                        uncompressed = io.BytesIO(gz.read())
-                    except IOError:
-                        continue
-                    break
-                else:
-                    raise original_ioerror
+        # gzip and deflate, decompressed as the response is read
+        content_encoding = resp.headers.get('Content-encoding', '')
+        if content_encoding in ('gzip', 'deflate'):
+            uncompressed = io.BufferedReader(_DecompressingReader(resp, content_encoding))
             resp = self.addinfourl_wrapper(uncompressed, old_resp.headers, old_resp.url, old_resp.code)
             resp.msg = old_resp.msg
             del resp.headers['Content-encoding']
-        # deflate
-        if resp.headers.get('Content-encoding', '') == 'deflate':
-            gz = io.BytesIO(self.deflate(resp.read()))
-            resp = self.addinfourl_wrapper(gz, old_resp.headers, old_resp.url, old_resp.code)
-            resp.msg = old_resp.msg
-            del resp.headers['Content-encoding']
         # Percent-encode redirect URL of Location HTTP header to satisfy RFC 3986 (see
         # https://github.com/rg3/youtube-dl/issues/6457).
         if 300 <= resp.code < 400:
@@ -1014,6 +1235,7 @@ class YoutubeDLHTTPSHandler(compat_urllib_request.HTTPSHandler):
         compat_urllib_request.HTTPSHandler.__init__(self, *args, **kwargs)
         self._https_conn_class = https_conn_class or compat_http_client.HTTPSConnection
         self._params = params
+        self._pool = HTTPConnectionPool()
 
     def https_open(self, req):
         kwargs = {}
@@ -1029,9 +1251,11 @@ class YoutubeDLHTTPSHandler(compat_urllib_request.HTTPSHandler):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
             del req.headers['Ytdl-socks-proxy']
 
-        return self.do_open(functools.partial(
-            _create_http_connection, self, conn_class, True),
-            req, **kwargs)
+        http_class = functools.partial(
+            _create_http_connection, self, conn_class, True)
+        if sys.version_info >= (3, 0) and not self._params.get('no_keep_alive'):
+            return _pooled_do_open(self, http_class, req, (socks_proxy, ), **kwargs)
+        return self.do_open(http_class, req, **kwargs)
 
 
 class YoutubeDLCookieProcessor(compat_urllib_request.HTTPCookieProcessor):
@@ -1436,12 +1660,12 @@ else:
 
 class locked_file(object):
     def __init__(self, filename, mode, encoding=None):
-        assert mode in ['r', 'a', 'w']
+        assert mode in ['r', 'rb', 'a', 'w']
         self.f = io.open(filename, mode, encoding=encoding)
         self.mode = mode
 
     def __enter__(self):
-        exclusive = self.mode != 'r'
+        exclusive = self.mode not in ('r', 'rb')
         try:
             _lock_file(self.f, exclusive)
         except IOError:
@@ -1464,6 +1688,9 @@ class locked_file(object):
     def read(self, *args):
         return self.f.read(*args)
 
+    def seek(self, *args):
+        return self.f.seek(*args)
+
 
 def get_filesystem_encoding():
     encoding = sys.getfilesystemencoding()
@@ -1842,31 +2069,93 @@ class PagedList(object):
         # This is only useful for tests
         return len(self.getslice())
 
+    def getslice(self, start=0, end=None, prefetch=None):
+        return list(self.iterslice(start, end, prefetch))
+
+    def iterslice(self, start=0, end=None, prefetch=None):
+        """Yield the entries from start to end, fetching pages as needed"""
+        raise NotImplementedError('This method must be implemented by subclasses')
+
+    def _get_page(self, pagenum):
+        return list(self._pagefunc(pagenum))
+
+    def _fetch_pages(self, pagenums, prefetch=None):
+        """Yield (pagenum, page results) for the pages in pagenums, in order
+
+        prefetch is the number of pages to request at once: the following
+        pages are already fetched in background threads while the current one
+        is processed.  An error fetching a page is only raised when that page
+        is reached, so that speculative requests do not change the results.
+        """
+        prefetch = prefetch or self._prefetch
+        if prefetch <= 1:
+            for pagenum in pagenums:
+                yield pagenum, self._get_page(pagenum)
+            return
+
+        def fetch_page(job):
+            try:
+                job['result'] = self._get_page(job['pagenum'])
+            except Exception:
+                job['exc_info'] = sys.exc_info()
+
+        pagenums = iter(pagenums)
+        jobs = []
+        try:
+            while True:
+                while len(jobs) < prefetch:
+                    pagenum = next(pagenums, None)
+                    if pagenum is None:
+                        break
+                    job = {'pagenum': pagenum}
+                    job['thread'] = threading.Thread(target=fetch_page, args=(job,))
+                    job['thread'].daemon = True
+                    job['thread'].start()
+                    jobs.append(job)
+                if not jobs:
+                    return
+                job = jobs.pop(0)
+                job['thread'].join()
+                if 'exc_info' in job:
+                    raise job['exc_info'][1]
+                yield job['pagenum'], job['result']
+        finally:
+            # Do not leave requests running once the caller is done
+            for job in jobs:
+                job['thread'].join()
+
 
 class OnDemandPagedList(PagedList):
-    def __init__(self, pagefunc, pagesize, use_cache=False):
+    def __init__(self, pagefunc, pagesize, use_cache=False, prefetch=1):
         self._pagefunc = pagefunc
         self._pagesize = pagesize
         self._use_cache = use_cache
+        self._prefetch = prefetch
         if use_cache:
             self._cache = {}
 
-    def getslice(self, start=0, end=None):
-        res = []
-        for pagenum in itertools.count(start // self._pagesize):
+    def _get_page(self, pagenum):
+        page_results = None
+        if self._use_cache:
+            page_results = self._cache.get(pagenum)
+        if page_results is None:
+            page_results = list(self._pagefunc(pagenum))
+        if self._use_cache:
+            self._cache[pagenum] = page_results
+        return page_results
+
+    def iterslice(self, start=0, end=None, prefetch=None):
+        first_page = start // self._pagesize
+        # Pages past the one containing the last requested item are never needed
+        pagenums = (
+            itertools.count(first_page) if end is None
+            else range(first_page, max(start, end - 1) // self._pagesize + 1))
+        for pagenum, page_results in self._fetch_pages(pagenums, prefetch):
             firstid = pagenum * self._pagesize
             nextfirstid = pagenum * self._pagesize + self._pagesize
             if start >= nextfirstid:
                 continue
 
-            page_results = None
-            if self._use_cache:
-                page_results = self._cache.get(pagenum)
-            if page_results is None:
-                page_results = list(self._pagefunc(pagenum))
-            if self._use_cache:
-                self._cache[pagenum] = page_results
-
             startv = (
                 start % self._pagesize
                 if firstid <= start < nextfirstid
@@ -1879,7 +2168,8 @@ class OnDemandPagedList(PagedList):
 
             if startv != 0 or endv is not None:
                 page_results = page_results[startv:endv]
-            res.extend(page_results)
+            for entry in page_results:
+                yield entry
 
             # A little optimization - if current page is not "full", ie. does
             # not contain page_size videos then we can assume that this page
@@ -1892,24 +2182,23 @@ class OnDemandPagedList(PagedList):
             # break out early as well
             if end == nextfirstid:
                 break
-        return res
 
 
 class InAdvancePagedList(PagedList):
-    def __init__(self, pagefunc, pagecount, pagesize):
+    def __init__(self, pagefunc, pagecount, pagesize, prefetch=1):
         self._pagefunc = pagefunc
         self._pagecount = pagecount
         self._pagesize = pagesize
+        self._prefetch = prefetch
 
-    def getslice(self, start=0, end=None):
-        res = []
+    def iterslice(self, start=0, end=None, prefetch=None):
         start_page = start // self._pagesize
         end_page = (
-            self._pagecount if end is None else (end // self._pagesize + 1))
+            self._pagecount if end is None
+            else min(self._pagecount, (end - 1) // self._pagesize + 1))
         skip_elems = start - start_page * self._pagesize
         only_more = None if end is None else end - start
-        for pagenum in range(start_page, end_page):
-            page = list(self._pagefunc(pagenum))
+        for pagenum, page in self._fetch_pages(range(start_page, end_page), prefetch):
             if skip_elems:
                 page = page[skip_elems:]
                 skip_elems = None
@@ -1917,11 +2206,11 @@ class InAdvancePagedList(PagedList):
                 if len(page) < only_more:
                     only_more -= len(page)
                 else:
-                    page = page[:only_more]
-                    res.extend(page)
+                    for entry in page[:only_more]:
+                        yield entry
                     break
-            res.extend(page)
-        return res
+            for entry in page:
+                yield entry
 
 
 def uppercase_escape(s):
@@ -3045,6 +3334,301 @@ def parse_m3u8_attributes(attrib):
     return info
 
 
+def _re_subpatterns(op, av):
+    # Alternatives a compound regular expression item consists of
+    if op == sre_parse.SUBPATTERN:
+        return [av[-1]]
+    if op == sre_parse.BRANCH:
+        return av[1]
+    return None
+
+
+def _re_matches_char(items, c):
+    # Whether the parsed regular expression items may consume character c
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            if compat_chr(av) == c:
+                return True
+        elif op == sre_parse.NOT_LITERAL:
+            if compat_chr(av) != c:
+                return True
+        elif op == sre_parse.IN:
+            matched, negate = False, False
+            for in_op, in_av in av:
+                if in_op == sre_parse.NEGATE:
+                    negate = True
+                elif in_op == sre_parse.LITERAL:
+                    matched |= compat_chr(in_av) == c
+                elif in_op == sre_parse.RANGE:
+                    matched |= in_av[0] <= ord(c) <= in_av[1]
+                elif in_op == sre_parse.CATEGORY:
+                    matched |= in_av not in (
+                        sre_parse.CATEGORY_DIGIT, sre_parse.CATEGORY_WORD,
+                        sre_parse.CATEGORY_SPACE)
+                else:
+                    return True
+            if matched != negate:
+                return True
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if _re_matches_char(av[2], c):
+                return True
+        elif op in (sre_parse.SUBPATTERN, sre_parse.BRANCH):
+            if any(_re_matches_char(p, c) for p in _re_subpatterns(op, av)):
+                return True
+        elif op == sre_parse.AT:
+            continue
+        else:
+            return True
+    return False
+
+
+def _re_chars_within(items, allowed):
+    # Whether the parsed regular expression items only consume characters
+    # from allowed
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            if compat_chr(av).lower() not in allowed:
+                return False
+        elif op == sre_parse.IN:
+            for in_op, in_av in av:
+                if in_op == sre_parse.LITERAL:
+                    if compat_chr(in_av).lower() not in allowed:
+                        return False
+                elif in_op == sre_parse.RANGE and in_av[1] - in_av[0] < 64:
+                    if any(compat_chr(o).lower() not in allowed
+                           for o in range(in_av[0], in_av[1] + 1)):
+                        return False
+                else:
+                    return False
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if not _re_chars_within(av[2], allowed):
+                return False
+        elif op in (sre_parse.SUBPATTERN, sre_parse.BRANCH):
+            if not all(_re_chars_within(p, allowed) for p in _re_subpatterns(op, av)):
+                return False
+        elif op != sre_parse.AT or av != sre_parse.AT_BEGINNING:
+            return False
+    return True
+
+
+def _re_ends_with(items, s, empty_ok=False):
+    # Whether everything matched by the parsed regular expression items ends
+    # with s; with empty_ok an empty match is acceptable as well
+    items = list(items)
+    while s:
+        if not items:
+            return empty_ok
+        op, av = items.pop()
+        if op == sre_parse.LITERAL:
+            if compat_chr(av) != s[-1]:
+                return False
+            s = s[:-1]
+        elif op in (sre_parse.SUBPATTERN, sre_parse.BRANCH):
+            return all(
+                _re_ends_with(items + list(p), s, empty_ok)
+                for p in _re_subpatterns(op, av))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if av[0] == 0 and not _re_ends_with(items, s, empty_ok):
+                return False
+            if av[1] != 1:
+                return _re_ends_with(av[2], s)
+            return _re_ends_with(items + list(av[2]), s, empty_ok)
+        elif op != sre_parse.AT:
+            return False
+    return True
+
+
+def _re_starts_host_end(items):
+    # Whether the parsed regular expression items can only match at the end
+    # of the host part of a URL, i.e. just before a slash or at the end
+    if not items:
+        return False
+    op, av = items[0]
+    if op == sre_parse.LITERAL:
+        return compat_chr(av) == '/'
+    if op == sre_parse.AT:
+        return av in (sre_parse.AT_END, sre_parse.AT_END_STRING)
+    if op in (sre_parse.SUBPATTERN, sre_parse.BRANCH):
+        return all(
+            _re_starts_host_end(list(p) + items[1:])
+            for p in _re_subpatterns(op, av))
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+        if av[0] == 0 and not _re_starts_host_end(items[1:]):
+            return False
+        return _re_starts_host_end(list(av[2]) + items[1:])
+    return False
+
+
+def _re_literal_strings(op, av, limit=16):
+    # All strings a parsed regular expression item may match, if there are
+    # only a few of them
+    if op == sre_parse.LITERAL:
+        return set([compat_chr(av)])
+    if op == sre_parse.IN:
+        if not all(in_op == sre_parse.LITERAL for in_op, _ in av):
+            return None
+        return set(compat_chr(in_av) for _, in_av in av)
+    if op in (sre_parse.SUBPATTERN, sre_parse.BRANCH):
+        strings = set()
+        for p in _re_subpatterns(op, av):
+            p_strings = set([''])
+            for item in reversed(list(p)):
+                item_strings = _re_literal_strings(*item, limit=limit)
+                if item_strings is None:
+                    return None
+                p_strings = set(a + b for a in item_strings for b in p_strings)
+                if len(p_strings) > limit:
+                    return None
+            strings |= p_strings
+        return strings if len(strings) <= limit else None
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[:2] == (0, 1):
+        strings = _re_literal_strings(sre_parse.SUBPATTERN, (None, av[2]), limit)
+        return None if strings is None else strings | set([''])
+    return None
+
+
+def _url_pattern_hosts(items, budget):
+    hosts = _url_items_hosts(items)
+    if hosts is not None:
+        return hosts
+    # The host may be spread over groups or alternatives spanning beyond it,
+    # try each of their alternatives on its own
+    for i, (op, av) in enumerate(items):
+        alternatives = _re_subpatterns(op, av)
+        if alternatives is None or not any(
+                _re_matches_char(p, '/') for p in alternatives):
+            continue
+        budget[0] -= len(alternatives)
+        if budget[0] < 0:
+            return None
+        hosts = set()
+        for p in alternatives:
+            p_hosts = _url_pattern_hosts(items[:i] + list(p) + items[i + 1:], budget)
+            if p_hosts is None:
+                return None
+            hosts.update(p_hosts)
+        return _minimal_hosts(hosts)
+    return None
+
+
+def _minimal_hosts(hosts):
+    # Subdomains of other hosts are redundant
+    return sorted(
+        host for host in hosts
+        if not any(host.endswith('.' + other) for other in hosts))
+
+
+_URL_SCHEME_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789+-.'
+
+
+def _url_items_schemes(items):
+    # Pseudo URL schemes like "youtube:" that aren't followed by a host
+    schemes = set([''])
+    for i, (op, av) in enumerate(items):
+        if (op, av) == (sre_parse.LITERAL, ord(':')):
+            if items[i + 1:i + 3] == [(sre_parse.LITERAL, ord('/'))] * 2:
+                return None
+            return sorted(scheme.lower() + ':' for scheme in schemes)
+        strings = _re_literal_strings(op, av)
+        if strings is None or any(
+                c.lower() not in _URL_SCHEME_CHARS for s in strings for c in s):
+            return None
+        schemes = set(a + b for a in schemes for b in strings)
+        if len(schemes) > 16:
+            return None
+    return None
+
+
+def _url_items_hosts(items):
+    items = list(items)
+    while items and items[0] == (sre_parse.AT, sre_parse.AT_BEGINNING):
+        items.pop(0)
+
+    schemes = _url_items_schemes(items)
+    if schemes is not None:
+        return schemes
+
+    # The host starts after the first "//", everything before it has to be
+    # a URL scheme
+    for host_start in range(1, len(items) + 1):
+        if _re_ends_with(items[:host_start], '//', empty_ok=True):
+            break
+    else:
+        return None
+    if not _re_chars_within(items[:host_start], _URL_SCHEME_CHARS + ':/'):
+        return None
+
+    for host_end in range(host_start, len(items)):
+        if _re_starts_host_end(items[host_end:]):
+            break
+    else:
+        return None
+    host_items = items[host_start:host_end]
+    if _re_matches_char(host_items, '/'):
+        return None
+
+    # Collect the literal suffixes of the host
+    hosts = set([''])
+    while host_items:
+        strings = _re_literal_strings(*host_items[-1])
+        if strings is None:
+            break
+        hosts = set(a + b for a in strings for b in hosts)
+        if len(hosts) > 16:
+            return None
+        host_items.pop()
+
+    if host_items and not _re_ends_with(host_items, '.', empty_ok=True):
+        # The host only ends with the suffixes, keep the whole domain labels
+        hosts = set(
+            host.partition('.')[2] if '.' in host else ''
+            for host in hosts)
+    hosts = set(host.lstrip('.').lower() for host in hosts)
+    if any(not host or ':' in host for host in hosts):
+        return None
+    return _minimal_hosts(hosts)
+
+
+_URL_PATTERN_HOSTS_CACHE = {}
+
+
+def url_pattern_hosts(pattern):
+    """
+    Find out which hosts the URLs matched by a _VALID_URL-like regular
+    expression can have.
+
+    Returns a sorted list of lower case host names such that the host of every
+    matching URL is either one of them or a subdomain of one of them, or None
+    if it can not be determined. URLs with a pseudo scheme and no host, like
+    "youtube:ID", are reported by the scheme followed by a colon instead.
+    """
+    if pattern not in _URL_PATTERN_HOSTS_CACHE:
+        try:
+            hosts = _url_pattern_hosts(list(sre_parse.parse(pattern)), [64])
+        except Exception:
+            hosts = None
+        _URL_PATTERN_HOSTS_CACHE[pattern] = hosts
+    return _URL_PATTERN_HOSTS_CACHE[pattern]
+
+
+def url_host_suffixes(url):
+    """
+    Return the lower case host of url and all its parent domains, followed by
+    its scheme, in the form url_pattern_hosts() reports them.
+    """
+    mobj = re.match(r'(?:[a-zA-Z0-9+.-]+:)?//', url)
+    host = url[mobj.end():] if mobj else url
+    host = host.partition('/')[0].lower()
+    suffixes = [host]
+    while '.' in host:
+        host = host.partition('.')[2]
+        suffixes.append(host)
+    mobj = re.match(r'[a-zA-Z0-9+.-]*:', url)
+    if mobj:
+        suffixes.append(mobj.group(0).lower())
+    return suffixes
+
+
 def urshift(val, n):
     return val >> n if val >= 0 else (val + 0x100000000) >> n
 